@@ -1,15 +1,612 @@
 # autoupdater.py
 
 import os
+import re
 import sys
+import json
+import time
 import shutil
+import zlib
+import hashlib
 import zipfile
 import logging
-import requests
+import threading
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urljoin
 
 from PyQt6 import QtCore, QtWidgets
 
+# Download tuning: assets at least PARALLEL_MIN_SIZE bytes are fetched as
+# PARALLEL_SEGMENTS concurrent HTTP Range requests when the server supports it.
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+DOWNLOAD_TIMEOUT = 60
+PARALLEL_MIN_SIZE = 8 * 1024 * 1024
+PARALLEL_SEGMENTS = 4
+PROGRESS_INTERVAL = 0.1  # seconds between progress callbacks
+STATE_SAVE_INTERVAL = 1.0  # seconds between resume state checkpoints
+
+# Delta updates: a release may publish a manifest with per-file hashes so that
+# only changed files are downloaded. If more than DELTA_MAX_RATIO of the build
+# changed, the compressed full package is the cheaper download.
+MANIFEST_ASSET_NAME = "manifest.json"
+DELTA_MAX_RATIO = 0.5
+DELTA_CONCURRENCY = 4
+TEMP_DIR_NAME = "temp_updater"
+
+# Staged installs: the new build is assembled next to app_dir and swapped in;
+# the previous build is kept in <app_dir>.previous until the new one confirms
+# a healthy start, otherwise it is restored.
+STAGING_SUFFIX = ".staging"
+PREVIOUS_SUFFIX = ".previous"
+FAILED_SUFFIX = ".failed"
+UPDATE_MARKER_NAME = "update_pending.json"
+HEALTH_CHECK_DELAY_MS = 15000
+
+
+def file_sha256(path, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def build_manifest(build_dir, version, base_url=None):
+    """
+    Describe every file of a onedir build for delta updates. Publish the result
+    as the release's manifest.json, with the files reachable at base_url + path
+    (or give each entry its own "url").
+    """
+    files = {}
+    for root, _, names in os.walk(build_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, build_dir).replace(os.sep, "/")
+            files[rel] = {"size": os.path.getsize(path), "sha256": file_sha256(path)}
+    manifest = {"version": version, "files": files}
+    if base_url:
+        manifest["base_url"] = base_url
+    return manifest
+
+
+def _link_or_copy(src, dst):
+    """
+    Hard-link src to dst (no data is written); copy when linking is not supported.
+    """
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _replace_file(src, target):
+    """
+    Move src over target. A locked target is renamed to .bak first so the
+    new version can delete it on next startup (with --cleanup-bak).
+    """
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        os.replace(src, target)
+    except OSError:
+        os.replace(target, target + ".bak")
+        os.replace(src, target)
+
+
+def _marker_path(app_dir):
+    return os.path.join(app_dir, UPDATE_MARKER_NAME)
+
+
+def read_update_marker(app_dir):
+    try:
+        with open(_marker_path(app_dir), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_update_marker(app_dir, marker):
+    with open(_marker_path(app_dir), "w", encoding="utf-8") as f:
+        json.dump(marker, f)
+
+
+def begin_update_health_check(app_dir):
+    """
+    Call early on startup. If the previous start of a freshly installed update
+    never confirmed its health, roll back and return False (the caller should
+    relaunch the restored build and exit). Otherwise mark this start as the one
+    being checked and return True.
+    """
+    marker = read_update_marker(app_dir)
+    if not marker:
+        return True
+    if marker.get("state") == "booting":
+        logging.error("Updated build did not pass its startup health check; rolling back.")
+        return not rollback_update(app_dir)
+    marker["state"] = "booting"
+    try:
+        _write_update_marker(app_dir, marker)
+    except OSError as e:
+        logging.error(f"Could not update {UPDATE_MARKER_NAME}: {e}")
+    return True
+
+
+def update_is_unconfirmed(app_dir):
+    marker = read_update_marker(app_dir)
+    return bool(marker) and marker.get("state") == "booting"
+
+
+def confirm_update(app_dir):
+    """
+    The new build started fine: drop the marker and the previous build. Only a build
+    under its health check ("booting") is confirmed; an update that was just installed
+    but not started yet keeps its marker and backup.
+    """
+    marker = read_update_marker(app_dir)
+    if not marker or marker.get("state") != "booting":
+        return
+    try:
+        os.unlink(_marker_path(app_dir))
+    except OSError as e:
+        logging.error(f"Could not remove {UPDATE_MARKER_NAME}: {e}")
+    backup_dir = marker.get("backup_dir")
+    if backup_dir and os.path.isdir(backup_dir):
+        shutil.rmtree(backup_dir, ignore_errors=True)
+    logging.info(f"Update to {marker.get('version')} confirmed.")
+
+
+def rollback_update(app_dir):
+    """
+    Restore the build saved in <app_dir>.previous. Returns True if it was restored.
+    """
+    marker = read_update_marker(app_dir)
+    if not marker:
+        return False
+    backup_dir = marker.get("backup_dir")
+    if not backup_dir or not os.path.isdir(backup_dir):
+        logging.error("No previous build to roll back to.")
+        try:
+            os.unlink(_marker_path(app_dir))
+        except OSError:
+            pass
+        return False
+
+    failed_dir = os.path.normpath(app_dir) + FAILED_SUFFIX
+    shutil.rmtree(failed_dir, ignore_errors=True)
+    try:
+        os.rename(app_dir, failed_dir)
+    except OSError:
+        # app_dir is in use (e.g. the running exe on Windows): restore file by file.
+        restored = set()
+        for root, _, files in os.walk(backup_dir):
+            for name in files:
+                src = os.path.join(root, name)
+                target = os.path.join(app_dir, os.path.relpath(src, backup_dir))
+                _replace_file(src, target)
+                restored.add(os.path.normcase(target))
+        for root, dirs, files in os.walk(app_dir):
+            if root == app_dir and TEMP_DIR_NAME in dirs:
+                dirs.remove(TEMP_DIR_NAME)
+            for name in files:
+                path = os.path.join(root, name)
+                if name.endswith(".bak") or os.path.normcase(path) in restored:
+                    continue
+                try:
+                    os.unlink(path)
+                except OSError:
+                    try:
+                        os.replace(path, path + ".bak")
+                    except OSError as e:
+                        logging.error(f"Could not remove {path} during rollback: {e}")
+        shutil.rmtree(backup_dir, ignore_errors=True)
+    else:
+        try:
+            os.rename(backup_dir, app_dir)
+        except OSError:
+            os.rename(failed_dir, app_dir)
+            raise
+        shutil.rmtree(failed_dir, ignore_errors=True)
+    logging.info(f"Rolled back to {marker.get('previous_version')}.")
+    return True
+
+
+def _safe_join(root, rel_path):
+    """
+    Join a manifest/zip path onto root, refusing absolute paths and '..' escapes.
+    """
+    target = os.path.normpath(os.path.join(root, *rel_path.split("/")))
+    if os.path.isabs(rel_path) or os.path.commonpath([os.path.abspath(root), os.path.abspath(target)]) != os.path.abspath(root):
+        raise ValueError(f"Unsafe path in update: {rel_path}")
+    return target
+
+
+# Update checks: at most one conditional request per UPDATE_CHECK_INTERVAL;
+# failures and rate limiting back off exponentially up to BACKOFF_MAX.
+UPDATE_CHECK_INTERVAL = 60 * 60
+UPDATE_CHECK_TIMEOUT = 10
+BACKOFF_BASE = 60
+BACKOFF_MAX = 24 * 60 * 60
+
+
+def parse_version(version):
+    """
+    Turn a release tag such as 'v1.5.10' or '1.6.0-beta.2' into a sortable key.
+    Numeric parts compare as numbers; a pre-release sorts before its release.
+    """
+    version = str(version).strip().lstrip("vV").split("+", 1)[0]
+    main, _, pre = version.partition("-")
+    numbers = []
+    for part in main.split("."):
+        digits = re.match(r"\d+", part)
+        numbers.append(int(digits.group()) if digits else 0)
+    while len(numbers) > 3 and numbers[-1] == 0:
+        numbers.pop()
+    numbers += [0] * (3 - len(numbers))
+    pre_key = tuple(
+        (0, int(token), "") if token.isdigit() else (1, 0, token)
+        for token in pre.split(".")
+    ) if pre else ()
+    return (tuple(numbers), 0 if pre else 1, pre_key)
+
+
+def is_newer_version(candidate, current):
+    return parse_version(candidate) > parse_version(current)
+
+
+class UpdateCheckService:
+    """
+    Fetches the latest GitHub release with conditional requests. The last
+    response is persisted with its ETag/Last-Modified (when cache_path is set),
+    so a repeated check costs a 304 at most. Rate-limit headers and errors put
+    the service into exponential backoff, during which the cached release is
+    returned without touching the network.
+    """
+
+    def __init__(self, api_url, cache_path=None, min_interval=UPDATE_CHECK_INTERVAL):
+        self.api_url = api_url
+        self.cache_path = cache_path
+        self.min_interval = min_interval
+        self.state = self._load()
+
+    def latest_release(self, force=False):
+        """
+        Return the latest release dict (possibly cached) or None if it is unknown.
+        force skips the minimum interval but still honours rate-limit backoff.
+        """
+        now = time.time()
+        release = self.state.get("release")
+        if now < self.state.get("backoff_until", 0):
+            logging.info(f"Update check backing off until {time.ctime(self.state['backoff_until'])}.")
+            return release
+        if not force and release and now - self.state.get("checked_at", 0) < self.min_interval:
+            return release
+
+        headers = {"Accept": "application/vnd.github+json"}
+        if release and self.state.get("etag"):
+            headers["If-None-Match"] = self.state["etag"]
+        if release and self.state.get("last_modified"):
+            headers["If-Modified-Since"] = self.state["last_modified"]
+
+        import requests
+
+        try:
+            resp = requests.get(self.api_url, headers=headers, timeout=UPDATE_CHECK_TIMEOUT)
+        except Exception as e:
+            logging.error(f"Error in update check: {e}")
+            self._back_off(now)
+            return release
+
+        if resp.status_code == 304:
+            self.state.update(checked_at=now, failures=0, backoff_until=0)
+            self._save()
+            return release
+
+        if resp.status_code in (403, 429) and self._rate_limited(resp, now):
+            return release
+
+        try:
+            resp.raise_for_status()
+            release = resp.json()
+        except Exception as e:
+            logging.error(f"Error in update check: {e}")
+            self._back_off(now)
+            return self.state.get("release")
+
+        self.state = {
+            "release": release,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "checked_at": now,
+            "failures": 0,
+            "backoff_until": 0,
+        }
+        self._save()
+        return release
+
+    def _rate_limited(self, resp, now):
+        headers = resp.headers
+        retry_after = headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            until = now + int(retry_after)
+        elif headers.get("X-RateLimit-Remaining") == "0" and (headers.get("X-RateLimit-Reset") or "").isdigit():
+            until = float(headers["X-RateLimit-Reset"])
+        elif resp.status_code == 429:
+            until = None
+        else:
+            return False  # a plain 403 is an error, handled by the caller
+        logging.warning("GitHub rate limit reached for update checks.")
+        self._back_off(now, until)
+        return True
+
+    def _back_off(self, now, until=None):
+        failures = self.state.get("failures", 0) + 1
+        delay = min(BACKOFF_BASE * 2 ** (failures - 1), BACKOFF_MAX)
+        self.state["failures"] = failures
+        self.state["backoff_until"] = max(until or 0, now + delay)
+        self._save()
+
+    def _load(self):
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        temp_path = self.cache_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logging.error(f"Could not save update check cache: {e}")
+
+
+class _StaleDownload(Exception):
+    """
+    The server no longer serves the file a partial download was started from.
+    """
+
+
+def _close_response(response):
+    close = getattr(response, "close", None)
+    if close:
+        close()
+
+
+class _RangedDownload:
+    """
+    One download into a .part file, split into byte segments that are fetched
+    concurrently. SHA-256 is computed in file order while the segments arrive,
+    progress is throttled to PROGRESS_INTERVAL, and segment state is
+    checkpointed to a JSON sidecar so an interrupted download can resume.
+    """
+
+    def __init__(self, url, part_file, state_file, progress_callback=None):
+        self.url = url
+        self.source_url = url
+        self.part_file = part_file
+        self.state_file = state_file
+        self.progress_callback = progress_callback
+        self.total = 0
+        self.validator = None
+        self.segments = []  # [start, end (inclusive, None if unknown), bytes done]
+        self.received = 0
+        self.hasher = hashlib.sha256()
+        self.hashed = 0
+        self.lock = threading.Lock()
+        self.failed = threading.Event()
+        self._last_percent = -1
+        self._last_emit = 0.0
+        self._last_save = 0.0
+
+    def run(self):
+        """
+        Download everything that is missing and return the SHA-256 hex digest of the file.
+        """
+        import requests
+
+        try:
+            if self._load_state():
+                logging.info(f"Resuming download of {self.url} at {self.received}/{self.total} bytes")
+                with self.lock:
+                    self._catch_up_hash()
+                self._fetch_segments(None)
+            else:
+                probe = requests.get(self.url, stream=True, timeout=DOWNLOAD_TIMEOUT)
+                try:
+                    probe.raise_for_status()
+                    self._plan(probe)
+                    # The probe response doubles as the first segment.
+                    self._fetch_segments(probe)
+                finally:
+                    _close_response(probe)
+        except BaseException:
+            self.failed.set()
+            self._save_state()
+            raise
+
+        with self.lock:
+            self._catch_up_hash()
+        if not self.total:
+            self.total = self.received
+        if self.hashed != self.total:
+            raise IOError(f"Download incomplete: {self.hashed}/{self.total} bytes")
+        if self.progress_callback:
+            self.progress_callback(100)
+        return self.hasher.hexdigest()
+
+    def _plan(self, probe):
+        headers = probe.headers
+        self.total = int(headers.get("content-length", 0) or 0)
+        self.validator = headers.get("etag") or headers.get("last-modified")
+        self.source_url = getattr(probe, "url", None) or self.url
+        ranged = (
+            self.total >= PARALLEL_MIN_SIZE
+            and headers.get("accept-ranges", "").lower() == "bytes"
+        )
+        count = PARALLEL_SEGMENTS if ranged else 1
+        if self.total:
+            size = -(-self.total // count)
+            self.segments = [
+                [start, min(self.total, start + size) - 1, 0]
+                for start in range(0, self.total, size)
+            ]
+        else:
+            self.segments = [[0, None, 0]]
+        with open(self.part_file, "wb") as f:
+            if self.total:
+                f.truncate(self.total)
+        self._save_state()
+
+    def _fetch_segments(self, probe):
+        pending = [
+            index for index, (start, end, done) in enumerate(self.segments)
+            if end is None or start + done <= end
+        ]
+        if not pending:
+            return
+        with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+            futures = [
+                pool.submit(self._fetch_segment, index, probe if index == 0 else None)
+                for index in pending
+            ]
+            errors = []
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    self.failed.set()
+                    errors.append(e)
+        if errors:
+            stale = [e for e in errors if isinstance(e, _StaleDownload)]
+            raise stale[0] if stale else errors[0]
+
+    def _fetch_segment(self, index, response):
+        import requests
+
+        start, end, done = self.segments[index]
+        owned = response is None
+        if owned:
+            headers = {"Range": f"bytes={start + done}-{'' if end is None else end}"}
+            if self.validator:
+                headers["If-Range"] = self.validator
+            response = requests.get(self.source_url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT)
+        try:
+            if owned:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise _StaleDownload(f"server answered {response.status_code} to a range request")
+            remaining = None if end is None else end - start + 1 - done
+            offset = start + done
+            # Unbuffered, so bytes are on disk before the hash cursor may read them back.
+            with open(self.part_file, "r+b", buffering=0) as f:
+                f.seek(offset)
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if self.failed.is_set():
+                        return
+                    if not chunk:
+                        continue
+                    if remaining is not None:
+                        chunk = chunk[:remaining]
+                    f.write(chunk)
+                    self._on_written(index, offset, chunk)
+                    offset += len(chunk)
+                    if remaining is not None:
+                        remaining -= len(chunk)
+                        if remaining <= 0:
+                            break
+            if remaining:
+                raise IOError(f"Segment {index} ended {remaining} bytes early")
+        finally:
+            if owned:
+                _close_response(response)
+
+    def _on_written(self, index, offset, chunk):
+        emit = None
+        with self.lock:
+            self.segments[index][2] += len(chunk)
+            self.received += len(chunk)
+            if offset == self.hashed:
+                self.hasher.update(chunk)
+                self.hashed += len(chunk)
+                self._catch_up_hash()
+
+            now = time.monotonic()
+            if self.total and self.progress_callback:
+                percent = int(self.received * 100 / self.total)
+                if percent != self._last_percent and now - self._last_emit >= PROGRESS_INTERVAL:
+                    self._last_percent = percent
+                    self._last_emit = now
+                    emit = percent
+            if now - self._last_save >= STATE_SAVE_INTERVAL:
+                self._save_state()
+        if emit is not None:
+            self.progress_callback(emit)
+
+    def _catch_up_hash(self):
+        """
+        Hash bytes that other segments already wrote right after the hash cursor.
+        Must be called with self.lock held.
+        """
+        while True:
+            segment = next(
+                (seg for seg in self.segments if seg[0] <= self.hashed < seg[0] + seg[2]),
+                None,
+            )
+            if segment is None:
+                return
+            contiguous_end = segment[0] + segment[2]
+            with open(self.part_file, "rb") as f:
+                f.seek(self.hashed)
+                while self.hashed < contiguous_end:
+                    data = f.read(min(DOWNLOAD_CHUNK_SIZE, contiguous_end - self.hashed))
+                    if not data:
+                        return
+                    self.hasher.update(data)
+                    self.hashed += len(data)
+
+    def _save_state(self):
+        if not self.total:
+            return  # Unknown size; nothing to resume against.
+        self._last_save = time.monotonic()
+        state = {
+            "url": self.url,
+            "source_url": self.source_url,
+            "total": self.total,
+            "validator": self.validator,
+            "segments": [list(seg) for seg in self.segments],
+        }
+        temp_file = self.state_file + ".tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(temp_file, self.state_file)
+        except OSError as e:
+            logging.error(f"Could not save download state {self.state_file}: {e}")
+
+    def _load_state(self):
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("url") != self.url or os.path.getsize(self.part_file) != state["total"]:
+                return False
+            self.total = state["total"]
+            self.source_url = state.get("source_url") or self.url
+            self.validator = state.get("validator")
+            self.segments = [list(seg) for seg in state["segments"]]
+            self.received = sum(seg[2] for seg in self.segments)
+            return True
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
 
 class AutoUpdater:
     """
@@ -19,28 +616,31 @@ class AutoUpdater:
     so the new process can delete .bak once they're unlocked.
     """
 
-    def __init__(self, current_version, repo_owner, repo_name):
+    def __init__(self, current_version, repo_owner, repo_name, cache_path=None):
         """
         Args:
             current_version (str): e.g., '1.5.0'
             repo_owner (str): e.g., 'KristopherZlo'
             repo_name (str): e.g., 'quackduck'
+            cache_path (str): optional JSON file that keeps the last release check
         """
         self.current_version = current_version
         self.repo_owner = repo_owner
         self.repo_name = repo_name
+        api_url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/releases/latest"
+        self.check_service = UpdateCheckService(api_url, cache_path)
 
-    def check_for_updates(self):
+    def check_for_updates(self, force=False):
         """
-        Checks GitHub's latest release via API. Returns release dict if a newer version is found, else None.
+        Checks GitHub's latest release via API (conditionally, see UpdateCheckService).
+        Returns release dict if a newer version is found, else None.
         """
-        api_url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/releases/latest"
         try:
-            resp = requests.get(api_url, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-            latest_version = data["tag_name"].lstrip("v")
-            if latest_version > self.current_version:
+            data = self.check_service.latest_release(force=force)
+            if not data:
+                return None
+            latest_version = data["tag_name"]
+            if is_newer_version(latest_version, self.current_version):
                 return data
             logging.info("No new version found.")
         except Exception as e:
@@ -50,9 +650,10 @@ class AutoUpdater:
 
     def download_and_install(self, release_info, app_dir, progress_callback=None):
         """
-        Downloads the new onedir build, extracts it to temp_updater/extracted,
-        removes (or renames) old files from app_dir, copies new files there, 
-        and removes temp_updater.
+        Installs a delta update when the release has a manifest; otherwise downloads
+        the new onedir build. Either way the new build is assembled in a staging
+        dir next to app_dir (unchanged files hard-linked) and swapped in, keeping
+        the previous build until the new one confirms a healthy start.
 
         Args:
             release_info (dict): data from GitHub's releases API
@@ -66,45 +667,225 @@ class AutoUpdater:
             logging.error("No assets in this release.")
             return False
 
-        asset = assets[0]  # assume the first asset is our .zip
+        manifest_asset = next((a for a in assets if a.get("name") == MANIFEST_ASSET_NAME), None)
+        if manifest_asset:
+            if self._install_delta(manifest_asset["browser_download_url"], app_dir, progress_callback):
+                return True
+            logging.info("Delta update not possible; falling back to the full package.")
+
+        # the .zip with the whole onedir build (the first asset in older releases)
+        asset = next((a for a in assets if a.get("name", "").lower().endswith(".zip")), assets[0])
         download_url = asset["browser_download_url"]
         file_name = asset["name"]  # e.g. "QuackDuck.v1.5.0.zip"
+        # GitHub publishes "sha256:<hex>" digests for release assets
+        download_kwargs = {}
+        digest = asset.get("digest") or ""
+        if digest.startswith("sha256:"):
+            download_kwargs["expected_sha256"] = digest.split(":", 1)[1]
 
-        temp_dir = os.path.join(app_dir, "temp_updater")
+        temp_dir = os.path.join(app_dir, TEMP_DIR_NAME)
         os.makedirs(temp_dir, exist_ok=True)
         zip_path = os.path.join(temp_dir, file_name)
 
         try:
             # 1) Download
-            if not self._download_file(download_url, zip_path, progress_callback):
+            if not self._download_file(download_url, zip_path, progress_callback, **download_kwargs):
                 return False
 
-            # 2) Extract
-            extracted_dir = os.path.join(temp_dir, "extracted")
-            os.makedirs(extracted_dir, exist_ok=True)
-            with zipfile.ZipFile(zip_path, "r") as zf:
-                zf.extractall(extracted_dir)
-
-            # 3) Remove/rename old files in app_dir
-            self._cleanup_old_app(app_dir)
+            # 2) Assemble the new build in a staging dir next to app_dir: unchanged
+            #    files are hard-linked from app_dir, the rest is extracted from the zip
+            staging_dir = self._make_staging_dir(app_dir)
+            try:
+                reused = self._extract_zip(zip_path, staging_dir, reuse_from=app_dir)
+                os.unlink(zip_path)
+                if not os.listdir(staging_dir):
+                    raise IOError("Update package is empty.")
+                logging.info(f"Staged new build; {reused} unchanged file(s) reused.")
 
-            # 4) Copy new files from extracted -> app_dir
-            build_root = self._find_onedir_root(extracted_dir)
-            if not build_root or not os.path.isdir(build_root):
-                logging.error("Could not find onedir root in extracted zip.")
-                return False
-            self._copy_all(build_root, app_dir)
+                # 3) Swap the staged build in; the old one is kept for rollback
+                self._swap_in(staging_dir, app_dir)
+            except Exception:
+                self._remove_dir_safely(staging_dir)
+                raise
 
-            # 5) Remove temp_updater folder
+            # 4) Remove temp_updater if it is still there (per-file swap)
             self._remove_dir_safely(temp_dir)
 
-            logging.info("Updated in place. New version is installed.")
+            logging.info("Updated. New version is installed.")
             return True
 
         except Exception as e:
             logging.error(f"Error installing update: {e}")
             return False
 
+    def _install_delta(self, manifest_url, app_dir, progress_callback=None):
+        """
+        Update app_dir using the release manifest: download only the files whose
+        size or SHA-256 differ into a staging dir, hard-link the unchanged ones
+        next to them and swap the staged build in.
+
+        Returns:
+            bool: True if installed; False means the caller should use the full package
+        """
+        import requests
+
+        try:
+            resp = requests.get(manifest_url, timeout=30)
+            resp.raise_for_status()
+            manifest = resp.json()
+            files = manifest["files"]
+        except Exception as e:
+            logging.error(f"Could not load update manifest: {e}")
+            return False
+
+        base_url = manifest.get("base_url")
+        changed = []
+        total_size = 0
+        try:
+            for rel_path, entry in files.items():
+                target = _safe_join(app_dir, rel_path)
+                total_size += entry["size"]
+                if (
+                    os.path.isfile(target)
+                    and os.path.getsize(target) == entry["size"]
+                    and file_sha256(target) == entry["sha256"].lower()
+                ):
+                    continue
+                url = entry.get("url") or (base_url and urljoin(base_url.rstrip("/") + "/", quote(rel_path)))
+                if not url:
+                    logging.info(f"No download URL for changed file {rel_path}.")
+                    return False
+                changed.append((rel_path, target, entry, url))
+        except (KeyError, TypeError, ValueError, OSError) as e:
+            logging.error(f"Invalid update manifest: {e}")
+            return False
+
+        changed_size = sum(entry["size"] for _, _, entry, _ in changed)
+        if total_size and changed_size > total_size * DELTA_MAX_RATIO:
+            logging.info(f"{changed_size} of {total_size} bytes changed; full package is cheaper.")
+            return False
+
+        logging.info(
+            f"Delta update: {len(changed)} changed file(s), {changed_size} bytes, "
+            f"{len(files) - len(changed)} unchanged."
+        )
+        staging_dir = self._make_staging_dir(app_dir)
+        try:
+            self._download_delta_files(changed, staging_dir, changed_size, progress_callback)
+            changed_paths = {rel_path for rel_path, _, _, _ in changed}
+            for rel_path in files:
+                if rel_path not in changed_paths:
+                    _link_or_copy(_safe_join(app_dir, rel_path), _safe_join(staging_dir, rel_path))
+            # Files missing from the manifest are simply not staged, so they disappear with the swap.
+            self._swap_in(staging_dir, app_dir)
+        except Exception as e:
+            logging.error(f"Delta update failed: {e}")
+            self._remove_dir_safely(staging_dir)
+            return False
+
+        if progress_callback:
+            progress_callback(100)
+        logging.info("Delta update installed.")
+        return True
+
+    def _download_delta_files(self, changed, staging_dir, changed_size, progress_callback=None):
+        """
+        Download the changed files concurrently into staging_dir, verifying each hash.
+        """
+        lock = threading.Lock()
+        finished_bytes = [0]
+        last_percent = [-1]
+
+        def report(size, percent):
+            if not progress_callback or not changed_size:
+                return
+            with lock:
+                if percent == 100:
+                    finished_bytes[0] += size
+                    current = finished_bytes[0]
+                else:
+                    current = finished_bytes[0] + size * percent // 100
+                overall = min(99, current * 100 // changed_size)
+                if overall <= last_percent[0]:
+                    return
+                last_percent[0] = overall
+            progress_callback(overall)
+
+        def fetch(item):
+            rel_path, _, entry, url = item
+            dest = _safe_join(staging_dir, rel_path)
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            ok = self._download_file(
+                url, dest, lambda pct: report(entry["size"], pct), expected_sha256=entry["sha256"].lower()
+            )
+            if not ok:
+                raise IOError(f"Could not download {rel_path}")
+
+        with ThreadPoolExecutor(max_workers=DELTA_CONCURRENCY) as pool:
+            for _ in pool.map(fetch, changed):
+                pass
+
+    def _swap_in(self, staging_dir, app_dir):
+        """
+        Replace app_dir with staging_dir. Tries two directory renames first; if
+        app_dir is in use, moves the old files into <app_dir>.previous and the
+        new ones into app_dir file by file. Leaves a marker for the health check.
+        """
+        backup_dir = os.path.normpath(app_dir) + PREVIOUS_SUFFIX
+        if os.path.exists(backup_dir):
+            shutil.rmtree(backup_dir)
+
+        staged_inside = os.path.commonpath([os.path.abspath(app_dir), os.path.abspath(staging_dir)]) == os.path.abspath(app_dir)
+        swapped = False
+        if not staged_inside:
+            try:
+                os.rename(app_dir, backup_dir)
+                swapped = True
+            except OSError as e:
+                logging.info(f"Cannot rename {app_dir} ({e}); swapping file by file.")
+        if swapped:
+            try:
+                os.rename(staging_dir, app_dir)
+            except OSError:
+                os.rename(backup_dir, app_dir)
+                raise
+        else:
+            self._swap_files(staging_dir, app_dir, backup_dir)
+            self._remove_dir_safely(staging_dir)
+
+        _write_update_marker(app_dir, {
+            "state": "installed",
+            "backup_dir": backup_dir,
+            "previous_version": self.current_version,
+        })
+
+    def _swap_files(self, staging_dir, app_dir, backup_dir):
+        """
+        Move every file of app_dir (except temp_updater and the staging dir) to
+        backup_dir, then move the staged files in. Renames only; if an old file
+        cannot be moved, the ones already moved are put back.
+        """
+        moved = []
+        skip = {TEMP_DIR_NAME, os.path.basename(staging_dir)}
+        try:
+            for root, dirs, files in os.walk(app_dir):
+                if root == app_dir:
+                    dirs[:] = [d for d in dirs if d not in skip]
+                for name in files:
+                    src = os.path.join(root, name)
+                    dst = os.path.join(backup_dir, os.path.relpath(src, app_dir))
+                    os.makedirs(os.path.dirname(dst), exist_ok=True)
+                    os.replace(src, dst)
+                    moved.append((dst, src))
+        except OSError:
+            for dst, src in reversed(moved):
+                try:
+                    os.replace(dst, src)
+                except OSError as e:
+                    logging.error(f"Could not restore {src}: {e}")
+            raise
+        self._move_all(staging_dir, app_dir)
+
     def restart_app(self, exe_name, app_dir):
         """
         Launch 'app_dir/exe_name' with '--cleanup-bak', then kill current process.
@@ -123,84 +904,148 @@ class AutoUpdater:
     # Internal helpers
     # ------------------------------------------
 
-    def _download_file(self, url, dest_file, progress_callback=None):
+    def _download_file(self, url, dest_file, progress_callback=None, expected_sha256=None):
         """
-        Download from `url` to `dest_file` in chunks, with optional progress callback.
+        Download `url` to `dest_file`. Large assets are fetched as concurrent
+        Range segments; the SHA-256 is computed while streaming and checked
+        against `expected_sha256` when given. Progress is reported at most
+        every PROGRESS_INTERVAL seconds and ends with 100. An interrupted
+        download leaves `dest_file`.part behind and resumes on the next call.
         """
+        part_file = dest_file + ".part"
+        state_file = part_file + ".json"
+        digest = None
+        for _ in range(2):
+            try:
+                digest = _RangedDownload(url, part_file, state_file, progress_callback).run()
+                break
+            except _StaleDownload as e:
+                logging.info(f"Partial download is out of date ({e}); starting over.")
+                self._discard_partial(part_file, state_file)
+            except Exception as e:
+                logging.error(f"Error downloading file: {e}")
+                return False
+        if digest is None:
+            return False
+
+        if expected_sha256 and digest != expected_sha256.lower():
+            logging.error(f"Checksum mismatch for {url}: expected {expected_sha256}, got {digest}")
+            self._discard_partial(part_file, state_file)
+            return False
+
         try:
-            r = requests.get(url, stream=True, timeout=60)
-            r.raise_for_status()
-            total_size = int(r.headers.get("content-length", 0))
-            downloaded = 0
-            chunk_size = 8192
-            with open(dest_file, "wb") as f:
-                for chunk in r.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if progress_callback and total_size>0:
-                            pct = int(downloaded*100/ total_size)
-                            progress_callback(pct)
-            return True
-        except Exception as e:
-            logging.error(f"Error downloading file: {e}")
+            os.replace(part_file, dest_file)
+        except OSError as e:
+            logging.error(f"Could not move downloaded file into place: {e}")
             return False
+        self._discard_partial(None, state_file)
+        return True
+
+    def _discard_partial(self, part_file, state_file):
+        for path in (part_file, state_file):
+            if path and os.path.exists(path):
+                try:
+                    os.unlink(path)
+                except OSError as e:
+                    logging.error(f"Could not remove {path}: {e}")
 
-    def _cleanup_old_app(self, app_dir):
+    def _make_staging_dir(self, app_dir):
         """
-        Remove old files from app_dir. If locked, rename to .bak so that
-        the new version can delete them on next startup (with --cleanup-bak).
+        Create an empty staging dir next to app_dir (same volume, so files can be
+        moved into place with renames). Falls back to temp_updater/staging.
         """
-        temp_updater_lower = "temp_updater"
-        for item in os.listdir(app_dir):
-            item_lower = item.lower()
-            # skip temp_updater itself
-            if item_lower == temp_updater_lower:
-                continue
-
-            item_path = os.path.join(app_dir, item)
+        candidates = [
+            os.path.normpath(app_dir) + STAGING_SUFFIX,
+            os.path.join(app_dir, TEMP_DIR_NAME, "staging"),
+        ]
+        for staging_dir in candidates:
             try:
-                if os.path.isfile(item_path) or os.path.islink(item_path):
-                    # e.g. quackduck.exe
-                    os.unlink(item_path)
-                elif os.path.isdir(item_path):
-                    shutil.rmtree(item_path)
+                if os.path.exists(staging_dir):
+                    shutil.rmtree(staging_dir)
+                os.makedirs(staging_dir)
+                return staging_dir
             except OSError as e:
-                logging.error(f"Could not remove {item_path}: {e}")
-                # fallback: rename => .bak
-                new_name = item + ".bak"
-                new_path = os.path.join(app_dir, new_name)
-                try:
-                    os.rename(item_path, new_path)
-                except Exception as ee:
-                    logging.error(f"Could not rename {item_path} => .bak: {ee}")
+                logging.warning(f"Cannot use {staging_dir} for staging: {e}")
+        raise OSError("No writable staging directory for the update")
 
-    def _find_onedir_root(self, extracted_root):
+    def _extract_zip(self, zip_path, dest_dir, reuse_from=None):
         """
-        If there's exactly one subfolder inside extracted_root, return it, else extracted_root.
+        Extract zip_path into dest_dir entry by entry. The single top-level folder
+        of a onedir build is stripped, so dest_dir ends up with the app's files.
+        Entries identical to the file at the same path in reuse_from (same size
+        and CRC-32) are hard-linked from there instead of written.
+
+        Returns:
+            int: number of reused files
         """
-        items = os.listdir(extracted_root)
-        if len(items)==1:
-            candidate = os.path.join(extracted_root, items[0])
-            if os.path.isdir(candidate):
-                return candidate
-        return extracted_root
+        reused = 0
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            infos = zf.infolist()
+            top_level = {info.filename.split("/", 1)[0] for info in infos}
+            prefix = ""
+            if len(top_level) == 1:
+                root = next(iter(top_level))
+                if root not in ("", ".", "..") and all(info.filename.startswith(root + "/") for info in infos):
+                    prefix = root + "/"
+
+            for info in infos:
+                rel_path = info.filename[len(prefix):]
+                if not rel_path:
+                    continue
+                target = _safe_join(dest_dir, rel_path.rstrip("/"))
+                if info.is_dir():
+                    os.makedirs(target, exist_ok=True)
+                    continue
+                mtime = time.mktime(info.date_time + (0, 0, -1))
+                if reuse_from:
+                    existing = _safe_join(reuse_from, rel_path)
+                    if self._same_as_zip_entry(existing, info):
+                        _link_or_copy(existing, target)
+                        reused += 1
+                        continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with zf.open(info) as src, open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst, DOWNLOAD_CHUNK_SIZE)
+                # Keep the build's timestamps so later updates can compare mtimes.
+                os.utime(target, (mtime, mtime))
+        return reused
 
-    def _copy_all(self, src, dst):
+    def _same_as_zip_entry(self, path, info):
         """
-        Recursively copy all files/folders from src to dst.
+        Cheap identity check against a zip entry: size first, then the CRC-32
+        the zip already stores (reading the old file, never writing it).
+        """
+        if not os.path.isfile(path) or os.path.getsize(path) != info.file_size:
+            return False
+        crc = 0
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                crc = zlib.crc32(chunk, crc)
+        return crc == info.CRC
+
+    def _move_all(self, src, dst):
+        """
+        Move all files from src into dst with renames; copy only if a rename
+        is impossible (e.g. src is on another volume).
         """
         for root, dirs, files in os.walk(src):
             rel = os.path.relpath(root, src)
             target_dir = os.path.join(dst, rel)
             os.makedirs(target_dir, exist_ok=True)
             for file in files:
-                shutil.copy2(os.path.join(root, file), os.path.join(target_dir, file))
+                source = os.path.join(root, file)
+                target = os.path.join(target_dir, file)
+                try:
+                    os.replace(source, target)
+                except OSError:
+                    shutil.copy2(source, target)
 
     def _remove_dir_safely(self, folder):
         """
         Attempt to remove folder fully; ignore errors if locked.
         """
+        if not os.path.exists(folder):
+            return
         try:
             shutil.rmtree(folder)
         except Exception as e:
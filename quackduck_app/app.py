@@ -1,17 +1,28 @@
 import logging
 import os
 import platform
+import subprocess
 import sys
 import traceback
 
-from PyQt6 import QtGui, QtWidgets
+from PyQt6 import QtCore, QtGui, QtWidgets
 
-from .core import cleanup_bak_files, configure_logging, resource_path
-from .duck import Duck
+from autoupdater import HEALTH_CHECK_DELAY_MS, begin_update_health_check, confirm_update, rollback_update, update_is_unconfirmed
+
+from .core import StartupProfiler, cleanup_bak_files, configure_logging, lazy_import, log_import_report, resource_path
+from .flight import flight_recorder
 from .i18n import translations
+from .memory import configure_memory_diagnostics
+from .metrics import configure_metrics, register_duck_metrics
+from .watchdog import watchdog
+
+# Set once the crash handler ran, so shutting down after a crash does not confirm an update.
+_crashed = False
 
 
 def exception_handler(exctype, value, tb):
+    global _crashed
+    _crashed = True
     error_message = "".join(traceback.format_exception(exctype, value, tb))
     crash_log_path = os.path.join(os.path.expanduser("~"), "quackduck_crash.log")
 
@@ -23,12 +34,27 @@ def exception_handler(exctype, value, tb):
         f"Python Version: {platform.python_version()}\n\n"
     )
 
+    # The events leading up to the crash go next to it, one JSON object per line.
+    flight_path = os.path.splitext(crash_log_path)[0] + ".jsonl"
+    try:
+        flight_recorder.record("crash", error=f"{exctype.__name__}: {value}")
+        flight_recorder.dump(flight_path, reason="crash")
+        system_info += f"Recent events: {flight_path}\n\n"
+    except Exception as exc:
+        logging.error("Failed to save the flight recorder: %s", exc)
+
     with open(crash_log_path, "w", encoding="utf-8") as crash_log:
         crash_log.write(system_info)
         crash_log.write(error_message)
 
     logging.error(system_info + error_message)
 
+    # A freshly installed update that crashes before its health check is rolled back right away.
+    app_dir = _app_dir()
+    if update_is_unconfirmed(app_dir) and rollback_update(app_dir):
+        _relaunch(app_dir)
+        sys.exit(1)
+
     if QtWidgets.QApplication.instance() is not None:
         msg = QtWidgets.QMessageBox()
         msg.setIcon(QtWidgets.QMessageBox.Icon.Critical)
@@ -43,10 +69,39 @@ def exception_handler(exctype, value, tb):
     sys.exit(1)
 
 
+def _app_dir():
+    return os.path.dirname(os.path.abspath(sys.argv[0]))
+
+
+def _relaunch(app_dir):
+    exe_path = os.path.join(app_dir, os.path.basename(sys.argv[0]))
+    logging.info("Relaunching restored build: %s", exe_path)
+    try:
+        subprocess.Popen([exe_path, "--cleanup-bak"])
+    except Exception as exc:
+        logging.error("Failed to relaunch %s: %s", exe_path, exc)
+
+
+def _confirm_on_clean_exit(app_dir):
+    if not _crashed:
+        confirm_update(app_dir)
+
+
 def main():
+    startup = StartupProfiler()
     configure_logging()
 
-    app = QtWidgets.QApplication(sys.argv)
+    app_dir = _app_dir()
+    if not begin_update_health_check(app_dir):
+        # The update never started cleanly; the previous build is back in place.
+        _relaunch(app_dir)
+        return 1
+    # Only the first start of a freshly installed update confirms it. The running old build
+    # must not: it installs updates too, and would drop the new build's rollback.
+    checking_update = update_is_unconfirmed(app_dir)
+
+    with startup.phase("qt"):
+        app = QtWidgets.QApplication(sys.argv)
 
     icon_path = resource_path("assets/images/white-quackduck-visible.ico")
     if os.path.exists(icon_path):
@@ -55,13 +110,29 @@ def main():
         logging.error("File icons not found: %s", icon_path)
 
     if "--cleanup-bak" in sys.argv:
-        app_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
         cleanup_bak_files(app_dir)
+    configure_memory_diagnostics(sys.argv[1:])
+    metrics_exporter = configure_metrics(sys.argv[1:])
 
     app.setQuitOnLastWindowClosed(False)
     sys.excepthook = exception_handler
 
-    duck = Duck()
+    # Imported here so the time spent loading the duck and its subsystems shows up in the report.
+    with startup.phase("import"):
+        Duck = lazy_import("quackduck_app.duck").Duck
+    duck = Duck(startup)
+    # Started once the duck is built, so only stalls of the running event loop are reported.
+    watchdog.start()
+    app.aboutToQuit.connect(watchdog.stop)
+    if metrics_exporter is not None:
+        register_duck_metrics(duck)
+        app.aboutToQuit.connect(metrics_exporter.stop)
+    QtCore.QTimer.singleShot(0, log_import_report)
+    if checking_update:
+        # Still running after the delay, or quit cleanly before it: the update is healthy.
+        # Only crashes and killed processes leave it unconfirmed.
+        QtCore.QTimer.singleShot(HEALTH_CHECK_DELAY_MS, lambda: confirm_update(app_dir))
+        app.aboutToQuit.connect(lambda: _confirm_on_clean_exit(app_dir))
     return app.exec()
 
 
@@ -1,9 +1,9 @@
 import logging
 
-import numpy as np
-import sounddevice as sd
 from PyQt6 import QtCore
 
+from .core import lazy_import
+
 
 class MicrophoneListener(QtCore.QThread):
     """
@@ -19,6 +19,15 @@ class MicrophoneListener(QtCore.QThread):
         self.running = True
 
     def run(self):
+        # numpy/sounddevice are only needed once the listener actually runs.
+        try:
+            np = lazy_import("numpy")
+            sd = lazy_import("sounddevice")
+        except Exception as exc:
+            logging.error("Microphone support is unavailable: %s", exc)
+            self.running = False
+            return
+
         def audio_callback(indata, frames, time, status):
             try:
                 if status:
@@ -1,11 +1,17 @@
+import atexit
 import hashlib
-import inspect
+import importlib
 import logging
+import logging.handlers
 import os
+import queue
 import shutil
 import sys
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from PyQt6.QtGui import QColor
 
@@ -18,36 +24,170 @@ APP_EXECUTABLE = "quackduck.exe"
 # User data folders
 CURRENT_DIR = os.path.join(os.path.expanduser("~"), "quackduck", "current")
 BACKUP_DIR = os.path.join(os.path.expanduser("~"), "quackduck", "backup")
+CACHE_DIR = os.path.join(os.path.expanduser("~"), "quackduck", "cache")
 LOG_FILE = os.path.join(os.path.expanduser("~"), "quackduck.log")
 
 os.makedirs(CURRENT_DIR, exist_ok=True)
 os.makedirs(BACKUP_DIR, exist_ok=True)
 
+# Heavy subsystems that should not be loaded before the first frame.
+OPTIONAL_MODULES = (
+    "numpy",
+    "sounddevice",
+    "requests",
+    "PyQt6.QtMultimedia",
+    "quackduck_app.store",
+    "quackduck_app.downloads",
+)
 
-def configure_logging() -> None:
+_import_timings: Dict[str, float] = {}
+
+# Logging: quackduck.log rotates at LOG_MAX_BYTES and keeps LOG_BACKUP_COUNT old files.
+LOG_MAX_BYTES = 2 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+LOG_FORMAT = "%(asctime)s %(levelname)s:%(message)s"
+LOG_LEVEL_ENV = "QUACKDUCK_LOG_LEVEL"
+# Preset name -> (application level, hot-path level). Any standard level name works too.
+LOG_LEVEL_PRESETS = {
+    "debug": (logging.DEBUG, logging.DEBUG),
+    "production": (logging.INFO, logging.WARNING),
+    "quiet": (logging.WARNING, logging.WARNING),
+}
+
+# Logger for per-tick/per-event messages (state changes, mic, sound). Its level is set
+# separately so production builds skip these records before any formatting happens;
+# guard expensive arguments with HOT_LOG.isEnabledFor(logging.DEBUG).
+HOT_LOG = logging.getLogger("quackduck.hot")
+
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def resolve_log_levels(value: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Map a QUACKDUCK_LOG_LEVEL value to (application level, hot-path level).
+    Unset means "debug" for development runs and "production" for packaged builds.
+    """
+    if value is None:
+        value = os.environ.get(LOG_LEVEL_ENV, "")
+    value = value.strip().lower()
+    if not value:
+        value = "debug" if GLOBAL_DEBUG_MODE and not getattr(sys, "frozen", False) else "production"
+    if value in LOG_LEVEL_PRESETS:
+        return LOG_LEVEL_PRESETS[value]
+    level = logging.getLevelName(value.upper())
+    if isinstance(level, int):
+        return level, level
+    logging.warning("Unknown log level %r; using the production preset.", value)
+    return LOG_LEVEL_PRESETS["production"]
+
+
+def configure_logging(level: Optional[str] = None) -> None:
     """
     Configure application logging once. Subsequent calls are no-ops.
+    Records are handed to a queue and written to the rotating log file and stdout
+    by a listener thread, so the GUI thread never waits on disk or console I/O.
     """
+    global _log_listener
     if getattr(configure_logging, "_configured", False):
         return
 
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format="%(asctime)s %(levelname)s:%(message)s",
-        handlers=[
-            logging.FileHandler(LOG_FILE, encoding="utf-8"),
-            logging.StreamHandler(sys.stdout),
-        ],
+    app_level, hot_level = resolve_log_levels(level)
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = logging.handlers.RotatingFileHandler(
+        LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8", delay=True
     )
+    stream_handler = logging.StreamHandler(sys.stdout)
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+    _log_listener.start()
+    atexit.register(shutdown_logging)
+
+    root = logging.getLogger()
+    root.setLevel(app_level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    HOT_LOG.setLevel(hot_level)
     configure_logging._configured = True
 
 
-def log_call_stack() -> None:
+def shutdown_logging() -> None:
+    """
+    Stop the listener thread after it has written every queued record.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module the first time it is needed and remember how long that took.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - start
+    _import_timings[name] = elapsed
+    logging.debug("Imported %s in %.1f ms", name, elapsed * 1000)
+    return module
+
+
+def import_timings() -> Dict[str, float]:
+    """
+    Seconds spent in each lazy_import so far.
+    """
+    return dict(_import_timings)
+
+
+def log_import_report(label: str = "startup") -> None:
+    """
+    Log where import time went and which optional subsystems are already loaded.
+    """
+    for name, elapsed in sorted(_import_timings.items(), key=lambda item: item[1], reverse=True):
+        logging.info("Import time (%s): %s %.1f ms", label, name, elapsed * 1000)
+    loaded = [name for name in OPTIONAL_MODULES if name in sys.modules]
+    deferred = [name for name in OPTIONAL_MODULES if name not in sys.modules]
+    logging.info("Optional modules loaded at %s: %s; deferred: %s", label, loaded or "none", deferred or "none")
+
+
+class StartupProfiler:
     """
-    Dump the current call stack to the logger to help trace animation/resource issues.
+    Times named startup phases and the delay until the first frame is painted.
     """
-    for frame in inspect.stack()[1:]:
-        logging.info("Called by %s in %s at line %s", frame.function, frame.filename, frame.lineno)
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self.started = clock()
+        self.phases: List[Tuple[str, float]] = []
+        self.first_frame: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.phases.append((name, self._clock() - start))
+
+    def mark_first_frame(self) -> bool:
+        """
+        Record the time to first frame; returns False if it was already recorded.
+        """
+        if self.first_frame is not None:
+            return False
+        self.first_frame = self._clock() - self.started
+        return True
+
+    def log_report(self) -> None:
+        for name, elapsed in self.phases:
+            logging.info("Startup phase %s: %.1f ms", name, elapsed * 1000)
+        if self.first_frame is not None:
+            logging.info("Time to first frame: %.1f ms", self.first_frame * 1000)
 
 
 def resource_path(relative_path: str) -> str:
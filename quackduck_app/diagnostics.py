@@ -0,0 +1,122 @@
+import collections
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from typing import Callable, Deque, List, NamedTuple, Optional, Tuple
+
+# Stack sampling. QUACKDUCK_STACK_SAMPLE_RATE is the fraction (0..1) of record_stack()
+# calls that capture a stack; the debug window captures every call while it is open.
+STACK_SAMPLE_RATE_ENV = "QUACKDUCK_STACK_SAMPLE_RATE"
+STACK_RING_SIZE = 256
+STACK_MAX_DEPTH = 16
+
+StackFrame = Tuple[str, int, str]
+
+
+class StackSample(NamedTuple):
+    timestamp: float
+    label: str
+    thread: str
+    frames: Tuple[StackFrame, ...]
+
+
+def frame_summary(frame, max_depth: int = STACK_MAX_DEPTH) -> Tuple[StackFrame, ...]:
+    """
+    (file, line, function) for frame and its callers, innermost first.
+    """
+    frames: List[StackFrame] = []
+    while frame is not None and len(frames) < max_depth:
+        code = frame.f_code
+        frames.append((os.path.basename(code.co_filename), frame.f_lineno, code.co_name))
+        frame = frame.f_back
+    return tuple(frames)
+
+
+def _rate_from_env() -> float:
+    try:
+        rate = float(os.environ.get(STACK_SAMPLE_RATE_ENV, "0") or 0)
+    except ValueError:
+        logging.warning("Ignoring invalid %s value.", STACK_SAMPLE_RATE_ENV)
+        return 0.0
+    return min(max(rate, 0.0), 1.0)
+
+
+class StackRecorder:
+    """
+    Keeps short stack summaries of interesting call sites in a fixed-size ring.
+    Frames are read straight from the interpreter (file, line, function) without
+    touching source files, and nothing is captured unless sampling or debug allows it.
+    """
+
+    def __init__(
+        self,
+        capacity: int = STACK_RING_SIZE,
+        sample_rate: float = 0.0,
+        max_depth: int = STACK_MAX_DEPTH,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.max_depth = max_depth
+        self.debug = False
+        self._random = rng
+        self._samples: Deque[StackSample] = collections.deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.debug or self.sample_rate > 0
+
+    def record(self, label: str, skip: int = 0) -> bool:
+        """
+        Capture the caller's stack under label if sampling allows; returns True if captured.
+        skip drops that many extra frames (e.g. when called through a helper).
+        """
+        if not self.debug:
+            if self.sample_rate <= 0 or (self.sample_rate < 1 and self._random() >= self.sample_rate):
+                self.dropped += 1
+                return False
+
+        frames = frame_summary(sys._getframe(1 + skip), self.max_depth)
+        self.add(StackSample(time.time(), label, threading.current_thread().name, frames))
+        return True
+
+    def add(self, sample: StackSample) -> None:
+        """
+        Store a sample captured elsewhere (e.g. another thread's stack), regardless of sampling.
+        """
+        with self._lock:
+            self._samples.append(sample)
+
+    def samples(self, label: Optional[str] = None) -> List[StackSample]:
+        with self._lock:
+            samples = list(self._samples)
+        return [sample for sample in samples if label is None or sample.label == label]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+        self.dropped = 0
+
+    @staticmethod
+    def format_sample(sample: StackSample) -> str:
+        stamp = time.strftime("%H:%M:%S", time.localtime(sample.timestamp))
+        lines = [f"{stamp} {sample.label} [{sample.thread}]"]
+        lines.extend(f"    {function} ({filename}:{line})" for filename, line, function in sample.frames)
+        return "\n".join(lines)
+
+    def format(self) -> str:
+        return "\n\n".join(self.format_sample(sample) for sample in reversed(self.samples()))
+
+
+stack_recorder = StackRecorder(sample_rate=_rate_from_env())
+
+
+def record_stack(label: str) -> bool:
+    """
+    Record the caller's stack in the shared recorder (cheap no-op when sampling is off).
+    """
+    return stack_recorder.record(label, skip=1)
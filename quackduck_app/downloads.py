@@ -0,0 +1,228 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+from PyQt6 import QtCore
+
+from .flight import recorded_request
+
+# Skin download defaults.
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_TIMEOUT = 15
+DOWNLOAD_MAX_ATTEMPTS = 5
+DOWNLOAD_RETRY_DELAY = 1.0
+DOWNLOAD_CONCURRENCY = 2
+CHECKSUM_HEADER = "X-Checksum-SHA256"
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class DownloadError(Exception):
+    """
+    A download could not be completed (network failure after all retries or a bad checksum).
+    """
+
+
+class DownloadCancelled(DownloadError):
+    """
+    The download was cancelled; the partial file is kept so it can be resumed later.
+    """
+
+
+def part_path_for(dest_path: str) -> str:
+    return f"{dest_path}.part"
+
+
+def _total_size(resp: requests.Response, offset: int) -> int:
+    content_range = resp.headers.get("Content-Range", "")
+    match = re.search(r"/(\d+)$", content_range)
+    if match:
+        return int(match.group(1))
+    length = resp.headers.get("Content-Length")
+    return offset + int(length) if length and length.isdigit() else 0
+
+
+def _is_transient(exc: Exception) -> bool:
+    """
+    Connection drops, timeouts and 5xx responses are worth retrying; a 4xx answer or a
+    local file error will not change by asking again.
+    """
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is None or exc.response.status_code >= 500
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError, DownloadError))
+
+
+def _hash_file(path: str, hasher, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> None:
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            hasher.update(chunk)
+
+
+def download_to_file(
+    url: str,
+    dest_path: str,
+    expected_sha256: Optional[str] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    cancel_event: Optional[threading.Event] = None,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    timeout: float = DOWNLOAD_TIMEOUT,
+    max_attempts: int = DOWNLOAD_MAX_ATTEMPTS,
+    retry_delay: float = DOWNLOAD_RETRY_DELAY,
+) -> str:
+    """
+    Stream url into dest_path through a .part file, resuming with an HTTP Range request
+    when a previous attempt was interrupted. The SHA-256 (from expected_sha256 or the
+    X-Checksum-SHA256 response header) is checked before the file is atomically moved
+    into place. Blocking; meant to run on a worker thread.
+    """
+    part_path = part_path_for(dest_path)
+    folder = os.path.dirname(dest_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    attempt = 0
+    while True:
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            with recorded_request("download", url) as outcome, requests.get(
+                url, headers=headers, stream=True, timeout=timeout
+            ) as resp:
+                outcome.update(status=resp.status_code, offset=offset)
+                if resp.status_code == 416 and offset:
+                    # Nothing left to fetch if the server's size equals what we have; otherwise start over.
+                    if _total_size(resp, 0) == offset:
+                        expected_sha256 = expected_sha256 or resp.headers.get(CHECKSUM_HEADER)
+                        break
+                    os.unlink(part_path)
+                    raise DownloadError("stale partial download")
+                resp.raise_for_status()
+                if offset and resp.status_code != 206:
+                    logging.info("Server ignored the Range request for %s; downloading from scratch.", url)
+                    offset = 0
+                total = _total_size(resp, offset)
+                expected_sha256 = expected_sha256 or resp.headers.get(CHECKSUM_HEADER)
+
+                received = offset
+                with open(part_path, "ab" if offset else "wb") as file:
+                    for chunk in resp.iter_content(chunk_size):
+                        if cancel_event is not None and cancel_event.is_set():
+                            raise DownloadCancelled(f"Download of {url} was cancelled")
+                        if not chunk:
+                            continue
+                        file.write(chunk)
+                        received += len(chunk)
+                        if progress_callback:
+                            progress_callback(received, total)
+                outcome["bytes"] = received - offset
+            if total and received < total:
+                raise DownloadError(f"connection closed after {received} of {total} bytes")
+            break
+        except DownloadCancelled:
+            raise
+        except (requests.RequestException, OSError, DownloadError) as exc:
+            attempt += 1
+            if attempt >= max_attempts or not _is_transient(exc):
+                raise DownloadError(f"Failed to download {url}: {exc}") from exc
+            logging.warning("Download of %s interrupted (%s); retry %s/%s", url, exc, attempt, max_attempts - 1)
+            time.sleep(retry_delay * attempt)
+
+    if expected_sha256:
+        hasher = hashlib.sha256()
+        _hash_file(part_path, hasher, chunk_size)
+        digest = hasher.hexdigest()
+        if digest != expected_sha256.strip().lower():
+            os.unlink(part_path)
+            raise DownloadError(f"Checksum mismatch for {url}: expected {expected_sha256}, got {digest}")
+    else:
+        logging.warning("No checksum available for %s; skipping verification.", url)
+
+    os.replace(part_path, dest_path)
+    return dest_path
+
+
+class _DownloadTask(QtCore.QRunnable):
+    def __init__(self, manager: "SkinDownloadManager", key: str, url: str, dest_path: str, expected_sha256: Optional[str]) -> None:
+        super().__init__()
+        self.manager = manager
+        self.key = key
+        self.url = url
+        self.dest_path = dest_path
+        self.expected_sha256 = expected_sha256
+        self.cancel_event = threading.Event()
+        self._last_percent = -1
+
+    def _report(self, received: int, total: int) -> None:
+        # Only emit when the visible percentage changes instead of once per chunk.
+        percent = received * 100 // total if total else -1
+        if percent != self._last_percent or total == 0:
+            self._last_percent = percent
+            self.manager.progress.emit(self.key, received, total)
+
+    def run(self) -> None:
+        try:
+            path = download_to_file(
+                self.url,
+                self.dest_path,
+                expected_sha256=self.expected_sha256,
+                progress_callback=self._report,
+                cancel_event=self.cancel_event,
+            )
+            self.manager._task_done.emit(self.key, path, "")
+        except Exception as exc:
+            logging.error("Skin download %s failed: %s", self.key, exc)
+            self.manager._task_done.emit(self.key, "", str(exc) or exc.__class__.__name__)
+
+
+class SkinDownloadManager(QtCore.QObject):
+    """
+    Runs skin downloads on a background pool and reports progress with signals.
+    Each key (usually the skin id) has at most one download in flight.
+    """
+
+    progress = QtCore.pyqtSignal(str, int, int)
+    finished = QtCore.pyqtSignal(str, str)
+    failed = QtCore.pyqtSignal(str, str)
+    _task_done = QtCore.pyqtSignal(str, str, str)
+
+    def __init__(self, max_concurrency: int = DOWNLOAD_CONCURRENCY, parent=None) -> None:
+        super().__init__(parent)
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(max(1, max_concurrency))
+        self._active: Dict[str, _DownloadTask] = {}
+        self._task_done.connect(self._on_task_done)
+
+    def download(self, key: str, url: str, dest_path: str, expected_sha256: Optional[str] = None) -> bool:
+        if key in self._active:
+            return False
+        task = _DownloadTask(self, key, url, dest_path, expected_sha256)
+        self._active[key] = task
+        self._pool.start(task)
+        return True
+
+    def is_active(self, key: str) -> bool:
+        return key in self._active
+
+    def cancel(self, key: str) -> None:
+        task = self._active.get(key)
+        if task is not None:
+            task.cancel_event.set()
+
+    def cancel_all(self) -> None:
+        for task in self._active.values():
+            task.cancel_event.set()
+
+    def wait(self, msecs: int = -1) -> bool:
+        return self._pool.waitForDone(msecs)
+
+    def _on_task_done(self, key: str, path: str, error: str) -> None:
+        self._active.pop(key, None)
+        if path:
+            self.finished.emit(key, path)
+        else:
+            self.failed.emit(key, error)
@@ -1,20 +1,33 @@
 import logging
+import math
 import os
 import random
 import shutil
 import sys
 import time
+from typing import Optional
 
-import sounddevice as sd
 from PyQt6 import QtCore, QtGui, QtWidgets
 from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtMultimedia import QSoundEffect
 from PyQt6.QtWidgets import QMessageBox
 
 from autoupdater import AutoUpdater, UpdateWindow
 from .audio import MicrophoneListener
-from .core import GLOBAL_DEBUG_MODE, PROJECT_VERSION, get_seed_from_name, resource_path
+from .core import (
+    CACHE_DIR,
+    GLOBAL_DEBUG_MODE,
+    HOT_LOG,
+    PROJECT_VERSION,
+    StartupProfiler,
+    get_seed_from_name,
+    lazy_import,
+    resource_path,
+)
+from .flight import flight_recorder, recorded_tick, recorded_request
+from .history import StateHistory
 from .i18n import translations, set_language
+from .metrics import metrics
+from .perf import measured, perf_monitor
 from .resources import ResourceManager
 from .settings_store import SettingsManager
 from .states import (
@@ -31,6 +44,8 @@ from .states import (
     WalkingState,
 )
 from .ui import DebugWindow, HeartWindow, NameWindow, SettingsWindow, SystemTrayIcon
+from .tracing import traced
+from .warmstart import FrameCache, load_session, save_session
 
 if sys.platform == "win32":
     import winreg
@@ -39,19 +54,32 @@ if sys.platform == "win32":
     import win32gui
     import win32process
 
+# Work deferred until the first frame starts after this long at the latest.
+STARTUP_DEFERRED_FALLBACK_MS = 2000
+
+# States a warm start may resume directly; anything else falls from the saved position.
+RESTORABLE_STATES = {cls.__name__: cls for cls in (IdleState, WalkingState, SleepingState)}
+
 
 class _UpdateCheckThread(QtCore.QThread):
     result_ready = QtCore.pyqtSignal(object)
 
-    def __init__(self, updater):
+    def __init__(self, updater, force=False):
         super().__init__()
         self.updater = updater
+        self.force = force
 
+    @traced("update_check", category="update")
     def run(self):
+        api_url = getattr(getattr(self.updater, "check_service", None), "api_url", "update_check")
         try:
-            latest_release = self.updater.check_for_updates()
+            with recorded_request("update_check", api_url) as outcome:
+                latest_release = self.updater.check_for_updates(force=self.force)
+                outcome["update"] = latest_release.get("tag_name") if latest_release else None
+            metrics.inc("quackduck_update_checks_total", outcome="update_available" if latest_release else "up_to_date")
         except Exception as exc:  # pragma: no cover - defensive
             logging.error("Update check failed: %s", exc)
+            metrics.inc("quackduck_update_checks_total", outcome="error")
             latest_release = None
         self.result_ready.emit(latest_release)
 
@@ -127,27 +155,30 @@ class Duck(QtWidgets.QWidget):
     Now it also checks if a fullscreen application is active via WinAPI.
     """
 
-    def __init__(self):
+    def __init__(self, startup: Optional[StartupProfiler] = None):
         super().__init__()
-        self.settings_manager = SettingsManager()
+        self.startup = startup or StartupProfiler()
         self.setWindowFlags(self.windowFlags() | Qt.WindowType.Window)
 
-        self.sound_effect = QSoundEffect()
-        self.sound_effect.setVolume(0.5)
+        # QtMultimedia is loaded together with the first sound, see sound_effect.
+        self._sound_effect = None
+        self._pending_sound = None
 
-        self.load_settings()
+        with self.startup.phase("settings"):
+            self.settings_manager = SettingsManager()
+            self.load_settings()
+            self.settings_manager.subscribe('sound_volume', self.on_sound_volume_changed)
 
         self.updater = AutoUpdater(
             current_version=PROJECT_VERSION,
             repo_owner="KristopherZlo",
-            repo_name="quackduck"
+            repo_name="quackduck",
+            cache_path=os.path.join(CACHE_DIR, "update_check.json"),
         )
 
-        self.sound_effect.setVolume(self.sound_volume)
-
         self.debug_mode = False
         self.debug_window = None
-        self.state_history = []
+        self.state_history = StateHistory()
 
         icon_path = resource_path("assets/images/white-quackduck-visible.ico")
         if os.path.exists(icon_path):
@@ -161,28 +192,16 @@ class Duck(QtWidgets.QWidget):
 
         self.scale_factor = self.get_scale_factor()
 
-        self.pet_size = self.settings_manager.get_value('pet_size', default=3, value_type=int)
-        self.resources = ResourceManager(self.scale_factor, self.pet_size)
+        # Pick the skin before touching any frame so the sprites are decoded once, at the final size.
+        with self.startup.phase("resources"):
+            self.resources = ResourceManager(self.scale_factor, self.pet_size, frame_cache=FrameCache())
+            self.load_selected_skin()
+            self.current_frame = self.resources.get_animation_frame('idle', 0)
 
         self.cursor_positions = []
         self.cursor_shake_timer = QtCore.QTimer()
         self.cursor_shake_timer.timeout.connect(self.check_cursor_shake)
 
-        self.selected_mic_index = self.settings_manager.get_value('selected_mic_index', default=None, value_type=int)
-        self.activation_threshold = self.settings_manager.get_value('activation_threshold', default=10, value_type=int)
-        self.sound_enabled = self.settings_manager.get_value('sound_enabled', default=True, value_type=bool)
-        self.autostart_enabled = self.settings_manager.get_value('autostart_enabled', default=False, value_type=bool)
-        self.playful_behavior_probability = self.settings_manager.get_value('playful_behavior_probability', default=0.1, value_type=float)
-        self.ground_level_setting = self.settings_manager.get_value('ground_level', default=0, value_type=int)
-        self.skin_folder = self.settings_manager.get_value('skin_folder', default=None, value_type=str)
-        self.selected_skin = self.settings_manager.get_value('selected_skin', default=None, value_type=str)
-        self.base_duck_speed = self.settings_manager.get_value('duck_speed', default=2.0, value_type=float)
-        self.duck_speed = self.base_duck_speed * (self.pet_size / 3)
-        self.random_behavior = self.settings_manager.get_value('random_behavior', default=True, value_type=bool)
-        self.idle_duration = self.settings_manager.get_value('idle_duration', default=5.0, value_type=float)
-        self.direction_change_interval = self.settings_manager.get_value('direction_change_interval', default=20.0, value_type=float)
-        self.name_offset_y = self.settings_manager.get_value('name_offset_y', default=60, value_type=int)
-        self.font_base_size = self.settings_manager.get_value('font_base_size', default=14, value_type=int)
         self.is_listening = False
         self.listening_entry_timer = None
         self.listening_exit_timer = None
@@ -194,10 +213,8 @@ class Duck(QtWidgets.QWidget):
         self.screen_width = screen_rect.width()
         self.screen_height = screen_rect.height()
 
-        self.show_name = self.settings_manager.get_value('show_name', default=False, value_type=bool)
         self.name_window = None
 
-        self.current_frame = self.resources.get_animation_frame('idle', 0)
         if self.current_frame:
             self.duck_width = self.current_frame.width()
             self.duck_height = self.current_frame.height()
@@ -211,43 +228,33 @@ class Duck(QtWidgets.QWidget):
         self.has_jumped = False
         self.direction = 1
         self.ground_level = self.get_ground_level()
+        initial_state = self.restore_session(load_session())
 
-        self.state = FallingState(self)
-        self.state.enter()
+        with self.startup.phase("state"):
+            self.state = initial_state(self)
+            self.state.enter()
 
-        self.setup_timers()
-        self.apply_settings()
+            self.setup_timers()
+            self.apply_settings()
 
-        self.microphone_listener = MicrophoneListener(
-            device_index=self.selected_mic_index,
-            activation_threshold=self.activation_threshold
-        )
-        self.microphone_listener.volume_signal.connect(self.on_volume_updated)
-        self.microphone_listener.start()
+        # Started once the first frame is on screen, see finish_startup().
+        self.microphone_listener = None
+        self.tray_icon = None
+        self.update_check_thread = None
+        self.update_check_manual_trigger = False
+        self._startup_finished = False
 
-        self.init_ui()
-        self.setup_random_behavior()
+        with self.startup.phase("window"):
+            self.init_ui()
+            self.setup_random_behavior()
 
         self.last_interaction_time = time.time()
         self.last_sound_time = QtCore.QTime.currentTime()
 
-        self.tray_icon = SystemTrayIcon(self)
-        self.tray_icon.show()
-
         self.current_volume = 0
         self.drag_move_throttle_ns = 16_000_000  # ~60 fps throttle for drag
         self._last_drag_move_ts = 0
 
-        self.pet_name = self.settings_manager.get_value('pet_name', default="", value_type=str)
-        if self.pet_name:
-            self.seed = get_seed_from_name(self.pet_name)
-            self.random_gen = random.Random(self.seed)
-            self.generate_characteristics()
-        else:
-            self.seed = None
-            self.random_gen = random.Random()
-            self.set_default_characteristics()
-
         self.attack_timer = QtCore.QTimer()
         self.attack_timer.timeout.connect(self.check_attack_trigger)
         self.attack_timer.start(5000)
@@ -256,15 +263,85 @@ class Duck(QtWidgets.QWidget):
         self.run_timer.timeout.connect(self.check_run_state_trigger)
         self.run_timer.start(5 * 60 * 1000)
 
-        self.update_check_thread = None
-        self.update_check_manual_trigger = False
-        self.start_update_check()
-
         self.is_paused_for_fullscreen = False
         self.fullscreen_check_timer = QtCore.QTimer()
         self.fullscreen_check_timer.setInterval(4000)
         self.fullscreen_check_timer.timeout.connect(self.check_foreground_fullscreen_winapi)
-        self.fullscreen_check_timer.start()
+
+        app = QtWidgets.QApplication.instance()
+        app.aboutToQuit.connect(self.save_warm_start)
+        app.aboutToQuit.connect(self.settings_manager.flush)
+
+        # In case the window is never exposed (e.g. covered at login), don't wait forever.
+        QtCore.QTimer.singleShot(STARTUP_DEFERRED_FALLBACK_MS, self.finish_startup)
+
+    def finish_startup(self):
+        """
+        Start what the first frame does not need: the microphone, the tray icon,
+        fullscreen detection and the update check.
+        """
+        if self._startup_finished:
+            return
+        self._startup_finished = True
+
+        with self.startup.phase("deferred"):
+            self.microphone_listener = MicrophoneListener(
+                device_index=self.selected_mic_index,
+                activation_threshold=self.activation_threshold
+            )
+            self.microphone_listener.volume_signal.connect(self.on_volume_updated)
+            self.microphone_listener.start()
+
+            self.tray_icon = SystemTrayIcon(self)
+            self.tray_icon.show()
+
+            self.fullscreen_check_timer.start()
+            self.start_update_check()
+
+        self.startup.log_report()
+
+    def restore_session(self, session):
+        """
+        Put the duck back where the previous session left it.
+        Returns the state class to start in.
+        """
+        if not session:
+            return FallingState
+        try:
+            x = float(session["x"])
+            y = float(session["y"])
+            direction = float(session.get("direction", 1))
+        except (KeyError, TypeError, ValueError):
+            return FallingState
+        if not (math.isfinite(x) and math.isfinite(y)):
+            return FallingState
+
+        ground_y = self.ground_level - self.duck_height
+        self.duck_x = min(max(x, 0), max(0, self.screen_width - self.duck_width))
+        self.duck_y = min(y, ground_y)
+        self.facing_right = bool(session.get("facing_right", True))
+        self.direction = -1 if direction < 0 else 1
+
+        state_class = RESTORABLE_STATES.get(session.get("state"))
+        if state_class is None or self.duck_y < ground_y:
+            return FallingState
+        logging.info("Warm start: resuming %s at (%s, %s).", state_class.__name__, int(self.duck_x), int(self.duck_y))
+        return state_class
+
+    def save_warm_start(self):
+        """
+        Snapshot the on-screen state and the decoded frames so the next launch starts warm.
+        """
+        save_session({
+            "x": self.duck_x,
+            "y": self.duck_y,
+            "state": type(self.state).__name__,
+            "facing_right": self.facing_right,
+            "direction": self.direction,
+            "skin": self.resources.current_skin,
+            "pet_size": self.pet_size,
+        })
+        self.resources.save_frame_cache()
 
     def check_foreground_fullscreen_winapi(self):
         """
@@ -416,7 +493,7 @@ class Duck(QtWidgets.QWidget):
             return
 
         self.update_check_manual_trigger = manual_trigger
-        self.update_check_thread = _UpdateCheckThread(self.updater)
+        self.update_check_thread = _UpdateCheckThread(self.updater, force=manual_trigger)
         self.update_check_thread.result_ready.connect(self.on_update_check_finished)
         self.update_check_thread.finished.connect(self._clear_update_check_thread)
         self.update_check_thread.finished.connect(self.update_check_thread.deleteLater)
@@ -471,6 +548,7 @@ class Duck(QtWidgets.QWidget):
         logging.info(f"SCALE FACTOR: {scale_factor}")
         return scale_factor
 
+    @recorded_tick("check_playful_state")
     def check_playful_state(self):
         """
         Random chance to switch into PlayfulState (chasing the cursor), 
@@ -497,6 +575,7 @@ class Duck(QtWidgets.QWidget):
         self.debug_window = None
         self.debug_mode = False
 
+    @recorded_tick("play_random_sound")
     def play_random_sound(self):
         """
         Plays a random sound file using the ResourceManager with proper error handling.
@@ -534,35 +613,35 @@ class Duck(QtWidgets.QWidget):
                     logging.error(f"Failed to copy sound file: {e}")
                     return
 
-            logging.info(f"Attempting to play sound: {sound_file}")
+            HOT_LOG.debug("Attempting to play sound: %s", sound_file)
             url = QtCore.QUrl.fromLocalFile(sound_file)
             self.sound_effect.setSource(url)
-
-            def play_if_ready():
-                status = self.sound_effect.status()
-                if status == QSoundEffect.Status.Ready:
-                    self.sound_effect.play()
-                    logging.info("Sound playback started successfully.")
-                    try:
-                        self.sound_effect.statusChanged.disconnect(play_if_ready)
-                    except Exception:
-                        pass
-                elif status == QSoundEffect.Status.Error:
-                    logging.error(f"Sound effect failed to load for {sound_file}")
-                    try:
-                        self.sound_effect.statusChanged.disconnect(play_if_ready)
-                    except Exception:
-                        pass
-
-            self.sound_effect.statusChanged.connect(lambda *_: play_if_ready())
-            play_if_ready()
-            if self.sound_effect.status() != QSoundEffect.Status.Ready:
+            self._pending_sound = sound_file
+            self._play_pending_sound()
+            if self._pending_sound is not None:
                 logging.warning("Sound not yet loaded, will retry in 500ms.")
-                QTimer.singleShot(500, play_if_ready)
+                QTimer.singleShot(500, self._play_pending_sound)
 
         except Exception as e:
             logging.error(f"Error playing sound: {e}")
 
+    def _play_pending_sound(self):
+        """
+        Play the sound set by play_random_sound() once it has loaded. Connected to
+        statusChanged once, when the sound effect is created.
+        """
+        if self._pending_sound is None or self._sound_effect is None:
+            return
+        Status = type(self._sound_effect).Status
+        status = self._sound_effect.status()
+        if status == Status.Ready:
+            self._pending_sound = None
+            self._sound_effect.play()
+            HOT_LOG.debug("Sound playback started successfully.")
+        elif status == Status.Error:
+            logging.error(f"Sound effect failed to load for {self._pending_sound}")
+            self._pending_sound = None
+
     def mouseReleaseEvent(self, event):
         self.state.handle_mouse_release(event)
 
@@ -703,6 +782,7 @@ class Duck(QtWidgets.QWidget):
         interval = random.randint(20000, 40000)
         self.random_behavior_timer.start(interval)
 
+    @recorded_tick("perform_random_behavior")
     def perform_random_behavior(self):
         """
         Perform a random behavior from a small list, e.g. random Idle or direction change.
@@ -712,6 +792,7 @@ class Duck(QtWidgets.QWidget):
         behavior()
         self.schedule_next_random_behavior()
 
+    @recorded_tick("check_run_state_trigger")
     def check_run_state_trigger(self):
         """
         Occasionally switch to RunState if there's a 'running' animation defined, with a small chance.
@@ -750,6 +831,7 @@ class Duck(QtWidgets.QWidget):
                     return True
         return False
 
+    @recorded_tick("check_attack_trigger")
     def check_attack_trigger(self):
         """
         Timer-based check for attacks. If duck can attack, we switch state to AttackState.
@@ -766,6 +848,7 @@ class Duck(QtWidgets.QWidget):
         if not isinstance(self.state, IdleState) and not isinstance(self.state, (FallingState, DraggingState)):
             self.change_state(IdleState(self))
 
+    @recorded_tick("change_direction")
     def change_direction(self):
         """
         Flip duck direction horizontally.
@@ -778,7 +861,7 @@ class Duck(QtWidgets.QWidget):
 
         # Protection against repeated calls
         if getattr(self, "_is_changing_state", False):
-            logging.warning("The previous state change has not yet completed, skip it.")
+            HOT_LOG.warning("The previous state change has not yet completed, skip it.")
             return
         self._is_changing_state = True
 
@@ -797,11 +880,11 @@ class Duck(QtWidgets.QWidget):
                 self.stop_cursor_shake_detection()
 
             new_state_name = self.state.__class__.__name__ if self.state else "None"
-            self.state_history.append((time.strftime("%H:%M:%S"), old_state_name, new_state_name))
-            if len(self.state_history) > 10:
-                self.state_history.pop(0)
+            self.state_history.record(old_state_name, new_state_name)
+            flight_recorder.record("state", old=old_state_name, new=new_state_name)
+            metrics.inc("quackduck_state_transitions_total", state=new_state_name)
         except Exception as e:
-            logging.error(f"Error while changing state: {e}")
+            logging.error("Error while changing state: %s", e)
         finally:
             self._is_changing_state = False
 
@@ -813,6 +896,7 @@ class Duck(QtWidgets.QWidget):
         self.cursor_shake_timer.stop()
         self.cursor_positions = []
 
+    @recorded_tick("check_cursor_shake")
     def check_cursor_shake(self):
         """
         Accumulate the last second of cursor positions to see 
@@ -850,6 +934,9 @@ class Duck(QtWidgets.QWidget):
         else:
             self.cursor_positions = []
 
+    @traced(category="duck")
+    @measured("animation", timer_attr="animation_timer")
+    @recorded_tick("animation")
     def update_animation(self):
         """
         Called by self.animation_timer. Tells current state to update its frames.
@@ -860,6 +947,9 @@ class Duck(QtWidgets.QWidget):
         except Exception as e:
             logging.error(f"Error in update_animation: {e}")
 
+    @traced(category="duck")
+    @measured("position", timer_attr="position_timer")
+    @recorded_tick("position")
     def update_position(self):
         try:
             if self.state:
@@ -878,10 +968,15 @@ class Duck(QtWidgets.QWidget):
         if self.name_window and self.show_name and self.pet_name.strip():
             self.name_window.update_position()
 
+    @traced(category="paint")
+    @measured("paint")
     def paintEvent(self, event):
+        metrics.inc("quackduck_repaints_total")
         painter = QtGui.QPainter(self)
         if self.current_frame:
             painter.drawPixmap(0, 0, self.current_frame)
+            if self.startup.mark_first_frame():
+                QtCore.QTimer.singleShot(0, self.finish_startup)
 
         # If in debug mode, draw a bounding box and coordinates.
         if self.debug_mode:
@@ -935,6 +1030,7 @@ class Duck(QtWidgets.QWidget):
         elif self.duck_y + self.duck_height < self.ground_level:
             self.change_state(FallingState(self))
 
+    @recorded_tick("check_sleep")
     def check_sleep(self):
         """
         If the duck is idle for too long, it enters SleepingState (unless it's jumping, dragging, etc.).
@@ -952,13 +1048,16 @@ class Duck(QtWidgets.QWidget):
         If volume is above threshold, potentially switch to ListeningState.
         """
         self.current_volume = volume
+        perf_monitor.count("mic_callbacks")
+        flight_recorder.level("mic", volume)
+        metrics.inc("quackduck_mic_callbacks_total")
 
         if volume > self.activation_threshold:
             self.last_interaction_time = time.time()
             if self.listening_exit_timer:
                 self.listening_exit_timer.stop()
                 self.listening_exit_timer = None
-                logging.debug("ListeningState exit timer stopped.")
+                HOT_LOG.debug("ListeningState exit timer stopped.")
 
             if not self.is_listening and not self.listening_entry_timer:
                 if not isinstance(self.state, PlayfulState) and not isinstance(self.state, JumpingState) and not isinstance(self.state, LandingState):
@@ -966,15 +1065,15 @@ class Duck(QtWidgets.QWidget):
                     self.listening_entry_timer.setSingleShot(True)
                     self.listening_entry_timer.timeout.connect(self.enter_listening_state)
                     self.listening_entry_timer.start(100)
-                    logging.debug("ListeningState entry timer started for 100ms.")
+                    HOT_LOG.debug("ListeningState entry timer started for 100ms.")
                 else:
-                    logging.info("Duck is in PlayfulState. Will not enter ListeningState.")
+                    HOT_LOG.debug("Duck is in %s. Will not enter ListeningState.", type(self.state).__name__)
         else:
             # If volume is below threshold, stop any pending entry to listening:
             if self.listening_entry_timer:
                 self.listening_entry_timer.stop()
                 self.listening_entry_timer = None
-                logging.debug("ListeningState entry timer stopped.")
+                HOT_LOG.debug("ListeningState entry timer stopped.")
 
             # If we are in ListeningState, start an exit timer if not set.
             if self.is_listening and not self.listening_exit_timer:
@@ -982,7 +1081,7 @@ class Duck(QtWidgets.QWidget):
                 self.listening_exit_timer.setSingleShot(True)
                 self.listening_exit_timer.timeout.connect(self.exit_listening_state)
                 self.listening_exit_timer.start(1000)
-                logging.debug("ListeningState exit timer started for 1 second.")
+                HOT_LOG.debug("ListeningState exit timer started for 1 second.")
 
     def stop_current_state(self):
         """
@@ -996,24 +1095,24 @@ class Duck(QtWidgets.QWidget):
             self.state = None
 
     def enter_listening_state(self):
-        logging.info("Entering ListeningState.")
+        HOT_LOG.debug("Entering ListeningState.")
         self.listening_entry_timer = None
         if not self.is_listening:
             if isinstance(self.state, (JumpingState, FallingState, DraggingState)):
-                logging.info("Rejected entering ListeningState due to current state.")
+                HOT_LOG.debug("Rejected entering ListeningState due to current state.")
                 return
             self.stop_current_state()
             self.change_state(ListeningState(self))
             self.is_listening = True
-            logging.info("Duck is now in ListeningState.")
+            HOT_LOG.debug("Duck is now in ListeningState.")
 
     def exit_listening_state(self):
-        logging.info("Exiting ListeningState.")
+        HOT_LOG.debug("Exiting ListeningState.")
         self.listening_exit_timer = None
         if self.is_listening:
             self.is_listening = False
             self.change_state(WalkingState(self))
-            logging.info("Duck switched to WalkingState after leaving ListeningState.")
+            HOT_LOG.debug("Duck switched to WalkingState after leaving ListeningState.")
 
     def schedule_next_sound(self):
         """
@@ -1061,52 +1160,47 @@ class Duck(QtWidgets.QWidget):
         """
         if hasattr(self, 'heart_window') and self.heart_window:
             self.heart_window.deleteLater()
-        self.microphone_listener.stop()
-        self.microphone_listener.wait()
+        if self.microphone_listener:
+            self.microphone_listener.stop()
+            self.microphone_listener.wait()
+        self.settings_manager.flush()
         event.accept()
 
     def load_settings(self) -> None:
         """
-        Load user settings from SettingsManager to the Duck's fields.
-        """
-        self.pet_name = self.settings_manager.get_value('pet_name', default="", value_type=str)
-        self.selected_mic_index = self.settings_manager.get_value('selected_mic_index', default=None, value_type=int)
-        self.activation_threshold = self.settings_manager.get_value('activation_threshold', default=1, value_type=int)
-        self.sound_response_probability = self.settings_manager.get_value('sound_response_probability', default=0.01, value_type=float)
-        self.sound_enabled = self.settings_manager.get_value('sound_enabled', default=True, value_type=bool)
-        self.autostart_enabled = self.settings_manager.get_value('autostart_enabled', default=False, value_type=bool)
-        self.playful_behavior_probability = self.settings_manager.get_value('playful_behavior_probability', default=0.1, value_type=float)
-        self.ground_level_setting = self.settings_manager.get_value('ground_level', default=0, value_type=int)
+        Copy the SettingsManager snapshot to the Duck's fields.
+        """
+        settings = self.settings_manager.settings
+        self.pet_name = settings.pet_name
+        self.selected_mic_index = settings.selected_mic_index
+        self.activation_threshold = settings.activation_threshold
+        self.sound_response_probability = settings.sound_response_probability
+        self.sound_enabled = settings.sound_enabled
+        self.autostart_enabled = settings.autostart_enabled
+        self.playful_behavior_probability = settings.playful_behavior_probability
+        self.ground_level_setting = settings.ground_level
         self.ground_level = self.get_ground_level()
-        self.pet_size = self.settings_manager.get_value('pet_size', default=3, value_type=int)
-        self.skin_folder = self.settings_manager.get_value('skin_folder', default=None, value_type=str)
-        self.selected_skin = self.settings_manager.get_value('selected_skin', default=None, value_type=str)
-        self.base_duck_speed = self.settings_manager.get_value('duck_speed', default=2.0, value_type=float)
+        self.pet_size = settings.pet_size
+        self.skin_folder = settings.skin_folder
+        self.selected_skin = settings.selected_skin
+        self.base_duck_speed = settings.duck_speed
         self.duck_speed = self.base_duck_speed * (self.pet_size / 3)
-        self.random_behavior = self.settings_manager.get_value('random_behavior', default=True, value_type=bool)
-        self.idle_duration = self.settings_manager.get_value('idle_duration', default=5.0, value_type=float)
-        self.sleep_timeout = self.settings_manager.get_value('sleep_timeout', default=300.0, value_type=float)
-        self.direction_change_interval = self.settings_manager.get_value('direction_change_interval', default=20.0, value_type=float)
-        self.name_offset_y = self.settings_manager.get_value('name_offset_y', default=60, value_type=int)
-        self.font_base_size = self.settings_manager.get_value('font_base_size', default=14, value_type=int)
-        self.current_language = self.settings_manager.get_value('current_language', default='en', value_type=str)
-        self.skipped_version = self.settings_manager.get_value('skipped_version', default="", value_type=str)
-        self.show_name = self.settings_manager.get_value('show_name', default=False, value_type=bool)
-        self.sound_volume = self.settings_manager.get_value('sound_volume', default=0.5, value_type=float)
-        self.sound_effect.setVolume(self.sound_volume)
+        self.random_behavior = settings.random_behavior
+        self.idle_duration = settings.idle_duration
+        self.sleep_timeout = settings.sleep_timeout
+        self.direction_change_interval = settings.direction_change_interval
+        self.name_offset_y = settings.name_offset_y
+        self.font_base_size = settings.font_base_size
+        self.current_language = settings.current_language
+        self.skipped_version = settings.skipped_version
+        self.show_name = settings.show_name
+        self.sound_volume = settings.sound_volume
+        if self._sound_effect is not None:
+            self._sound_effect.setVolume(self.sound_volume)
 
         # Reload translations after we know the user language.
         set_language(self.current_language)
-
-        # If there's a pet name, generate random characteristics from that. Otherwise defaults.
-        if self.pet_name.strip():
-            self.seed = get_seed_from_name(self.pet_name)
-            self.random_gen = random.Random(self.seed)
-            self.generate_characteristics()
-        else:
-            self.seed = None
-            self.random_gen = random.Random()
-            self.set_default_characteristics()
+        # Name-derived characteristics are (re)generated by apply_settings().
 
     def save_settings(self) -> None:
         """
@@ -1131,7 +1225,7 @@ class Duck(QtWidgets.QWidget):
 
         if not self.pet_name:
             self.settings_manager.set_value('sleep_timeout', self.sleep_timeout)
-        self.settings_manager.sync()
+        # Only the keys that changed are written, after a short debounce (see SettingsManager.flush).
 
     def apply_settings(self):
         """
@@ -1139,18 +1233,13 @@ class Duck(QtWidgets.QWidget):
         and update the UI if necessary.
         """
         self.update_duck_name()
-        self.update_pet_size(self.pet_size)
-        self.update_ground_level(self.ground_level_setting)
-
-        # Load the selected skin, or default if none is chosen.
-        if self.selected_skin is None:
-            logging.info("Loading default skin because selected_skin is None.")
-            self.resources.load_default_skin(lazy=False)
-        elif self.selected_skin and self.selected_skin != self.resources.current_skin:
-            logging.info(f"Loading selected skin: {self.selected_skin}")
-            self.resources.load_skin(self.selected_skin)
 
-        # Update the duck's visual appearance (e.g. force re-check of the idle frame).
+        # Skin first, then size: whichever changed drops the decoded frames once,
+        # and update_duck_skin() decodes them again at the final size.
+        self.load_selected_skin()
+        if self.pet_size != self.resources.pet_size:
+            self.update_pet_size(self.pet_size)
+        self.update_ground_level(self.ground_level_setting)
         self.update_duck_skin()
 
         # Autostart logic
@@ -1183,6 +1272,19 @@ class Duck(QtWidgets.QWidget):
             if self.name_window:
                 self.name_window.hide()
 
+    def load_selected_skin(self):
+        """
+        Point the resource manager at the selected skin (or the default one) without
+        decoding any frames; they are decoded on first use.
+        """
+        if self.selected_skin is None:
+            if self.resources.current_skin != "default":
+                logging.info("Loading default skin because selected_skin is None.")
+                self.resources.load_default_skin(lazy=True)
+        elif self.selected_skin and self.selected_skin != self.resources.current_skin:
+            logging.info(f"Loading selected skin: {self.selected_skin}")
+            self.resources.load_skin(self.selected_skin)
+
     def update_name_offset(self, offset):
         self.name_offset_y = offset
         self.settings_manager.set_value('name_offset_y', offset)
@@ -1313,12 +1415,30 @@ class Duck(QtWidgets.QWidget):
         if self.name_window:
             self.name_window.update_label()
 
+    @property
+    def sound_effect(self):
+        """
+        The shared QSoundEffect, created (and QtMultimedia imported) on first use.
+        """
+        if self._sound_effect is None:
+            QSoundEffect = lazy_import("PyQt6.QtMultimedia").QSoundEffect
+            self._sound_effect = QSoundEffect()
+            self._sound_effect.setVolume(self.sound_volume)
+            self._sound_effect.statusChanged.connect(self._play_pending_sound)
+        return self._sound_effect
+
+    def on_sound_volume_changed(self, volume):
+        self.sound_volume = volume
+        if self._sound_effect is not None:
+            self._sound_effect.setVolume(volume)
+
     def get_input_devices(self):
         """
         Query available audio input devices via sounddevice.
         """
         input_devices = []
         try:
+            sd = lazy_import("sounddevice")
             devices = sd.query_devices()
             for idx, device in enumerate(devices):
                 if device['max_input_channels'] > 0:
@@ -1334,8 +1454,9 @@ class Duck(QtWidgets.QWidget):
         """
         Stop and restart the microphone listener, e.g. if the user changes the input device.
         """
-        self.microphone_listener.stop()
-        self.microphone_listener.wait()
+        if self.microphone_listener:
+            self.microphone_listener.stop()
+            self.microphone_listener.wait()
         self.microphone_listener = MicrophoneListener(
             device_index=self.selected_mic_index,
             activation_threshold=self.activation_threshold
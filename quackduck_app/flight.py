@@ -0,0 +1,173 @@
+import collections
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .metrics import metrics
+
+# Flight recorder: the last FLIGHT_RING_SIZE events, written next to the crash log when
+# the app dies and on demand from the debug window.
+FLIGHT_RING_SIZE = 4096
+FLIGHT_DIR = os.path.join(os.path.expanduser("~"), "quackduck", "flight")
+FLIGHT_FORMAT_VERSION = 1
+# Frequent timers and microphone levels are folded into one event per window.
+SUMMARY_WINDOW_S = 1.0
+
+FlightEvent = Tuple[float, str, str, Dict[str, Any]]
+
+
+class FlightRecorder:
+    """
+    Fixed-size ring of recent events (wall time, kind, thread, fields). Recording is an
+    append to a deque, so it is cheap enough to leave on all the time and safe from any
+    thread. Timer ticks and microphone levels arrive far too often to keep one by one;
+    tick() and level() fold them into per-second summaries.
+    """
+
+    def __init__(self, capacity: int = FLIGHT_RING_SIZE, clock: Callable[[], float] = time.time) -> None:
+        self._events: Deque[FlightEvent] = collections.deque(maxlen=capacity)
+        self._clock = clock
+        # name -> [window start, count, total seconds, max seconds]
+        self._ticks: Dict[str, List[float]] = {}
+        # name -> [window start, count, total, min, max]
+        self._levels: Dict[str, List[float]] = {}
+
+    def record(self, kind: str, **fields: Any) -> None:
+        self._events.append((self._clock(), kind, threading.current_thread().name, fields))
+
+    def tick(self, name: str, seconds: float) -> None:
+        """
+        Count one run of a timer callback; emits a "ticks" event once per window.
+        """
+        now = self._clock()
+        summary = self._ticks.get(name)
+        if summary is None:
+            # Report the first run at once; slow timers would otherwise wait a whole period.
+            summary = self._ticks[name] = [now - SUMMARY_WINDOW_S, 0, 0.0, 0.0]
+        summary[1] += 1
+        summary[2] += seconds
+        if seconds > summary[3]:
+            summary[3] = seconds
+        if now - summary[0] >= SUMMARY_WINDOW_S:
+            self._flush_tick(name, summary, now)
+
+    def level(self, name: str, value: float) -> None:
+        """
+        Fold a sampled level (e.g. microphone volume) into a "level" event per window.
+        """
+        now = self._clock()
+        summary = self._levels.get(name)
+        if summary is None:
+            summary = self._levels[name] = [now, 0, 0.0, value, value]
+        summary[1] += 1
+        summary[2] += value
+        summary[3] = min(summary[3], value)
+        summary[4] = max(summary[4], value)
+        if now - summary[0] >= SUMMARY_WINDOW_S:
+            self._flush_level(name, summary, now)
+
+    def _flush_tick(self, name: str, summary: List[float], now: float) -> None:
+        _, count, total, peak = summary
+        if count:
+            self.record("ticks", name=name, count=int(count), avg_ms=round(total * 1000 / count, 3), max_ms=round(peak * 1000, 3))
+        summary[:] = [now, 0, 0.0, 0.0]
+
+    def _flush_level(self, name: str, summary: List[float], now: float) -> None:
+        _, count, total, low, high = summary
+        if count:
+            self.record("level", name=name, count=int(count), avg=round(total / count, 1), min=low, max=high)
+        self._levels.pop(name, None)
+
+    def flush(self) -> None:
+        """
+        Emit the partial summaries, so a dump includes the last moments.
+        """
+        now = self._clock()
+        for name, summary in list(self._ticks.items()):
+            self._flush_tick(name, summary, now)
+        for name, summary in list(self._levels.items()):
+            self._flush_level(name, summary, now)
+
+    def events(self) -> List[FlightEvent]:
+        return list(self._events)
+
+    def clear(self) -> None:
+        self._events.clear()
+        self._ticks.clear()
+        self._levels.clear()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def iter_jsonl(self, **header: Any) -> Iterator[str]:
+        yield json.dumps(
+            dict(header, kind="header", version=FLIGHT_FORMAT_VERSION, pid=os.getpid(), dumped_at=time.time()),
+            separators=(",", ":"),
+        )
+        for timestamp, kind, thread, fields in self.events():
+            yield json.dumps(dict(fields, t=round(timestamp, 3), kind=kind, thread=thread), separators=(",", ":"), default=str)
+
+    def dump(self, path: Optional[str] = None, **header: Any) -> str:
+        """
+        Write the ring as JSON lines (a header line first) and return the file path.
+        """
+        self.flush()
+        if path is None:
+            path = os.path.join(FLIGHT_DIR, time.strftime("flight-%Y%m%d-%H%M%S.jsonl"))
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            for line in self.iter_jsonl(**header):
+                file.write(line + "\n")
+        logging.info("Saved %s flight recorder events to %s", len(self._events), path)
+        return path
+
+
+flight_recorder = FlightRecorder()
+
+
+def recorded_tick(name: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator for timer callbacks: feeds their run time into the flight recorder (and
+    the metrics, when enabled).
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                flight_recorder.tick(name, elapsed)
+                metrics.observe("quackduck_tick_duration_seconds", elapsed, timer=name)
+
+        return wrapper
+
+    return decorator
+
+
+@contextlib.contextmanager
+def recorded_request(what: str, url: str) -> Iterator[Dict[str, Any]]:
+    """
+    Record a network call with its duration and outcome. The caller may add fields
+    (e.g. status) to the yielded dict. Query strings are left out of the log.
+    """
+    info: Dict[str, Any] = {}
+    start = time.perf_counter()
+    try:
+        yield info
+    except BaseException as exc:
+        info["error"] = type(exc).__name__
+        raise
+    finally:
+        flight_recorder.record(
+            "net", what=what, url=url.split("?", 1)[0], ms=round((time.perf_counter() - start) * 1000, 1), **info
+        )
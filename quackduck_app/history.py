@@ -0,0 +1,175 @@
+import collections
+import csv
+import itertools
+import logging
+import os
+import time
+from typing import Deque, Generic, Iterator, List, NamedTuple, Optional, TypeVar
+
+from PyQt6 import QtCore
+from PyQt6.QtCore import Qt
+
+# Number of state transitions kept for the debug window; QUACKDUCK_STATE_HISTORY overrides it.
+STATE_HISTORY_ENV = "QUACKDUCK_STATE_HISTORY"
+STATE_HISTORY_SIZE = 5000
+
+T = TypeVar("T")
+
+
+def _size_from_env() -> int:
+    try:
+        size = int(os.environ.get(STATE_HISTORY_ENV, "") or STATE_HISTORY_SIZE)
+    except ValueError:
+        logging.warning("Ignoring invalid %s value.", STATE_HISTORY_ENV)
+        return STATE_HISTORY_SIZE
+    return max(size, 1)
+
+
+class RingBuffer(Generic[T]):
+    """
+    Fixed-capacity buffer that drops the oldest items. total counts every item appended
+    since the last clear(), so readers can ask for just the items added since they last
+    looked; clears counts the clear() calls so they can tell the count started over.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._items: Deque[T] = collections.deque(maxlen=capacity)
+        self.total = 0
+        self.clears = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._items.maxlen
+
+    def append(self, item: T) -> None:
+        self._items.append(item)
+        self.total += 1
+
+    def since(self, total: int) -> List[T]:
+        """
+        Items appended after the buffer's total was `total`, oldest first (only those still held).
+        """
+        count = min(self.total - total, len(self._items))
+        if count <= 0:
+            return []
+        items = list(itertools.islice(reversed(self._items), count))
+        items.reverse()
+        return items
+
+    def clear(self) -> None:
+        self._items.clear()
+        self.total = 0
+        self.clears += 1
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+
+class StateTransition(NamedTuple):
+    monotonic: float
+    wall_time: float
+    old_state: str
+    new_state: str
+
+    def describe(self) -> str:
+        return f"{time.strftime('%H:%M:%S', time.localtime(self.wall_time))}: {self.old_state} -> {self.new_state}"
+
+
+class StateHistory(RingBuffer[StateTransition]):
+    """
+    Recent state transitions with monotonic timestamps (for durations) and wall-clock
+    timestamps (for display).
+    """
+
+    def __init__(self, capacity: Optional[int] = None) -> None:
+        super().__init__(capacity or _size_from_env())
+
+    def record(self, old_state: str, new_state: str) -> StateTransition:
+        transition = StateTransition(time.monotonic(), time.time(), old_state, new_state)
+        self.append(transition)
+        return transition
+
+    def export_csv(self, path: str) -> int:
+        """
+        Write the history to path and return the number of rows. duration_s is the time
+        spent in new_state, empty for the current state.
+        """
+        transitions = list(self)
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["monotonic", "wall_time", "old_state", "new_state", "duration_s"])
+            for index, transition in enumerate(transitions):
+                following = transitions[index + 1] if index + 1 < len(transitions) else None
+                duration = f"{following.monotonic - transition.monotonic:.3f}" if following else ""
+                writer.writerow([
+                    f"{transition.monotonic:.6f}",
+                    time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(transition.wall_time)),
+                    transition.old_state,
+                    transition.new_state,
+                    duration,
+                ])
+        logging.info("Exported %s state transitions to %s", len(transitions), path)
+        return len(transitions)
+
+
+class StateHistoryModel(QtCore.QAbstractListModel):
+    """
+    List model mirroring a StateHistory. sync() only inserts the transitions recorded
+    since the previous call and removes rows that fell out of the ring; after the
+    history was cleared it resets the model instead.
+    """
+
+    def __init__(self, history: StateHistory, parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+        self.history = history
+        self._rows: Deque[StateTransition] = collections.deque()
+        self._seen = history.total - len(history)
+        self._clears = history.clears
+        self.sync()
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()].describe()
+        if role == Qt.ItemDataRole.UserRole:
+            return self._rows[index.row()]
+        return None
+
+    def sync(self) -> int:
+        """
+        Pull new transitions from the history; returns how many rows were added.
+        """
+        if self.history.total < self._seen or self.history.clears != self._clears:
+            self.beginResetModel()
+            self._rows = collections.deque(self.history)
+            self._seen = self.history.total
+            self._clears = self.history.clears
+            self.endResetModel()
+            return len(self._rows)
+        if self.history.total == self._seen:
+            return 0
+        new_rows = self.history.since(self._seen)
+        self._seen = self.history.total
+
+        overflow = len(self._rows) + len(new_rows) - self.history.capacity
+        if overflow > 0:
+            removed = min(overflow, len(self._rows))
+            if removed:
+                self.beginRemoveRows(QtCore.QModelIndex(), 0, removed - 1)
+                for _ in range(removed):
+                    self._rows.popleft()
+                self.endRemoveRows()
+
+        if new_rows:
+            first = len(self._rows)
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(new_rows) - 1)
+            self._rows.extend(new_rows)
+            self.endInsertRows()
+        return len(new_rows)
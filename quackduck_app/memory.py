@@ -0,0 +1,198 @@
+import collections
+import gc
+import logging
+import os
+import time
+import tracemalloc
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+from .perf import process_rss_bytes
+
+# Memory diagnostics. The RSS line is logged every QUACKDUCK_MEMORY_LOG_INTERVAL seconds
+# (0 disables); --memory-log=SECONDS and --tracemalloc[=FRAMES] do the same from the command line.
+MEMORY_LOG_ENV = "QUACKDUCK_MEMORY_LOG_INTERVAL"
+MEMORY_LOG_INTERVAL_S = 900
+TRACEMALLOC_FRAMES = 1
+SNAPSHOT_LIMIT = 4
+DIFF_LIMIT = 20
+
+# Qt types counted by the object census; their memory lives outside the Python heap.
+CENSUS_TYPES = (QtGui.QPixmap, QtGui.QImage, QtCore.QTimer, QtWidgets.QWidget)
+
+_IGNORED_TRACES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemorySnapshot(NamedTuple):
+    label: str
+    timestamp: float
+    rss_bytes: Optional[int]
+    snapshot: tracemalloc.Snapshot
+
+    @property
+    def traced_bytes(self) -> int:
+        return sum(stat.size for stat in self.snapshot.statistics("filename"))
+
+
+def format_bytes(value: Optional[int]) -> str:
+    if value is None:
+        return "n/a"
+    sign = "-" if value < 0 else ""
+    value = abs(value)
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{sign}{value:.0f} {unit}" if unit == "B" else f"{sign}{value:.1f} {unit}"
+        value /= 1024
+    return f"{sign}{value:.1f} GB"
+
+
+def object_census(types: Sequence[type] = CENSUS_TYPES) -> Dict[str, int]:
+    """
+    Count live Python wrappers of the given Qt types (subclasses count towards their base).
+    Walks every GC-tracked object, so call it on demand only.
+    """
+    types = tuple(types)
+    counts = {base.__name__: 0 for base in types}
+    for obj in gc.get_objects():
+        if isinstance(obj, types):
+            for base in types:
+                if isinstance(obj, base):
+                    counts[base.__name__] += 1
+                    break
+    app = QtWidgets.QApplication.instance()
+    if isinstance(app, QtWidgets.QApplication):
+        # Includes widgets created by Qt itself, which have no Python wrapper.
+        counts["QWidget (all)"] = len(app.allWidgets())
+    return counts
+
+
+class MemoryProfiler:
+    """
+    On-demand tracemalloc snapshots (the last few are kept), diffs between them grouped
+    by file and line, and a periodic RSS log line.
+    """
+
+    def __init__(self, snapshot_limit: int = SNAPSHOT_LIMIT) -> None:
+        self.snapshots: collections.deque = collections.deque(maxlen=snapshot_limit)
+        self._baseline: Optional[MemorySnapshot] = None
+        self._log_timer: Optional[QtCore.QTimer] = None
+        self._started_tracing = False
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start_tracing(self, frames: int = TRACEMALLOC_FRAMES) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self._started_tracing = True
+            logging.info("tracemalloc started (%s frame(s) per allocation).", frames)
+
+    def stop_tracing(self) -> None:
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logging.info("tracemalloc stopped.")
+        self._started_tracing = False
+        self.snapshots.clear()
+        self._baseline = None
+
+    def take_snapshot(self, label: str = "") -> MemorySnapshot:
+        """
+        Snapshot the traced allocations; starts tracemalloc first if needed.
+        """
+        self.start_tracing()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_TRACES)
+        taken = MemorySnapshot(label or time.strftime("%H:%M:%S"), time.time(), process_rss_bytes(), snapshot)
+        self.snapshots.append(taken)
+        if self._baseline is None:
+            self._baseline = taken
+        return taken
+
+    @staticmethod
+    def diff(older: MemorySnapshot, newer: MemorySnapshot, limit: int = DIFF_LIMIT, key_type: str = "lineno") -> List[str]:
+        """
+        Largest allocation changes between two snapshots, grouped by file and line.
+        """
+        lines = [
+            f"{older.label} -> {newer.label}: traced {format_bytes(newer.traced_bytes - older.traced_bytes)}, "
+            f"RSS {format_bytes(None if None in (older.rss_bytes, newer.rss_bytes) else newer.rss_bytes - older.rss_bytes)}"
+        ]
+        stats = newer.snapshot.compare_to(older.snapshot, key_type)
+        for stat in stats[:limit]:
+            frame = stat.traceback[0]
+            lines.append(
+                f"{format_bytes(stat.size_diff):>10} {stat.count_diff:+7d} blocks  "
+                f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            )
+        return lines
+
+    @staticmethod
+    def top(snapshot: MemorySnapshot, limit: int = DIFF_LIMIT) -> List[str]:
+        lines = [f"{snapshot.label}: traced {format_bytes(snapshot.traced_bytes)}, RSS {format_bytes(snapshot.rss_bytes)}"]
+        for stat in snapshot.snapshot.statistics("lineno")[:limit]:
+            frame = stat.traceback[0]
+            lines.append(f"{format_bytes(stat.size):>10} {stat.count:7d} blocks  {os.path.basename(frame.filename)}:{frame.lineno}")
+        return lines
+
+    def diff_latest(self, limit: int = DIFF_LIMIT) -> List[str]:
+        if len(self.snapshots) < 2:
+            return ["Take two snapshots to compare them."]
+        return self.diff(self.snapshots[-2], self.snapshots[-1], limit)
+
+    def start_rss_log(self, interval_s: int) -> None:
+        if interval_s <= 0:
+            return
+        if self._log_timer is None:
+            self._log_timer = QtCore.QTimer()
+            self._log_timer.timeout.connect(self.log_memory)
+        self._log_timer.start(interval_s * 1000)
+
+    def stop_rss_log(self) -> None:
+        if self._log_timer is not None:
+            self._log_timer.stop()
+
+    def log_memory(self) -> None:
+        """
+        Log the RSS; while tracing, also the biggest growth since the first snapshot.
+        """
+        logging.info("Memory: RSS %s", format_bytes(process_rss_bytes()))
+        if self.tracing:
+            if self._baseline is None:
+                self.take_snapshot("baseline")
+                return
+            current = self.take_snapshot()
+            logging.info("Memory growth since baseline:\n%s", "\n".join(self.diff(self._baseline, current, limit=10)))
+
+
+memory_profiler = MemoryProfiler()
+
+
+def _log_interval_from_env() -> int:
+    try:
+        return max(int(os.environ.get(MEMORY_LOG_ENV, "") or MEMORY_LOG_INTERVAL_S), 0)
+    except ValueError:
+        logging.warning("Ignoring invalid %s value.", MEMORY_LOG_ENV)
+        return MEMORY_LOG_INTERVAL_S
+
+
+def configure_memory_diagnostics(argv: Sequence[str]) -> None:
+    """
+    Apply --memory-log=SECONDS and --tracemalloc[=FRAMES] (falling back to the environment).
+    """
+    interval = _log_interval_from_env()
+    for arg in argv:
+        name, _, value = arg.partition("=")
+        try:
+            if name == "--memory-log":
+                interval = max(int(value), 0)
+            elif name == "--tracemalloc":
+                memory_profiler.start_tracing(int(value) if value else TRACEMALLOC_FRAMES)
+        except ValueError:
+            logging.warning("Ignoring invalid argument %s", arg)
+    memory_profiler.start_rss_log(interval)
@@ -0,0 +1,332 @@
+import collections
+import gc
+import logging
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+from PyQt6 import QtCore
+
+from .perf import process_rss_bytes
+from .watchdog import watchdog
+
+# Runtime metrics in the Prometheus text format. Off unless QUACKDUCK_METRICS_FILE (a
+# scrape file for e.g. node_exporter's textfile collector) or QUACKDUCK_METRICS_PORT (an
+# HTTP endpoint on 127.0.0.1) is set; --metrics-file=PATH, --metrics-port=PORT and
+# --metrics-interval=SECONDS do the same from the command line.
+METRICS_FILE_ENV = "QUACKDUCK_METRICS_FILE"
+METRICS_PORT_ENV = "QUACKDUCK_METRICS_PORT"
+METRICS_INTERVAL_ENV = "QUACKDUCK_METRICS_INTERVAL"
+METRICS_INTERVAL_S = 15
+METRICS_HOST = "127.0.0.1"
+METRICS_PATH = "/metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Summaries report quantiles over the last SUMMARY_WINDOW observations.
+SUMMARY_WINDOW = 1024
+SUMMARY_QUANTILES = (0.5, 0.99)
+
+# name -> (type, help) for every metric the app reports.
+METRICS = {
+    "quackduck_tick_duration_seconds": ("summary", "Run time of the duck's timer callbacks; rate(_count) gives ticks per second."),
+    "quackduck_state_transitions_total": ("counter", "State transitions by the state entered."),
+    "quackduck_repaints_total": ("counter", "Paint events of the duck window."),
+    "quackduck_resource_cache_requests_total": ("counter", "ResourceManager cache lookups by cache and result."),
+    "quackduck_resource_cache_hit_ratio": ("gauge", "Share of ResourceManager cache lookups that hit, since start."),
+    "quackduck_mic_callbacks_total": ("counter", "Microphone volume updates received."),
+    "quackduck_update_checks_total": ("counter", "Update checks by outcome."),
+    "quackduck_resident_memory_bytes": ("gauge", "Resident set size of the process."),
+    "quackduck_pixmap_bytes": ("gauge", "Approximate memory held by the current skin's pixmaps."),
+    "quackduck_python_objects": ("gauge", "Objects tracked by the Python garbage collector."),
+    "quackduck_event_loop_stalls_total": ("counter", "GUI event-loop stalls reported by the watchdog."),
+    "quackduck_uptime_seconds": ("gauge", "Seconds since the metrics were enabled."),
+}
+
+LabelSet = Tuple[Tuple[str, str], ...]
+Collected = Union[None, float, Dict[LabelSet, float]]
+
+
+def _labels(labels: Dict[str, object]) -> LabelSet:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Summary:
+    __slots__ = ("count", "total", "recent")
+
+    def __init__(self, window: int) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.recent: Deque[float] = collections.deque(maxlen=window)
+
+
+class MetricsRegistry:
+    """
+    Counters, summaries and collected gauges. inc() and observe() return right away
+    while disabled, so the hot paths may call them unconditionally. Updates may come
+    from any thread; render() produces the Prometheus text exposition.
+    """
+
+    def __init__(self, window: int = SUMMARY_WINDOW) -> None:
+        self.enabled = False
+        self._window = window
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelSet, float]] = {}
+        self._summaries: Dict[str, Dict[LabelSet, _Summary]] = {}
+        self._collectors: Dict[str, Callable[[], Collected]] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels: object) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels) if labels else ()
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels) if labels else ()
+        with self._lock:
+            series = self._summaries.setdefault(name, {})
+            summary = series.get(key)
+            if summary is None:
+                summary = series[key] = _Summary(self._window)
+            summary.count += 1
+            summary.total += value
+            summary.recent.append(value)
+
+    def collect(self, name: str, collector: Callable[[], Collected]) -> None:
+        """
+        Register a callable evaluated at render time: a number, {labels: value} or None to skip.
+        """
+        self._collectors[name] = collector
+
+    def counter_values(self, name: str) -> Dict[LabelSet, float]:
+        with self._lock:
+            return dict(self._counters.get(name, {}))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+        self._collectors.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            summaries = {
+                name: {key: (summary.count, summary.total, sorted(summary.recent)) for key, summary in series.items()}
+                for name, series in self._summaries.items()
+            }
+        samples: Dict[str, List[str]] = collections.defaultdict(list)
+        for name, series in counters.items():
+            for key, value in sorted(series.items()):
+                samples[name].append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        for name, series in summaries.items():
+            for key, (count, total, recent) in sorted(series.items()):
+                for quantile in SUMMARY_QUANTILES:
+                    value = recent[min(int(quantile * len(recent)), len(recent) - 1)] if recent else math.nan
+                    samples[name].append(f"{name}{_format_labels(key + (('quantile', str(quantile)),))} {_format_value(value)}")
+                samples[name].append(f"{name}_sum{_format_labels(key)} {_format_value(total)}")
+                samples[name].append(f"{name}_count{_format_labels(key)} {_format_value(count)}")
+        for name, collector in list(self._collectors.items()):
+            try:
+                collected = collector()
+            except Exception as exc:
+                logging.debug("Metric %s could not be collected: %s", name, exc)
+                continue
+            if collected is None:
+                continue
+            if not isinstance(collected, dict):
+                collected = {(): collected}
+            for key, value in sorted(collected.items()):
+                samples[name].append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+        lines = []
+        for name in sorted(samples):
+            kind, description = METRICS.get(name, ("untyped", ""))
+            if description:
+                lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples[name])
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def _cache_hit_ratio() -> Dict[LabelSet, float]:
+    totals: Dict[str, List[float]] = collections.defaultdict(lambda: [0, 0])
+    for key, value in metrics.counter_values("quackduck_resource_cache_requests_total").items():
+        labels = dict(key)
+        entry = totals[labels.get("cache", "")]
+        entry[1] += value
+        if labels.get("result") == "hit":
+            entry[0] += value
+    return {(("cache", cache),): hits / total for cache, (hits, total) in totals.items() if total}
+
+
+def register_process_metrics(started: Optional[float] = None) -> None:
+    started = time.monotonic() if started is None else started
+    metrics.collect("quackduck_resident_memory_bytes", process_rss_bytes)
+    metrics.collect("quackduck_python_objects", lambda: len(gc.get_objects()))
+    metrics.collect("quackduck_event_loop_stalls_total", lambda: sum(watchdog.histogram))
+    metrics.collect("quackduck_resource_cache_hit_ratio", _cache_hit_ratio)
+    metrics.collect("quackduck_uptime_seconds", lambda: round(time.monotonic() - started, 3))
+
+
+def register_duck_metrics(duck) -> None:
+    resources = duck.resources
+    metrics.collect("quackduck_pixmap_bytes", resources.pixmap_bytes)
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != METRICS_PATH:
+            self.send_error(404)
+            return
+        body = self.server.exporter.text.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsExporter:
+    """
+    Renders the registry every interval on the GUI thread (so collectors never race the
+    objects they read), writes it atomically to path and serves the latest rendering
+    on 127.0.0.1:port. port 0 picks a free port; None disables the endpoint.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry = metrics,
+        path: Optional[str] = None,
+        port: Optional[int] = None,
+        interval_s: float = METRICS_INTERVAL_S,
+    ) -> None:
+        self.registry = registry
+        self.path = path
+        self.port = port
+        self.interval_s = interval_s
+        self.text = ""
+        self._timer: Optional[QtCore.QTimer] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Optional[Tuple[str, int]]:
+        return self._server.server_address[:2] if self._server is not None else None
+
+    def start(self) -> None:
+        self.registry.enabled = True
+        self.export()
+        self._timer = QtCore.QTimer()
+        self._timer.timeout.connect(self.export)
+        self._timer.start(int(self.interval_s * 1000))
+        if self.port is not None:
+            try:
+                self._server = ThreadingHTTPServer((METRICS_HOST, self.port), _MetricsRequestHandler)
+            except OSError as exc:
+                logging.error("Failed to serve metrics on %s:%s: %s", METRICS_HOST, self.port, exc)
+            else:
+                self._server.daemon_threads = True
+                self._server.exporter = self
+                self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True)
+                self._thread.start()
+                logging.info("Serving metrics on http://%s:%s%s", *self.address, METRICS_PATH)
+        if self.path:
+            logging.info("Writing metrics to %s every %s s", self.path, self.interval_s)
+
+    def stop(self) -> None:
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+        self.registry.enabled = False
+
+    def export(self) -> str:
+        self.text = self.registry.render()
+        if self.path:
+            temp_path = self.path + ".tmp"
+            try:
+                folder = os.path.dirname(self.path)
+                if folder:
+                    os.makedirs(folder, exist_ok=True)
+                with open(temp_path, "w", encoding="utf-8") as file:
+                    file.write(self.text)
+                # Scrapers never see a half-written file.
+                os.replace(temp_path, self.path)
+            except OSError as exc:
+                logging.error("Failed to write metrics to %s: %s", self.path, exc)
+        return self.text
+
+
+def _settings_from_env() -> Tuple[Optional[str], Optional[int], float]:
+    path = os.environ.get(METRICS_FILE_ENV) or None
+    port = interval = None
+    try:
+        port = int(os.environ.get(METRICS_PORT_ENV, "") or 0) or None
+    except ValueError:
+        logging.warning("Ignoring invalid %s value.", METRICS_PORT_ENV)
+    try:
+        interval = float(os.environ.get(METRICS_INTERVAL_ENV, "") or METRICS_INTERVAL_S)
+    except ValueError:
+        logging.warning("Ignoring invalid %s value.", METRICS_INTERVAL_ENV)
+    return path, port, interval or METRICS_INTERVAL_S
+
+
+def configure_metrics(argv: Sequence[str]) -> Optional[MetricsExporter]:
+    """
+    Apply --metrics-file=PATH, --metrics-port=PORT and --metrics-interval=SECONDS (falling
+    back to the environment). Returns the started exporter, or None when metrics are off.
+    """
+    path, port, interval = _settings_from_env()
+    for arg in argv:
+        name, _, value = arg.partition("=")
+        try:
+            if name == "--metrics-file":
+                path = value or None
+            elif name == "--metrics-port":
+                port = int(value) or None
+            elif name == "--metrics-interval":
+                interval = float(value) or METRICS_INTERVAL_S
+        except ValueError:
+            logging.warning("Ignoring invalid argument %s", arg)
+    if not path and port is None:
+        return None
+    register_process_metrics()
+    exporter = MetricsExporter(path=path, port=port, interval_s=max(interval, 1))
+    exporter.start()
+    return exporter
@@ -0,0 +1,172 @@
+import bisect
+import functools
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Inclusive upper bounds (ms) of the timer jitter histogram buckets; the last bucket is open-ended.
+JITTER_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100)
+
+
+def process_rss_bytes() -> Optional[int]:
+    """
+    Resident set size of this process, or None where it can't be read.
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm", "r") as file:
+                pages = int(file.read().split()[1])
+            return pages * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == "win32":
+        try:
+            import win32api
+            import win32process
+
+            return int(win32process.GetProcessMemoryInfo(win32api.GetCurrentProcess())["WorkingSetSize"])
+        except Exception as exc:
+            logging.debug("Could not read process memory: %s", exc)
+            return None
+    try:
+        import resource
+
+        # Peak rather than current RSS, but the best the stdlib offers here (bytes on macOS).
+        return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    except Exception:
+        return None
+
+
+class _TickStats:
+    __slots__ = ("count", "last", "jitter")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.last: Optional[float] = None
+        self.jitter = [0] * (len(JITTER_BUCKETS_MS) + 1)
+
+
+class PerfMonitor:
+    """
+    Cheap counters for the debug HUD: timer tick rates and jitter, per-state time spent
+    in the duck's timer callbacks, paint time and event counters. Nothing is recorded
+    while disabled; snapshot() turns the counters into rates for the interval since the
+    previous snapshot.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.enabled = False
+        self._clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        self._ticks: Dict[str, _TickStats] = defaultdict(_TickStats)
+        self._times: Dict[Tuple[str, str], List[float]] = defaultdict(lambda: [0, 0.0])
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._window_start = self._clock()
+
+    def tick(self, name: str, expected_ms: float, now: Optional[float] = None) -> float:
+        """
+        Record one firing of a periodic timer and bucket its deviation from expected_ms.
+        """
+        now = self._clock() if now is None else now
+        stats = self._ticks[name]
+        if stats.last is not None and expected_ms > 0:
+            jitter_ms = abs((now - stats.last) * 1000 - expected_ms)
+            stats.jitter[bisect.bisect_left(JITTER_BUCKETS_MS, jitter_ms)] += 1
+        stats.last = now
+        stats.count += 1
+        return now
+
+    def add_time(self, kind: str, label: str, seconds: float) -> None:
+        entry = self._times[(kind, label)]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def count(self, name: str, amount: int = 1) -> None:
+        if self.enabled:
+            self._counters[name] += amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Rates and totals for the interval since the last snapshot; counters restart afterwards.
+        """
+        now = self._clock()
+        elapsed = max(now - self._window_start, 1e-9)
+        result = {
+            "elapsed": elapsed,
+            "tick_rates": {name: stats.count / elapsed for name, stats in self._ticks.items()},
+            "jitter": {name: list(stats.jitter) for name, stats in self._ticks.items()},
+            "times": {key: (calls, total) for key, (calls, total) in self._times.items()},
+            "rates": {name: value / elapsed for name, value in self._counters.items()},
+            "counters": dict(self._counters),
+        }
+        last_ticks = {name: stats.last for name, stats in self._ticks.items()}
+        self.reset()
+        # Keep the previous tick times so the first interval of the next window still counts.
+        for name, last in last_ticks.items():
+            self._ticks[name].last = last
+        return result
+
+
+perf_monitor = PerfMonitor()
+
+
+def measured(kind: str, timer_attr: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorator for Duck callbacks: counts a tick (with jitter against the interval of the
+    timer named by timer_attr) and charges the time spent to the duck's current state.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(duck, *args, **kwargs):
+            monitor = perf_monitor
+            if not monitor.enabled:
+                return func(duck, *args, **kwargs)
+            timer = getattr(duck, timer_attr, None) if timer_attr else None
+            start = monitor.tick(kind, timer.interval() if timer is not None else 0)
+            label = type(duck.state).__name__ if getattr(duck, "state", None) is not None else "None"
+            try:
+                return func(duck, *args, **kwargs)
+            finally:
+                monitor.add_time(kind, label, monitor._clock() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def _format_bytes(value: Optional[int]) -> str:
+    if value is None:
+        return "n/a"
+    return f"{value / (1024 * 1024):.1f} MB"
+
+
+def format_report(snapshot: Dict[str, Any], pixmap_bytes: Optional[int] = None, rss_bytes: Optional[int] = None) -> str:
+    """
+    Render a snapshot as the plain-text table shown in the debug window.
+    """
+    lines = [f"Window: {snapshot['elapsed']:.2f} s"]
+    for name, rate in sorted(snapshot["tick_rates"].items()):
+        lines.append(f"{name:<10} {rate:7.1f} /s")
+    rates = snapshot["rates"]
+    lines.append(f"{'mic':<10} {rates.get('mic_callbacks', 0.0):7.1f} callbacks/s")
+    lines.append(f"Pixmap cache: {_format_bytes(pixmap_bytes)}")
+    lines.append(f"Process RSS:  {_format_bytes(rss_bytes)}")
+
+    labels = [f"<={bound}ms" for bound in JITTER_BUCKETS_MS] + [f">{JITTER_BUCKETS_MS[-1]}ms"]
+    lines.append("")
+    lines.append("Timer jitter " + " ".join(f"{label:>7}" for label in labels))
+    for name, buckets in sorted(snapshot["jitter"].items()):
+        if sum(buckets):
+            lines.append(f"{name:<12} " + " ".join(f"{count:>7}" for count in buckets))
+
+    lines.append("")
+    lines.append(f"{'Callback':<10} {'State':<16} {'Calls':>6} {'Total ms':>9} {'Avg ms':>8}")
+    for (kind, label), (calls, total) in sorted(snapshot["times"].items()):
+        lines.append(f"{kind:<10} {label:<16} {calls:>6} {total * 1000:>9.2f} {total * 1000 / calls:>8.3f}")
+    return "\n".join(lines)
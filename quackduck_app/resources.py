@@ -1,9 +1,11 @@
+import hashlib
 import json
 import logging
 import os
 import random
 import shutil
 import tempfile
+import time
 import zipfile
 from typing import Dict, List, Optional, Tuple
 
@@ -11,7 +13,14 @@ from PyQt6 import QtGui
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap
 
-from .core import log_call_stack, resource_path
+from autoupdater import file_sha256
+
+from .core import resource_path
+from .diagnostics import record_stack
+from .flight import flight_recorder
+from .metrics import metrics
+from .tracing import traced
+from .warmstart import FrameCache
 
 
 class ResourceManager:
@@ -19,7 +28,7 @@ class ResourceManager:
     Manages animations, sounds, and skins for the duck.
     """
 
-    def __init__(self, scale_factor: float, pet_size: int = 3) -> None:
+    def __init__(self, scale_factor: float, pet_size: int = 3, frame_cache: Optional[FrameCache] = None) -> None:
         self.assets_dir = resource_path("assets")
         self.skins_dir = os.path.join(self.assets_dir, "skins")
         self.current_skin = "default"
@@ -48,53 +57,64 @@ class ResourceManager:
         self.loaded_frames_cache: Dict[Tuple[int, int], QPixmap] = {}
         self.sprites_loaded = False
         self.sounds_loaded = False
+        self._sprites_failed = False
+        self._loading_failed = False
+        self._load_attempts = 0
+        self.frame_cache = frame_cache
+        self._skin_hashes: Dict[Tuple[str, int, int], str] = {}
 
-        self.load_default_skin(lazy=False)
+        # Frames are decoded on first use, once the caller has picked the skin and size.
+        self.load_default_skin(lazy=True)
 
+    @traced(category="resources")
     def load_skin_frames_for_preview(self, is_default=False, skin_path=None):
         try:
             if is_default:
-                animations_config = self.default_animations_config
                 spritesheet_path = os.path.join(self.skins_dir, "default", "spritesheet.png")
-                frame_width, frame_height = 32, 32
-            else:
-                with zipfile.ZipFile(skin_path, "r") as zip_ref:
-                    temp_dir = tempfile.mkdtemp()
-                    zip_ref.extractall(temp_dir)
+                return self._extract_idle_frames(spritesheet_path, self.default_animations_config, 32, 32)
 
-                    config_path = os.path.join(temp_dir, "config.json")
-                    with open(config_path, "r") as f:
-                        config = json.load(f)
-
-                    frame_width = config.get("frame_width")
-                    frame_height = config.get("frame_height")
-                    animations_config = config.get("animations", {})
-                    spritesheet_path = os.path.join(temp_dir, config.get("spritesheet", ""))
-
-            if not os.path.exists(spritesheet_path):
-                logging.error("Spritesheet not found: %s", spritesheet_path)
-                return []
-
-            spritesheet = QtGui.QPixmap(spritesheet_path)
-            if spritesheet.isNull():
-                logging.error("Failed to load spritesheet: %s", spritesheet_path)
-                return []
+            # The frames are copied out of the spritesheet, so the extracted files can go right away.
+            with zipfile.ZipFile(skin_path, "r") as zip_ref, tempfile.TemporaryDirectory() as temp_dir:
+                zip_ref.extractall(temp_dir)
 
-            idle_frames = []
-            for frame_str in animations_config.get("idle", []):
-                try:
-                    row, col = map(int, frame_str.split(":"))
-                    x = col * frame_width
-                    y = row * frame_height
-                    frame = spritesheet.copy(x, y, frame_width, frame_height)
-                    idle_frames.append(frame)
-                except Exception as exc:
-                    logging.error("Error extracting frame %s: %s", frame_str, exc)
-            return idle_frames
+                config_path = os.path.join(temp_dir, "config.json")
+                with open(config_path, "r") as f:
+                    config = json.load(f)
+
+                spritesheet_path = os.path.join(temp_dir, config.get("spritesheet", ""))
+                return self._extract_idle_frames(
+                    spritesheet_path,
+                    config.get("animations", {}),
+                    config.get("frame_width"),
+                    config.get("frame_height"),
+                )
         except Exception as exc:
             logging.error("Error loading frames for preview: %s", exc)
             return []
 
+    @staticmethod
+    def _extract_idle_frames(spritesheet_path, animations_config, frame_width, frame_height):
+        if not os.path.exists(spritesheet_path):
+            logging.error("Spritesheet not found: %s", spritesheet_path)
+            return []
+
+        spritesheet = QtGui.QPixmap(spritesheet_path)
+        if spritesheet.isNull():
+            logging.error("Failed to load spritesheet: %s", spritesheet_path)
+            return []
+
+        idle_frames = []
+        for frame_str in animations_config.get("idle", []):
+            try:
+                row, col = map(int, frame_str.split(":"))
+                x = col * frame_width
+                y = row * frame_height
+                frame = spritesheet.copy(x, y, frame_width, frame_height)
+                idle_frames.append(frame)
+            except Exception as exc:
+                logging.error("Error extracting frame %s: %s", frame_str, exc)
+        return idle_frames
+
     def cleanup_temp_dir(self) -> None:
         if self.current_skin_temp_dir and os.path.exists(self.current_skin_temp_dir):
             try:
@@ -109,6 +129,10 @@ class ResourceManager:
         self.loaded_frames_cache.clear()
         self.sprites_loaded = False
         self.sounds_loaded = False
+        # A different skin gets a fresh set of load attempts.
+        self._sprites_failed = False
+        self._loading_failed = False
+        self._load_attempts = 0
 
     def validate_config(self, config: dict) -> bool:
         required_keys = ["spritesheet", "frame_width", "frame_height", "animations"]
@@ -121,12 +145,14 @@ class ResourceManager:
             return False
         return True
 
+    @traced(category="resources")
     def load_default_skin(self, lazy: bool = False) -> None:
         logging.info("Default skin loading triggered.")
-        log_call_stack()
+        record_stack("load_default_skin")
 
         self.cleanup_temp_dir()
         self.current_skin = "default"
+        flight_recorder.record("skin", skin="default", outcome="selected")
         skin_path = os.path.join(self.skins_dir, "default")
         self.spritesheet_path = os.path.join(skin_path, "spritesheet.png")
         self.frame_width = 32
@@ -138,6 +164,7 @@ class ResourceManager:
             self.load_sprites_now()
             self.load_sounds_now()
 
+    @traced(category="resources")
     def load_spritesheet_if_needed(self) -> None:
         if self.loaded_spritesheet is None and self.spritesheet_path:
             if hasattr(self, "_loading_failed") and self._loading_failed:
@@ -159,6 +186,7 @@ class ResourceManager:
             self.loaded_spritesheet = spritesheet
             self._loading_failed = False
 
+    @traced(category="resources")
     def load_sprites_now(self, force_reload: bool = False) -> None:
         if self.sprites_loaded and not force_reload:
             logging.info("Sprites already loaded. Skipping reload.")
@@ -176,11 +204,18 @@ class ResourceManager:
 
         self._load_attempts = getattr(self, "_load_attempts", 0) + 1
         logging.info("Loading sprites (attempt %s)...", self._load_attempts)
+        started = time.perf_counter()
+
+        if self._restore_cached_frames():
+            self._load_attempts = 0
+            self._record_sprite_load("cache", started)
+            return
 
         self.load_spritesheet_if_needed()
         if self.loaded_spritesheet is None:
             logging.error("Spritesheet not loaded. Skipping animations.")
             self._sprites_failed = True
+            self._record_sprite_load("failed", started)
             return
 
         self.animations.clear()
@@ -195,9 +230,23 @@ class ResourceManager:
         if not self.animations:
             logging.error("No animations loaded. Marking sprites as failed.")
             self._sprites_failed = True
+            self._record_sprite_load("failed", started)
         else:
             self.sprites_loaded = True
+            # Only consecutive failures count towards the limit; skins get reloaded many times a day.
+            self._load_attempts = 0
+            self._record_sprite_load("decoded", started)
+
+    def _record_sprite_load(self, outcome: str, started: float) -> None:
+        flight_recorder.record(
+            "skin",
+            skin=os.path.basename(self.current_skin),
+            outcome=outcome,
+            animations=len(self.animations),
+            ms=round((time.perf_counter() - started) * 1000, 1),
+        )
 
+    @traced(category="resources")
     def load_sounds_now(self) -> None:
         if self.sounds_loaded:
             return
@@ -205,6 +254,7 @@ class ResourceManager:
         logging.info("Loaded %s sound files.", len(self.sounds))
         self.sounds_loaded = True
 
+    @traced(category="resources")
     def load_skin(self, skin_file: str) -> bool:
         self.cleanup_temp_dir()
 
@@ -263,6 +313,7 @@ class ResourceManager:
                 self.frame_height = frame_height
                 self.animations_config = animations
                 self.current_skin = skin_file
+                flight_recorder.record("skin", skin=os.path.basename(skin_file), outcome="selected")
                 return True
         except Exception as exc:
             logging.error("Failed to load skin %s: %s", skin_file, exc)
@@ -277,15 +328,17 @@ class ResourceManager:
         self.loaded_spritesheet = None
 
     def get_frame(self, row: int, col: int) -> QPixmap:
+        key = (row, col)
+        if key in self.loaded_frames_cache:
+            metrics.inc("quackduck_resource_cache_requests_total", cache="frames", result="hit")
+            return self.loaded_frames_cache[key]
+        metrics.inc("quackduck_resource_cache_requests_total", cache="frames", result="miss")
+
         if self.loaded_spritesheet is None:
             self.load_spritesheet_if_needed()
             if self.loaded_spritesheet is None:
                 return QPixmap()
 
-        key = (row, col)
-        if key in self.loaded_frames_cache:
-            return self.loaded_frames_cache[key]
-
         spritesheet = self.loaded_spritesheet
         frame = spritesheet.copy(col * self.frame_width, row * self.frame_height, self.frame_width, self.frame_height)
         new_width = self.frame_width * self.pet_size
@@ -300,6 +353,78 @@ class ResourceManager:
         self.loaded_frames_cache[key] = frame
         return frame
 
+    def frame_cache_key(self) -> Optional[str]:
+        """
+        Digest of the skin file, its frame layout and the pet size, or None if the skin can't be read.
+        """
+        source = self.current_skin if self.current_skin != "default" else self.spritesheet_path
+        if not source:
+            return None
+        try:
+            stat = os.stat(source)
+            stamp = (source, stat.st_size, stat.st_mtime_ns)
+            skin_hash = self._skin_hashes.get(stamp)
+            if skin_hash is None:
+                skin_hash = self._skin_hashes[stamp] = file_sha256(source)
+        except OSError as exc:
+            logging.warning("Cannot fingerprint skin %s: %s", source, exc)
+            return None
+        layout = json.dumps(
+            [skin_hash, self.frame_width, self.frame_height, self.pet_size, self.animations_config],
+            sort_keys=True,
+        )
+        return hashlib.sha256(layout.encode("utf-8")).hexdigest()
+
+    def _restore_cached_frames(self) -> bool:
+        if self.frame_cache is None:
+            return False
+        key = self.frame_cache_key()
+        frames = self.frame_cache.load(key) if key else None
+        metrics.inc("quackduck_resource_cache_requests_total", cache="warm_start", result="hit" if frames else "miss")
+        if not frames:
+            return False
+
+        self.loaded_frames_cache = frames
+        self.animations.clear()
+        for anim_name, frame_list in self.animations_config.items():
+            frames_for_anim = self.get_animation_frames(self.get_frame, frame_list)
+            if frames_for_anim:
+                self.animations[anim_name] = frames_for_anim
+        if not self.animations:
+            self.loaded_frames_cache = {}
+            return False
+        logging.info("Restored %s sprite frames from the frame cache.", len(frames))
+        self.sprites_loaded = True
+        return True
+
+    def save_frame_cache(self) -> None:
+        """
+        Persist the scaled frames of the active skin for the next launch.
+        """
+        if self.frame_cache is None or not self.sprites_loaded or not self.loaded_frames_cache:
+            return
+        key = self.frame_cache_key()
+        if not key:
+            return
+        if not self.frame_cache.has(key):
+            self.frame_cache.store(key, self.loaded_frames_cache)
+        self.frame_cache.prune(keep=key)
+
+    def pixmap_bytes(self) -> int:
+        """
+        Approximate memory held by the spritesheet and cached frames.
+        """
+        pixmaps = {id(pixmap): pixmap for pixmap in self.loaded_frames_cache.values()}
+        for frames in self.animations.values():
+            pixmaps.update((id(pixmap), pixmap) for pixmap in frames)
+        if self.loaded_spritesheet is not None:
+            pixmaps[id(self.loaded_spritesheet)] = self.loaded_spritesheet
+        return sum(
+            pixmap.width() * pixmap.height() * pixmap.depth() // 8
+            for pixmap in pixmaps.values()
+            if pixmap is not None and not pixmap.isNull()
+        )
+
     def get_animation_frames_by_name(self, animation_name: str) -> List[QPixmap]:
         if animation_name in self.animations:
             return self.animations[animation_name]
@@ -327,6 +452,7 @@ class ResourceManager:
             self.load_sprites_now()
         return [name for name in self.animations.keys() if name.startswith("idle")]
 
+    @traced(category="resources")
     def load_idle_frames_from_skin(self, skin_file: str) -> Optional[List[QPixmap]]:
         try:
             with zipfile.ZipFile(skin_file, "r") as zip_ref:
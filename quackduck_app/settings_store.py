@@ -1,22 +1,193 @@
+import dataclasses
+import logging
+import typing
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
 from PyQt6 import QtCore
 
+# Changed keys are written to disk this long after the last change.
+SETTINGS_FLUSH_DELAY_MS = 500
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Typed, immutable view of every persisted setting. Field names are the QSettings keys.
+    """
+
+    pet_name: str = ""
+    selected_mic_index: Optional[int] = None
+    activation_threshold: int = 10
+    sound_response_probability: float = 0.01
+    sound_enabled: bool = True
+    sound_volume: float = 0.5
+    autostart_enabled: bool = False
+    playful_behavior_probability: float = 0.1
+    ground_level: int = 0
+    pet_size: int = 3
+    skin_folder: Optional[str] = None
+    selected_skin: Optional[str] = None
+    duck_speed: float = 2.0
+    random_behavior: bool = True
+    idle_duration: float = 5.0
+    sleep_timeout: float = 300.0
+    direction_change_interval: float = 20.0
+    name_offset_y: int = 60
+    font_base_size: int = 14
+    current_language: str = "en"
+    skipped_version: str = ""
+    show_name: bool = False
+
+
+def _field_types() -> Dict[str, type]:
+    types = {}
+    for name, hint in typing.get_type_hints(Settings).items():
+        args = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+        types[name] = args[0] if args else hint
+    return types
+
+
+SETTINGS_FIELDS = {field.name: field for field in dataclasses.fields(Settings)}
+_FIELD_TYPES = _field_types()
+
+SettingsCallback = Callable[[Any], None]
+
+
+def coerce_setting(name: str, raw: Any) -> Any:
+    """
+    Convert a raw QSettings value (often a string in INI/plist backends) to the field's type.
+    Values that can't be converted fall back to the field default.
+    """
+    default = SETTINGS_FIELDS[name].default
+    target = _FIELD_TYPES[name]
+    if raw is None or (raw == "" and target is not str):
+        return default
+    try:
+        if target is bool:
+            if isinstance(raw, str):
+                return raw.strip().lower() in ("1", "true", "yes", "on")
+            return bool(raw)
+        if target is int:
+            return int(float(raw)) if isinstance(raw, str) else int(raw)
+        if target is float:
+            return float(raw)
+        return str(raw)
+    except (TypeError, ValueError):
+        logging.warning("Setting %s has an invalid value %r; using %r.", name, raw, default)
+        return default
+
 
 class SettingsManager:
     """
     Thin wrapper over QSettings with explicit typing helpers.
+    All known settings are read once into an immutable Settings snapshot (see settings);
+    writes through set_value()/update() replace the snapshot and notify subscribers.
+    Writes are buffered and only the changed keys are flushed to disk, shortly after
+    the last change or when flush()/sync() is called.
     """
 
-    def __init__(self, organization: str = "zl0yxp", application: str = "QuackDuck") -> None:
-        self._settings = QtCore.QSettings(organization, application)
+    def __init__(
+        self,
+        organization: str = "zl0yxp",
+        application: str = "QuackDuck",
+        flush_delay_ms: int = SETTINGS_FLUSH_DELAY_MS,
+        backend: Optional[QtCore.QSettings] = None,
+    ) -> None:
+        # backend lets tests and the soak harness keep their settings out of the user's store.
+        self._settings = backend if backend is not None else QtCore.QSettings(organization, application)
+        self._subscribers: Dict[str, List[SettingsCallback]] = {}
+        self._dirty: Dict[str, Any] = {}
+        self._flush_timer = QtCore.QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_delay_ms)
+        self._flush_timer.timeout.connect(self.flush)
+        self.settings = Settings()
+        self.reload()
+
+    def reload(self) -> Settings:
+        """
+        Bulk-read every stored key into a fresh snapshot.
+        """
+        stored = {key: self._settings.value(key) for key in self._settings.allKeys() if key in SETTINGS_FIELDS}
+        self._replace(Settings(**{name: coerce_setting(name, raw) for name, raw in stored.items()}))
+        return self.settings
+
+    def subscribe(self, name: str, callback: SettingsCallback) -> None:
+        """
+        Call callback(new_value) whenever the setting changes.
+        """
+        if name not in SETTINGS_FIELDS:
+            raise KeyError(name)
+        self._subscribers.setdefault(name, []).append(callback)
+
+    def unsubscribe(self, name: str, callback: SettingsCallback) -> None:
+        callbacks = self._subscribers.get(name, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def update(self, **changes: Any) -> Settings:
+        """
+        Store several settings at once and return the new snapshot.
+        """
+        unknown = set(changes) - set(SETTINGS_FIELDS)
+        if unknown:
+            raise KeyError(", ".join(sorted(unknown)))
+        coerced = {name: coerce_setting(name, value) for name, value in changes.items()}
+        changed = {name: value for name, value in coerced.items() if getattr(self.settings, name) != value}
+        if changed:
+            for name, value in changed.items():
+                self._mark_dirty(name, value)
+            self._replace(dataclasses.replace(self.settings, **changed))
+        return self.settings
 
     def get_value(self, key: str, default=None, value_type=None):
+        if key in self._dirty:
+            value = self._dirty[key]
+            if value is None:
+                return default
+            return value_type(value) if value_type is not None else value
         return self._settings.value(key, defaultValue=default, type=value_type)
 
     def set_value(self, key: str, value) -> None:
-        self._settings.setValue(key, value)
+        if key in SETTINGS_FIELDS:
+            self.update(**{key: value})
+        else:
+            self._mark_dirty(key, value)
+
+    def has_pending_writes(self) -> bool:
+        return bool(self._dirty)
+
+    def flush(self) -> None:
+        """
+        Write the changed keys and sync them to disk.
+        """
+        self._flush_timer.stop()
+        if not self._dirty:
+            return
+        pending, self._dirty = self._dirty, {}
+        for key, value in pending.items():
+            self._settings.setValue(key, value)
+        self._settings.sync()
+        logging.debug("Flushed %s changed setting(s).", len(pending))
 
     def clear(self) -> None:
+        self._flush_timer.stop()
+        self._dirty.clear()
         self._settings.clear()
+        self._replace(Settings())
 
     def sync(self) -> None:
-        self._settings.sync()
+        self.flush()
+
+    def _mark_dirty(self, key: str, value: Any) -> None:
+        self._dirty[key] = value
+        self._flush_timer.start()
+
+    def _replace(self, snapshot: Settings) -> None:
+        previous, self.settings = self.settings, snapshot
+        for name, callbacks in list(self._subscribers.items()):
+            value = getattr(snapshot, name)
+            if callbacks and value != getattr(previous, name):
+                for callback in list(callbacks):
+                    callback(value)
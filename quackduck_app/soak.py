@@ -0,0 +1,574 @@
+import argparse
+import contextlib
+import dataclasses
+import functools
+import gc
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import types
+import weakref
+import zipfile
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+from unittest import mock
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+from PyQt6.QtCore import Qt
+
+from . import duck as duck_module
+from . import states as states_module
+from .core import resource_path
+from .memory import format_bytes, object_census
+from .perf import process_rss_bytes
+from .settings_store import SettingsManager
+from .warmstart import FrameCache
+
+# Accelerated soak test: runs a Duck offscreen against a virtual clock, so a day of
+# timers, sleeps, sounds and user activity takes minutes. Run with
+#     python -m quackduck_app.soak --hours 24
+SOAK_HOURS = 24
+SAMPLE_INTERVAL_S = 3600
+# Virtual seconds between two passes of the real Qt event loop (paint events, deleteLater).
+EVENT_LOOP_STEP_S = 1.0
+VIRTUAL_EPOCH = 1_700_000_000.0
+
+# Mean virtual seconds between simulated user events.
+MIC_BURST_MEAN_S = 30 * 60
+DRAG_MEAN_S = 45 * 60
+CLICK_MEAN_S = 20 * 60
+SKIN_SWITCH_MEAN_S = 2 * 60 * 60
+
+
+class VirtualClock:
+    """
+    Virtual wall clock plus an event queue. Callbacks run in due order as the clock is advanced.
+    """
+
+    def __init__(self, start: float = VIRTUAL_EPOCH) -> None:
+        self.now = start
+        self.errors = 0
+        self.timers: "weakref.WeakSet[VirtualTimer]" = weakref.WeakSet()
+        # Timers Qt would keep alive on its own: pending static single shots and parented timers.
+        self._owned: set = set()
+        self._queue: List[tuple] = []
+        self._sequence = itertools.count()
+
+    def time(self) -> float:
+        return self.now
+
+    def call_at(self, due: float, callback: Callable[[], None]) -> None:
+        heapq.heappush(self._queue, (due, next(self._sequence), callback))
+
+    def call_later(self, delay_s: float, callback: Callable[[], None]) -> None:
+        self.call_at(self.now + max(delay_s, 0.0), callback)
+
+    def advance_to(self, deadline: float) -> int:
+        """
+        Run every callback due up to deadline; returns how many ran.
+        """
+        fired = 0
+        while self._queue and self._queue[0][0] <= deadline:
+            due, _, callback = heapq.heappop(self._queue)
+            self.now = max(self.now, due)
+            fired += 1
+            try:
+                callback()
+            except Exception:
+                # A real QTimer slot raising would reach sys.excepthook; count it as a failure.
+                self.errors += 1
+                logging.exception("Soak: callback failed at %+.1f s", self.now - VIRTUAL_EPOCH)
+        self.now = max(self.now, deadline)
+        return fired
+
+    def timer_class(self) -> type:
+        return type("VirtualTimer", (VirtualTimer,), {"clock": self})
+
+    def live_timers(self) -> int:
+        return len(self.timers)
+
+    def active_timers(self) -> int:
+        return sum(1 for timer in list(self.timers) if timer.isActive())
+
+
+class _VirtualSignal:
+    def __init__(self) -> None:
+        self._slots: List[Callable] = []
+
+    def connect(self, slot: Callable) -> None:
+        self._slots.append(slot)
+
+    def disconnect(self, slot: Optional[Callable] = None) -> None:
+        if slot is None:
+            self._slots.clear()
+        elif slot in self._slots:
+            self._slots.remove(slot)
+        else:
+            raise TypeError("slot is not connected")
+
+    def emit(self) -> None:
+        for slot in list(self._slots):
+            slot()
+
+
+class VirtualTimer:
+    """
+    The subset of the QTimer API used by the duck and its states, driven by a VirtualClock.
+    Use VirtualClock.timer_class() to get a class bound to a clock.
+    """
+
+    clock: VirtualClock
+
+    def __init__(self, parent=None) -> None:
+        self.timeout = _VirtualSignal()
+        self._interval = 0
+        self._single_shot = False
+        self._active = False
+        self._generation = 0
+        self._due: Optional[float] = None
+        self.clock.timers.add(self)
+        if parent is not None:
+            self.clock._owned.add(self)
+
+    @classmethod
+    def singleShot(cls, msec: int, callback: Callable[[], None]) -> None:
+        timer = cls()
+        timer.setSingleShot(True)
+        timer.timeout.connect(callback)
+        timer.timeout.connect(lambda: cls.clock._owned.discard(timer))
+        cls.clock._owned.add(timer)
+        timer.start(msec)
+
+    def setInterval(self, msec: int) -> None:
+        self._interval = int(msec)
+        if self._active:
+            self.start()
+
+    def interval(self) -> int:
+        return self._interval
+
+    def setSingleShot(self, single_shot: bool) -> None:
+        self._single_shot = bool(single_shot)
+
+    def isSingleShot(self) -> bool:
+        return self._single_shot
+
+    def isActive(self) -> bool:
+        return self._active
+
+    def remainingTime(self) -> int:
+        if not self._active or self._due is None:
+            return -1
+        return max(int((self._due - self.clock.now) * 1000), 0)
+
+    def start(self, msec: Optional[int] = None) -> None:
+        if msec is not None:
+            self._interval = int(msec)
+        self._active = True
+        self._generation += 1
+        self._schedule()
+
+    def stop(self) -> None:
+        self._active = False
+        self._generation += 1
+
+    def deleteLater(self) -> None:
+        self.stop()
+
+    def _schedule(self) -> None:
+        # A repeating zero-interval timer fires whenever Qt is idle; give it a 1 ms period.
+        interval = self._interval if self._single_shot else max(self._interval, 1)
+        self._due = self.clock.now + max(interval, 0) / 1000
+        # The queue only holds a weak reference: like a parentless QTimer, a timer nobody
+        # references any more is gone and never fires.
+        self.clock.call_at(self._due, functools.partial(VirtualTimer._fire_ref, weakref.ref(self), self._generation))
+
+    @staticmethod
+    def _fire_ref(ref: "weakref.ref[VirtualTimer]", generation: int) -> None:
+        timer = ref()
+        if timer is not None:
+            timer._fire(generation)
+
+    def _fire(self, generation: int) -> None:
+        if generation != self._generation or not self._active:
+            return
+        if self._single_shot:
+            self._active = False
+        else:
+            self._schedule()
+        self.timeout.emit()
+
+
+class VirtualMicrophone(QtCore.QObject):
+    """
+    Stand-in for MicrophoneListener; the soak scenario feeds it volume levels.
+    """
+
+    volume_signal = QtCore.pyqtSignal(int)
+
+    def __init__(self, device_index=None, activation_threshold=10, parent=None) -> None:
+        super().__init__(parent)
+        self.device_index = device_index
+        self.activation_threshold = activation_threshold
+        self.running = False
+
+    def start(self) -> None:
+        self.running = True
+
+    def stop(self) -> None:
+        self.running = False
+
+    def wait(self, *args) -> bool:
+        return True
+
+    def isRunning(self) -> bool:
+        return self.running
+
+    def update_settings(self, device_index=None, activation_threshold=None) -> None:
+        if device_index is not None:
+            self.device_index = device_index
+        if activation_threshold is not None:
+            self.activation_threshold = activation_threshold
+
+    def feed(self, volume: int) -> None:
+        if self.running:
+            self.volume_signal.emit(volume)
+
+
+class _ModuleProxy(types.ModuleType):
+    """
+    Module stand-in that overrides a few attributes and forwards everything else.
+    """
+
+    def __init__(self, module: types.ModuleType, **overrides) -> None:
+        super().__init__(module.__name__)
+        self._module = module
+        self.__dict__.update(overrides)
+
+    def __getattr__(self, name: str):
+        return getattr(self._module, name)
+
+
+@dataclass(frozen=True)
+class SoakLimits:
+    """
+    How much the last sample may exceed the baseline sample (taken after the first hour).
+    """
+
+    rss_growth_bytes: int = 64 * 1024 * 1024
+    # The state history fills up over the first day, so allow some growth.
+    python_objects_growth: float = 0.25
+    timers_growth: int = 10
+    qt_objects_growth: int = 20
+    # Only the extracted files of the skin in use may exist.
+    temp_entries: int = 1
+    sound_receivers: int = 2
+
+
+class SoakSample(NamedTuple):
+    virtual_hours: float
+    rss_bytes: Optional[int]
+    python_objects: int
+    qt_objects: Dict[str, int]
+    timers_alive: int
+    timers_active: int
+    temp_entries: int
+    sound_receivers: int
+    state: str
+
+
+@dataclass
+class SoakReport:
+    hours: float
+    samples: List[SoakSample] = dataclasses.field(default_factory=list)
+    events: Dict[str, int] = dataclasses.field(default_factory=dict)
+    transitions: int = 0
+    errors: int = 0
+    wall_seconds: float = 0.0
+
+    def problems(self, limits: SoakLimits = SoakLimits()) -> List[str]:
+        """
+        Everything that grew past the limits; an empty list means the soak passed.
+        """
+        problems = []
+        if self.errors:
+            problems.append(f"{self.errors} timer callback(s) raised")
+        if len(self.samples) < 2:
+            return problems
+        baseline = self.samples[1] if len(self.samples) > 2 else self.samples[0]
+        last = self.samples[-1]
+
+        if baseline.rss_bytes is not None and last.rss_bytes is not None:
+            growth = last.rss_bytes - baseline.rss_bytes
+            if growth > limits.rss_growth_bytes:
+                problems.append(f"RSS grew by {format_bytes(growth)}")
+        allowed_objects = baseline.python_objects * (1 + limits.python_objects_growth)
+        if last.python_objects > allowed_objects:
+            problems.append(f"Python objects grew from {baseline.python_objects} to {last.python_objects}")
+        for name in ("timers_alive", "timers_active"):
+            before, after = getattr(baseline, name), getattr(last, name)
+            if after > before + limits.timers_growth:
+                problems.append(f"{name} grew from {before} to {after}")
+        for name, count in last.qt_objects.items():
+            before = baseline.qt_objects.get(name, 0)
+            if count > before + limits.qt_objects_growth:
+                problems.append(f"live {name} objects grew from {before} to {count}")
+        peak_temp = max(sample.temp_entries for sample in self.samples)
+        if peak_temp > limits.temp_entries:
+            problems.append(f"{peak_temp} temporary files/directories left behind")
+        peak_receivers = max(sample.sound_receivers for sample in self.samples)
+        if peak_receivers > limits.sound_receivers:
+            problems.append(f"sound effect has {peak_receivers} statusChanged connections")
+        return problems
+
+    def format(self) -> str:
+        lines = [
+            f"Simulated {self.hours:g} h in {self.wall_seconds:.1f} s; {self.transitions} state transitions; "
+            f"events: {', '.join(f'{name}={count}' for name, count in sorted(self.events.items())) or 'none'}",
+            f"{'hour':>6} {'RSS':>10} {'objects':>8} {'timers':>7} {'active':>6} {'temp':>5} {'recv':>5}  state / Qt objects",
+        ]
+        for sample in self.samples:
+            qt_objects = " ".join(f"{name}={count}" for name, count in sample.qt_objects.items())
+            lines.append(
+                f"{sample.virtual_hours:6.1f} {format_bytes(sample.rss_bytes):>10} {sample.python_objects:8d} "
+                f"{sample.timers_alive:7d} {sample.timers_active:6d} {sample.temp_entries:5d} "
+                f"{sample.sound_receivers:5d}  {sample.state} {qt_objects}"
+            )
+        return "\n".join(lines)
+
+
+def _make_skin_zip(path: str) -> str:
+    """
+    Package the default skin as a .zip skin (with a WAV sound, as load_skin requires).
+    """
+    source = resource_path(os.path.join("assets", "skins", "default"))
+    with open(os.path.join(source, "config.json"), "r", encoding="utf-8") as file:
+        config = json.load(file)
+    config["sound"] = "wuak.wav"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("config.json", json.dumps(config))
+        archive.write(os.path.join(source, config["spritesheet"]), config["spritesheet"])
+        archive.write(os.path.join(source, "wuak.wav"), "wuak.wav")
+    return path
+
+
+class SoakScenario:
+    """
+    Simulated user: microphone bursts, drags, clicks and skin switches at random intervals.
+    """
+
+    def __init__(self, duck, clock: VirtualClock, rng: random.Random, skin_zip: str) -> None:
+        self.duck = duck
+        self.clock = clock
+        self.rng = rng
+        self.skin_zip = skin_zip
+        self.events: Dict[str, int] = {}
+
+    def start(self) -> None:
+        self._every(MIC_BURST_MEAN_S, "mic_burst", self.mic_burst)
+        self._every(DRAG_MEAN_S, "drag", self.drag)
+        self._every(CLICK_MEAN_S, "click", self.click)
+        self._every(SKIN_SWITCH_MEAN_S, "skin_switch", self.switch_skin)
+
+    def _every(self, mean_s: float, name: str, action: Callable[[], None]) -> None:
+        def run() -> None:
+            self.events[name] = self.events.get(name, 0) + 1
+            try:
+                action()
+            finally:
+                self.clock.call_later(self.rng.expovariate(1 / mean_s), run)
+
+        self.clock.call_later(self.rng.expovariate(1 / mean_s), run)
+
+    def _feed(self, volume: int) -> None:
+        microphone = self.duck.microphone_listener
+        if microphone is not None:
+            microphone.feed(volume)
+
+    def mic_burst(self) -> None:
+        # Roughly the listener's cadence: one level every 50 ms, loud for a few seconds.
+        samples = int(self.rng.uniform(1, 5) / 0.05)
+        volume = self.rng.randint(self.duck.activation_threshold + 1, 100)
+        for index in range(samples):
+            self.clock.call_later(index * 0.05, functools.partial(self._feed, volume))
+        self.clock.call_later(samples * 0.05, functools.partial(self._feed, 0))
+
+    def _mouse_event(self, kind, button, buttons) -> QtGui.QMouseEvent:
+        local = QtCore.QPointF(self.duck.width() / 2, self.duck.height() / 2)
+        return QtGui.QMouseEvent(kind, local, local + QtCore.QPointF(self.duck.pos()), button, buttons, Qt.KeyboardModifier.NoModifier)
+
+    def drag(self) -> None:
+        Type = QtCore.QEvent.Type
+        left = Qt.MouseButton.LeftButton
+        self.duck.mousePressEvent(self._mouse_event(Type.MouseButtonPress, left, left))
+        for index in range(10):
+            self.clock.call_later(
+                0.05 * (index + 1),
+                lambda: self.duck.mouseMoveEvent(self._mouse_event(Type.MouseMove, Qt.MouseButton.NoButton, left)),
+            )
+        self.clock.call_later(
+            0.6,
+            lambda: self.duck.mouseReleaseEvent(self._mouse_event(Type.MouseButtonRelease, left, Qt.MouseButton.NoButton)),
+        )
+
+    def click(self) -> None:
+        Type = QtCore.QEvent.Type
+        if self.rng.random() < 0.5:
+            left = Qt.MouseButton.LeftButton
+            self.duck.mouseDoubleClickEvent(self._mouse_event(Type.MouseButtonDblClick, left, left))
+        else:
+            right = Qt.MouseButton.RightButton
+            self.duck.mousePressEvent(self._mouse_event(Type.MouseButtonPress, right, right))
+
+    def switch_skin(self) -> None:
+        # Mirrors the settings window: preview the skins, then apply one.
+        self.duck.resources.load_skin_frames_for_preview(is_default=True)
+        self.duck.resources.load_skin_frames_for_preview(skin_path=self.skin_zip)
+        if self.duck.selected_skin:
+            self.duck.selected_skin = None
+            self.duck.resources.load_default_skin()
+        elif self.duck.resources.load_skin(self.skin_zip):
+            self.duck.selected_skin = self.skin_zip
+        self.duck.save_settings()
+        self.duck.update_duck_skin()
+
+
+@contextlib.contextmanager
+def virtual_environment(clock: VirtualClock, workdir: str) -> Iterator[None]:
+    """
+    Point Duck and the states at the virtual clock, and keep settings, caches and temp
+    files inside workdir.
+    """
+    timer_class = clock.timer_class()
+    time_proxy = _ModuleProxy(time, time=clock.time)
+    qtcore_proxy = _ModuleProxy(QtCore, QTimer=timer_class)
+    settings_path = os.path.join(workdir, "settings.ini")
+    temp_root = os.path.join(workdir, "tmp")
+    os.makedirs(temp_root, exist_ok=True)
+
+    def make_settings_manager(*args, **kwargs):
+        kwargs.setdefault("backend", QtCore.QSettings(settings_path, QtCore.QSettings.Format.IniFormat))
+        return SettingsManager(*args, **kwargs)
+
+    with contextlib.ExitStack() as stack:
+        for module in (duck_module, states_module):
+            stack.enter_context(mock.patch.object(module, "time", time_proxy))
+            stack.enter_context(mock.patch.object(module, "QtCore", qtcore_proxy))
+        stack.enter_context(mock.patch.object(duck_module, "QTimer", timer_class))
+        stack.enter_context(mock.patch.object(duck_module, "MicrophoneListener", VirtualMicrophone))
+        stack.enter_context(mock.patch.object(duck_module, "SettingsManager", make_settings_manager))
+        stack.enter_context(
+            mock.patch.object(duck_module, "FrameCache", lambda: FrameCache(os.path.join(workdir, "frames")))
+        )
+        stack.enter_context(mock.patch.object(duck_module, "load_session", lambda *args: None))
+        stack.enter_context(mock.patch.object(duck_module, "save_session", lambda *args: None))
+        stack.enter_context(
+            mock.patch.object(duck_module.Duck, "start_update_check", lambda self, manual_trigger=False: None)
+        )
+        stack.enter_context(mock.patch.object(tempfile, "tempdir", temp_root))
+        yield
+
+
+def _sample(duck, clock: VirtualClock, started: float, temp_root: str) -> SoakSample:
+    gc.collect()
+    sound_effect = duck._sound_effect
+    receivers = sound_effect.receivers(sound_effect.statusChanged) if sound_effect is not None else 0
+    return SoakSample(
+        virtual_hours=(clock.now - started) / 3600,
+        rss_bytes=process_rss_bytes(),
+        python_objects=len(gc.get_objects()),
+        qt_objects=object_census(),
+        timers_alive=clock.live_timers(),
+        timers_active=clock.active_timers(),
+        temp_entries=len(os.listdir(temp_root)),
+        sound_receivers=receivers,
+        state=type(duck.state).__name__,
+    )
+
+
+def run_soak(
+    hours: float = SOAK_HOURS,
+    seed: int = 0,
+    sample_interval_s: float = SAMPLE_INTERVAL_S,
+    step_s: float = EVENT_LOOP_STEP_S,
+) -> SoakReport:
+    """
+    Simulate `hours` of duck life offscreen and return the sampled resource usage.
+    Needs a QApplication.
+    """
+    app = QtWidgets.QApplication.instance()
+    if not isinstance(app, QtWidgets.QApplication):
+        raise RuntimeError("run_soak() needs a QApplication")
+
+    clock = VirtualClock()
+    report = SoakReport(hours=hours)
+    random_state = random.getstate()
+    random.seed(seed)
+    wall_start = time.perf_counter()
+    workdir = tempfile.mkdtemp(prefix="quackduck-soak-")
+    temp_root = os.path.join(workdir, "tmp")
+    try:
+        with virtual_environment(clock, workdir):
+            duck = duck_module.Duck()
+            scenario = SoakScenario(duck, clock, random.Random(seed), _make_skin_zip(os.path.join(workdir, "skin.zip")))
+            started = clock.now
+            end = started + hours * 3600
+            next_sample = started
+            scenario.start()
+            try:
+                while True:
+                    if clock.now >= next_sample:
+                        report.samples.append(_sample(duck, clock, started, temp_root))
+                        next_sample += sample_interval_s
+                    if clock.now >= end:
+                        break
+                    clock.advance_to(min(clock.now + step_s, end))
+                    app.processEvents()
+            finally:
+                report.events = dict(scenario.events)
+                report.transitions = duck.state_history.total
+                report.errors = clock.errors
+                for slot in (duck.save_warm_start, duck.settings_manager.flush):
+                    with contextlib.suppress(TypeError):
+                        app.aboutToQuit.disconnect(slot)
+                duck.close()
+                if duck.tray_icon is not None:
+                    duck.tray_icon.hide()
+                duck.resources.cleanup_temp_dir()
+                duck.deleteLater()
+                app.processEvents()
+    finally:
+        random.setstate(random_state)
+        shutil.rmtree(workdir, ignore_errors=True)
+    report.wall_seconds = time.perf_counter() - wall_start
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate QuackDuck for hours offscreen and check resource usage.")
+    parser.add_argument("--hours", type=float, default=SOAK_HOURS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sample-interval", type=float, default=SAMPLE_INTERVAL_S, help="virtual seconds")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    logging.basicConfig(level=logging.WARNING)
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    app.setQuitOnLastWindowClosed(False)
+    report = run_soak(args.hours, args.seed, args.sample_interval)
+    print(report.format())
+    problems = report.problems()
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
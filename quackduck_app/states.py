@@ -1,4 +1,3 @@
-import logging
 import random
 import time
 from typing import TYPE_CHECKING
@@ -7,11 +6,22 @@ from PyQt6 import QtCore, QtGui, QtWidgets
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QMouseEvent
 
+from .core import HOT_LOG
+from .tracing import traced
+
 if TYPE_CHECKING:  # pragma: no cover - avoids circular imports at runtime
     from .duck import Duck
 
 
 class State:
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # Every state's enter/exit shows up as a span when tracing is on.
+        for method_name in ("enter", "exit"):
+            method = cls.__dict__.get(method_name)
+            if method is not None and not getattr(method, "__traced__", False):
+                setattr(cls, method_name, traced(f"{cls.__name__}.{method_name}", category="state")(method))
+
     def __init__(self, duck: "Duck") -> None:
         self.duck = duck
 
@@ -197,7 +207,7 @@ class ListeningState(State):
         self.frames = frames or []
         self.frame_index = 0
         self.update_frame()
-        logging.info("ListeningState: Entered.")
+        HOT_LOG.debug("ListeningState: Entered.")
 
     def update_animation(self):
         if not self.frames:
@@ -210,7 +220,7 @@ class ListeningState(State):
 
     def exit(self):
         self.duck.is_listening = False
-        logging.info("ListeningState: Exited.")
+        HOT_LOG.debug("ListeningState: Exited.")
 
     def update_frame(self):
         if not self.frames:
@@ -228,7 +238,7 @@ class ListeningState(State):
         if event.buttons() & QtCore.Qt.MouseButton.LeftButton:
             self.duck.is_listening = False
             self.duck.change_state(DraggingState(self.duck), event)
-            logging.info("ListeningState: Entering DraggingState due to moving.")
+            HOT_LOG.debug("ListeningState: Entering DraggingState due to moving.")
 
     def handle_mouse_release(self, event):
         pass
@@ -499,7 +509,7 @@ class SleepingState(State):
         if hasattr(self, "wake_up_timer") and self.wake_up_timer.isActive():
             self.wake_up_timer.stop()
             self.wake_up_timer = None
-            logging.info("SleepingState: Wake up timer stopped.")
+            HOT_LOG.debug("SleepingState: Wake up timer stopped.")
 
     def update_frame(self):
         if not self.frames:
@@ -515,7 +525,7 @@ class SleepingState(State):
             super().handle_mouse_press(event)
 
     def wake_up(self):
-        logging.info("SleepingState: The wake-up timer has expired, the duck is waking up.")
+        HOT_LOG.debug("SleepingState: The wake-up timer has expired, the duck is waking up.")
         self.duck.last_interaction_time = time.time()
         self.duck.change_state(WalkingState(self.duck))
 
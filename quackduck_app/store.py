@@ -0,0 +1,614 @@
+import bisect
+import hashlib
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+from urllib.parse import urljoin
+
+import requests
+from PyQt6 import QtCore, QtGui
+from PyQt6.QtCore import Qt
+
+from .core import CACHE_DIR
+from .flight import recorded_request
+
+# Skin store backend and preview fetching defaults.
+STORE_BASE_URL = "http://127.0.0.1:5000"
+PREVIEW_CACHE_DIR = os.path.join(CACHE_DIR, "store_previews")
+PREVIEW_CACHE_MAX_BYTES = 32 * 1024 * 1024
+PREVIEW_FETCH_CONCURRENCY = 3
+PREVIEW_FETCH_TIMEOUT = 5
+PREVIEW_FRAME_SIZE = 64
+PREVIEW_MAX_FRAMES = 300
+PREVIEW_DEFAULT_DELAY_MS = 100
+PREVIEW_MIN_DELAY_MS = 20
+PREVIEW_HIDDEN_POLL_MS = 250
+STORE_PAGE_SIZE = 50
+STORE_FETCH_TIMEOUT = 5
+
+
+def store_url(path: str) -> str:
+    """
+    Resolve a store path (or an already absolute URL) against the store backend.
+    """
+    return urljoin(STORE_BASE_URL + "/", path)
+
+
+class CatalogPage:
+    """
+    One page of the skin catalog as returned by the store backend.
+    """
+
+    __slots__ = ("items", "page", "total", "has_more")
+
+    def __init__(self, items: List[Dict[str, Any]], page: int, total: Optional[int], has_more: bool) -> None:
+        self.items = items
+        self.page = page
+        self.total = total
+        self.has_more = has_more
+
+
+def parse_catalog_page(data: Any, page: int, limit: int) -> CatalogPage:
+    """
+    Normalize a /skins response into a CatalogPage.
+    A bare list is a backend without pagination that sent the whole catalog at once;
+    a dict carries "items" plus "total" and/or "has_more".
+    """
+    if isinstance(data, list):
+        return CatalogPage(data, page, len(data), False)
+    if not isinstance(data, dict):
+        raise ValueError(f"Unexpected catalog payload: {type(data).__name__}")
+
+    items = data.get("items") or []
+    page = int(data.get("page", page))
+    total = data.get("total")
+    total = int(total) if total is not None else None
+    if "has_more" in data:
+        has_more = bool(data["has_more"])
+    elif total is not None:
+        has_more = page * limit < total
+    else:
+        has_more = len(items) >= limit
+    # An empty page never has a successor, whatever the backend claims.
+    return CatalogPage(items, page, total, has_more and bool(items))
+
+
+def fetch_catalog_page(lang: str, page: int, limit: int = STORE_PAGE_SIZE, timeout: float = STORE_FETCH_TIMEOUT) -> CatalogPage:
+    """
+    Request one catalog page from the store backend. Raises on network or HTTP errors.
+    """
+    url = store_url("/skins")
+    with recorded_request("catalog", url) as outcome:
+        resp = requests.get(url, params={"lang": lang, "page": page, "limit": limit}, timeout=timeout)
+        outcome["status"] = getattr(resp, "status_code", None)
+        resp.raise_for_status()
+    return parse_catalog_page(resp.json(), page, limit)
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: Any) -> List[str]:
+    """
+    Split catalog text into lowercase word tokens (works for Cyrillic as well).
+    """
+    return _TOKEN_RE.findall(str(text or "").lower())
+
+
+def parse_price(price: Any) -> Optional[float]:
+    """
+    Best effort numeric value of a catalog price such as "149", "1 490 ₽" or "2.99$".
+    """
+    if isinstance(price, (int, float)):
+        return float(price)
+    digits = re.sub(r"[^\d.,]", "", str(price or "")).replace(",", ".")
+    try:
+        return float(digits)
+    except ValueError:
+        return None
+
+
+def skin_rarity(skin: Dict[str, Any]) -> str:
+    return str(skin.get("rarity") or skin.get("rarity_color") or "")
+
+
+class CatalogIndex:
+    """
+    In-memory search index over loaded catalog entries.
+    Entries are addressed by their position in the catalog; every query returns
+    positions in catalog order. Text search matches query tokens as prefixes of
+    the indexed tokens (name, description, rarity, animations, price).
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Drop every entry, e.g. before the catalog is loaded again.
+        """
+        self.entries: List[Dict[str, Any]] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._sorted_tokens: Optional[List[str]] = None
+        self._by_rarity: Dict[str, Set[int]] = {}
+        self._by_animation: Dict[str, Set[int]] = {}
+        self._prices: List[Optional[float]] = []
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, skins: Iterable[Dict[str, Any]]) -> None:
+        for skin in skins:
+            position = len(self.entries)
+            self.entries.append(skin)
+            rarity = skin_rarity(skin)
+            animations = set(tokenize(skin.get("animations_str", "")))
+            price = skin.get("price", "")
+
+            tokens = set(tokenize(skin.get("name", "")))
+            tokens.update(tokenize(skin.get("description", "")))
+            tokens.update(tokenize(rarity))
+            tokens.update(animations)
+            tokens.update(tokenize(price))
+            for token in tokens:
+                self._postings.setdefault(token, set()).add(position)
+
+            if rarity:
+                self._by_rarity.setdefault(rarity, set()).add(position)
+            for animation in animations:
+                self._by_animation.setdefault(animation, set()).add(position)
+            self._prices.append(parse_price(price))
+        self._sorted_tokens = None
+
+    def rarities(self) -> List[str]:
+        return sorted(self._by_rarity)
+
+    def animations(self) -> List[str]:
+        return sorted(self._by_animation)
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        tokens = self._sorted_tokens
+        matches: Set[int] = set()
+        start = bisect.bisect_left(tokens, prefix)
+        for token in tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            matches |= self._postings[token]
+        return matches
+
+    def search(
+        self,
+        query: str = "",
+        rarity: Optional[str] = None,
+        animations: Iterable[str] = (),
+        max_price: Optional[float] = None,
+    ) -> List[int]:
+        """
+        Positions of the entries matching every query token and filter, in catalog order.
+        """
+        candidates: Optional[Set[int]] = None
+
+        def narrow(found: Set[int]) -> None:
+            nonlocal candidates
+            candidates = set(found) if candidates is None else candidates & found
+
+        if rarity:
+            narrow(self._by_rarity.get(rarity, set()))
+        for animation in animations:
+            narrow(self._by_animation.get(animation.lower(), set()))
+        # Longer tokens are usually more selective, so intersect them first.
+        for token in sorted(tokenize(query), key=len, reverse=True):
+            if candidates is not None and not candidates:
+                break
+            narrow(self._prefix_matches(token))
+
+        positions = range(len(self.entries)) if candidates is None else sorted(candidates)
+        if max_price is not None:
+            positions = [p for p in positions if self._prices[p] is not None and self._prices[p] <= max_price]
+        return list(positions)
+
+
+class _CatalogPageTask(QtCore.QRunnable):
+    def __init__(self, pager: "CatalogPager", generation: int, lang: str, page: int) -> None:
+        super().__init__()
+        self.pager = pager
+        self.generation = generation
+        self.lang = lang
+        self.page = page
+
+    def run(self) -> None:
+        try:
+            result = fetch_catalog_page(self.lang, self.page, self.pager.page_size, self.pager.timeout)
+            error = ""
+        except Exception as exc:
+            result, error = None, str(exc)
+        self.pager._task_done.emit(self.generation, result, error)
+
+
+class CatalogPager(QtCore.QObject):
+    """
+    Loads the skin catalog one page at a time on a worker thread.
+    Only one page is in flight; results of a listing that was reset in the meantime are dropped.
+    """
+
+    page_loaded = QtCore.pyqtSignal(object)
+    page_failed = QtCore.pyqtSignal(str)
+    _task_done = QtCore.pyqtSignal(int, object, str)
+
+    def __init__(self, page_size: int = STORE_PAGE_SIZE, timeout: float = STORE_FETCH_TIMEOUT, parent=None) -> None:
+        super().__init__(parent)
+        self.page_size = page_size
+        self.timeout = timeout
+        self.lang = "en"
+        self.next_page = 1
+        self.has_more = True
+        self.loading = False
+        self._generation = 0
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._task_done.connect(self._on_task_done)
+
+    def reset(self, lang: str) -> None:
+        self._generation += 1
+        self._pool.clear()
+        self.lang = lang
+        self.next_page = 1
+        self.has_more = True
+        self.loading = False
+
+    def load_next(self) -> bool:
+        if self.loading or not self.has_more:
+            return False
+        self.loading = True
+        self._pool.start(_CatalogPageTask(self, self._generation, self.lang, self.next_page))
+        return True
+
+    def _on_task_done(self, generation: int, page: Optional[CatalogPage], error: str) -> None:
+        if generation != self._generation:
+            return
+        self.loading = False
+        if page is None:
+            # Stop paging; reopening the store tab starts over.
+            self.has_more = False
+            self.page_failed.emit(error)
+            return
+        self.next_page = page.page + 1
+        self.has_more = page.has_more
+        self.page_loaded.emit(page)
+
+
+class PreviewFrames:
+    """
+    A preview animation decoded once: pre-scaled frames plus per-frame delays in ms.
+    Images are decoded off the GUI thread; pixmaps are created lazily on the GUI thread.
+    """
+
+    __slots__ = ("images", "delays", "_pixmaps")
+
+    def __init__(self, images: List[QtGui.QImage], delays: List[int]) -> None:
+        self.images = images
+        self.delays = delays
+        self._pixmaps: Optional[List[QtGui.QPixmap]] = None
+
+    def __len__(self) -> int:
+        return len(self.delays)
+
+    def pixmaps(self) -> List[QtGui.QPixmap]:
+        if self._pixmaps is None:
+            self._pixmaps = [QtGui.QPixmap.fromImage(image) for image in self.images]
+            # The pixmaps are all we need from now on.
+            self.images = []
+        return self._pixmaps
+
+
+def decode_preview_frames(data: bytes, size: int = PREVIEW_FRAME_SIZE) -> Optional[PreviewFrames]:
+    """
+    Decode every frame of a preview image (GIF or a still image) and scale it to fit size x size.
+    Safe to call from a worker thread.
+    """
+    buffer = QtCore.QBuffer()
+    buffer.setData(data)
+    buffer.open(QtCore.QIODevice.OpenModeFlag.ReadOnly)
+    reader = QtGui.QImageReader(buffer)
+
+    images: List[QtGui.QImage] = []
+    delays: List[int] = []
+    while len(images) < PREVIEW_MAX_FRAMES:
+        image = reader.read()
+        if image.isNull():
+            break
+        images.append(image.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.FastTransformation))
+        delay = reader.nextImageDelay()
+        delays.append(max(delay, PREVIEW_MIN_DELAY_MS) if delay > 0 else PREVIEW_DEFAULT_DELAY_MS)
+        if not reader.supportsAnimation():
+            break
+    buffer.close()
+
+    if not images:
+        logging.error("Failed to decode store preview: %s", reader.errorString())
+        return None
+    return PreviewFrames(images, delays)
+
+
+class _Playback:
+    __slots__ = ("label", "pixmaps", "delays", "index", "next_due", "paused")
+
+    def __init__(self, label, pixmaps, delays, now) -> None:
+        self.label = label
+        self.pixmaps = pixmaps
+        self.delays = delays
+        self.index = 0
+        self.next_due = now + delays[0]
+        self.paused = False
+
+
+class PreviewAnimator(QtCore.QObject):
+    """
+    Replays pre-scaled preview frames for many labels from one shared clock.
+    The clock sleeps until the next frame is due, and labels that are hidden or
+    scrolled out of view are paused instead of being repainted.
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._entries: Dict[int, _Playback] = {}
+        self._clock = QtCore.QElapsedTimer()
+        self._clock.start()
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+
+    def add(self, label, frames: PreviewFrames) -> None:
+        pixmaps = frames.pixmaps()
+        if not pixmaps:
+            return
+        label.setPixmap(pixmaps[0])
+        if len(pixmaps) < 2:
+            return
+        key = id(label)
+        self._entries[key] = _Playback(label, pixmaps, frames.delays, self._clock.elapsed())
+        label.destroyed.connect(lambda *_, key=key: self._entries.pop(key, None))
+        self._schedule()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._timer.stop()
+
+    def active_count(self) -> int:
+        return len(self._entries)
+
+    def _tick(self) -> None:
+        now = self._clock.elapsed()
+        for key, entry in list(self._entries.items()):
+            try:
+                visible = entry.label.isVisible() and not entry.label.visibleRegion().isEmpty()
+            except RuntimeError:
+                # The label was deleted together with its card.
+                self._entries.pop(key, None)
+                continue
+
+            if not visible:
+                entry.paused = True
+                continue
+            if entry.paused:
+                entry.paused = False
+                entry.next_due = now + entry.delays[entry.index]
+                continue
+            if now < entry.next_due:
+                continue
+
+            entry.index = (entry.index + 1) % len(entry.pixmaps)
+            entry.next_due += entry.delays[entry.index]
+            if entry.next_due <= now:
+                # Fell behind (e.g. the event loop was busy); resync instead of fast-forwarding.
+                entry.next_due = now + entry.delays[entry.index]
+            entry.label.setPixmap(entry.pixmaps[entry.index])
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if not self._entries:
+            self._timer.stop()
+            return
+        now = self._clock.elapsed()
+        running = [entry.next_due for entry in self._entries.values() if not entry.paused]
+        if running:
+            wait = max(0, min(running) - now)
+        else:
+            wait = PREVIEW_HIDDEN_POLL_MS
+        self._timer.start(int(wait))
+
+
+class PreviewCache:
+    """
+    Size-bounded on-disk cache for store preview images, shared across sessions.
+    Entries are keyed by URL; the least recently used ones are evicted first.
+    """
+
+    def __init__(self, cache_dir: str = PREVIEW_CACHE_DIR, max_bytes: int = PREVIEW_CACHE_MAX_BYTES) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path_for(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.bin")
+
+    def get(self, url: str) -> Optional[bytes]:
+        path = self._path_for(url)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            logging.error("Failed to read cached preview %s: %s", path, exc)
+            return None
+        try:
+            # Bump mtime so eviction keeps recently shown previews.
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, url: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            logging.warning("Preview %s is larger than the whole cache; not caching it.", url)
+            return
+        path = self._path_for(url)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(temp_path, "wb") as file:
+                    file.write(data)
+                os.replace(temp_path, path)
+            except OSError as exc:
+                logging.error("Failed to cache preview %s: %s", url, exc)
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+                return
+            self._evict()
+
+    def remove(self, url: str) -> None:
+        with self._lock:
+            try:
+                os.unlink(self._path_for(url))
+            except FileNotFoundError:
+                pass
+            except OSError as exc:
+                logging.error("Failed to remove cached preview %s: %s", url, exc)
+
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self):
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(".bin"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((entry.path, stat.st_size, stat.st_mtime))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _evict(self) -> None:
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError as exc:
+                logging.error("Failed to evict cached preview %s: %s", path, exc)
+            if total <= self.max_bytes:
+                break
+
+
+class _PreviewFetchTask(QtCore.QRunnable):
+    def __init__(self, fetcher: "PreviewFetcher", url: str) -> None:
+        super().__init__()
+        self.fetcher = fetcher
+        self.url = url
+
+    def run(self) -> None:
+        self.fetcher._task_done.emit(self.url, self.fetcher.load_frames(self.url))
+
+
+class PreviewFetcher(QtCore.QObject):
+    """
+    Fetches store previews by URL on a small worker pool with a concurrency limit.
+    Results come from the on-disk cache when possible; each URL is requested once
+    while it is in flight, decoded on the worker into PreviewFrames and delivered
+    on the GUI thread.
+    """
+
+    preview_ready = QtCore.pyqtSignal(str, object)
+    preview_failed = QtCore.pyqtSignal(str)
+    _task_done = QtCore.pyqtSignal(str, object)
+
+    def __init__(
+        self,
+        cache: Optional[PreviewCache] = None,
+        max_concurrency: int = PREVIEW_FETCH_CONCURRENCY,
+        timeout: float = PREVIEW_FETCH_TIMEOUT,
+        frame_size: int = PREVIEW_FRAME_SIZE,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self.cache = cache if cache is not None else PreviewCache()
+        self.timeout = timeout
+        self.frame_size = frame_size
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(max(1, max_concurrency))
+        self._pending: Set[str] = set()
+        self._task_done.connect(self._on_task_done)
+
+    def request(self, url: str) -> None:
+        if not url or url in self._pending:
+            return
+        self._pending.add(url)
+        self._pool.start(_PreviewFetchTask(self, url))
+
+    def cancel_pending(self) -> None:
+        """
+        Drop queued fetches that have not started yet (e.g. when the listing is rebuilt).
+        """
+        self._pool.clear()
+        self._pending.clear()
+
+    def load_frames(self, url: str) -> Optional[PreviewFrames]:
+        """
+        Decoded preview for url. A cached file that does not decode is evicted and the
+        preview fetched again, and an undecodable download is not kept. Runs on a worker thread.
+        """
+        data = self.cache.get(url)
+        if data is not None:
+            frames = decode_preview_frames(data, self.frame_size)
+            if frames:
+                return frames
+            logging.warning("Cached preview %s could not be decoded; fetching it again.", url)
+            self.cache.remove(url)
+        data = self._fetch(url)
+        frames = decode_preview_frames(data, self.frame_size) if data else None
+        if data and not frames:
+            self.cache.remove(url)
+        return frames
+
+    def _fetch(self, url: str) -> Optional[bytes]:
+        try:
+            with recorded_request("preview", url) as outcome:
+                resp = requests.get(url, timeout=self.timeout)
+                outcome["status"] = getattr(resp, "status_code", None)
+                resp.raise_for_status()
+                data = resp.content
+                outcome["bytes"] = len(data)
+        except Exception as exc:
+            logging.error("Failed to fetch store preview %s: %s", url, exc)
+            return None
+        if data:
+            self.cache.put(url, data)
+        return data
+
+    def _on_task_done(self, url: str, frames: Optional[PreviewFrames]) -> None:
+        if url not in self._pending:
+            # Cancelled while in flight; the listing that asked for it is gone.
+            return
+        self._pending.discard(url)
+        if frames:
+            self.preview_ready.emit(url, frames)
+        else:
+            self.preview_failed.emit(url)
@@ -0,0 +1,142 @@
+import collections
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# Span tracing. Set QUACKDUCK_TRACE=1 to record from startup; otherwise recording
+# is switched on from the tray menu or the debug window.
+TRACE_ENV = "QUACKDUCK_TRACE"
+TRACE_BUFFER_SIZE = 200_000
+TRACE_DIR = os.path.join(os.path.expanduser("~"), "quackduck", "traces")
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc) -> bool:
+        self.tracer.complete(self.name, self.category, self.start, time.perf_counter_ns() - self.start)
+        return False
+
+
+class Tracer:
+    """
+    Collects completed spans in a bounded in-memory buffer and exports them in the
+    Chrome trace event format (chrome://tracing, ui.perfetto.dev).
+    When disabled, span() hands back a shared no-op context manager.
+    """
+
+    def __init__(self, enabled: bool = False, capacity: int = TRACE_BUFFER_SIZE) -> None:
+        self.enabled = enabled
+        self._events: Deque[tuple] = collections.deque(maxlen=capacity)
+        self._thread_names: Dict[int, str] = {}
+        self._origin = time.perf_counter_ns()
+
+    def span(self, name: str, category: str = "app"):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category)
+
+    def complete(self, name: str, category: str, start_ns: int, duration_ns: Optional[int]) -> None:
+        thread = threading.current_thread()
+        if thread.ident not in self._thread_names:
+            self._thread_names[thread.ident] = thread.name
+        # deque.append is atomic, so worker threads can record without a lock.
+        self._events.append((name, category, start_ns, duration_ns, thread.ident))
+
+    def instant(self, name: str, category: str = "app") -> None:
+        if self.enabled:
+            self.complete(name, category, time.perf_counter_ns(), None)
+
+    def clear(self) -> None:
+        self._events.clear()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self._thread_names.items())
+        ]
+        for name, category, start_ns, duration_ns, tid in list(self._events):
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "i" if duration_ns is None else "X",
+                "ts": (start_ns - self._origin) / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            if duration_ns is None:
+                event["s"] = "t"
+            else:
+                event["dur"] = duration_ns / 1000
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path: Optional[str] = None) -> str:
+        """
+        Write the buffer as Chrome trace JSON and return the file path.
+        """
+        if path is None:
+            path = os.path.join(TRACE_DIR, time.strftime("quackduck-trace-%Y%m%d-%H%M%S.json"))
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_chrome_trace(), file)
+        logging.info("Saved %s trace events to %s", len(self._events), path)
+        return path
+
+
+tracer = Tracer(enabled=os.environ.get(TRACE_ENV, "") not in ("", "0"))
+
+
+def traced(name: Optional[str] = None, category: str = "app") -> Callable[[Callable], Callable]:
+    """
+    Decorator recording each call as a span; costs one attribute check when tracing is off.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.complete(span_name, category, start, time.perf_counter_ns() - start)
+
+        wrapper.__traced__ = True
+        return wrapper
+
+    return decorator
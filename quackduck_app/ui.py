@@ -1,16 +1,12 @@
-import base64
 import logging
 import os
 import random
 import time
-import webbrowser
 from typing import List
 
-import requests
 from PyQt6 import QtCore, QtGui, QtWidgets
-from PyQt6.QtCore import QBuffer, QIODevice, QPoint, QRect, QSize, Qt, QTimer, QUrl
-from PyQt6.QtGui import QCursor, QDesktopServices, QIcon, QMovie, QPixmap, QTransform
-from PyQt6.QtMultimedia import QAudioOutput, QMediaPlayer
+from PyQt6.QtCore import QPoint, QRect, QSize, Qt, QTimer, QUrl
+from PyQt6.QtGui import QCursor, QDesktopServices, QIcon, QPixmap, QTransform
 from PyQt6.QtWidgets import (
     QApplication,
     QCheckBox,
@@ -43,7 +39,14 @@ from PyQt6.QtWidgets import (
     QDoubleSpinBox,
 )
 
-from .core import GLOBAL_DEBUG_MODE, PROJECT_VERSION, get_system_accent_color, resource_path
+from .core import GLOBAL_DEBUG_MODE, PROJECT_VERSION, get_system_accent_color, lazy_import, resource_path
+from .diagnostics import stack_recorder
+from .flight import flight_recorder
+from .perf import format_report, perf_monitor, process_rss_bytes
+from .tracing import traced, tracer
+from .watchdog import watchdog
+from .history import StateHistoryModel
+from .memory import memory_profiler, object_census
 from .i18n import translations
 from .states import (
     AttackState,
@@ -76,6 +79,9 @@ class DebugWindow(QtWidgets.QWidget):
         self.update_timer = QtCore.QTimer(self)
         self.update_timer.timeout.connect(self.update_debug_info)
         self.update_timer.start(1000)
+        self.perf_timer = QtCore.QTimer(self)
+        self.perf_timer.setInterval(1000)
+        self.perf_timer.timeout.connect(self.update_performance)
 
     def init_ui(self):
         self.setStyleSheet(
@@ -238,6 +244,19 @@ class DebugWindow(QtWidgets.QWidget):
         open_settings_btn.clicked.connect(self.duck.open_settings)
         extra_layout.addWidget(open_settings_btn)
 
+        self.traceCheck = QCheckBox("Record Trace")
+        self.traceCheck.setChecked(tracer.enabled)
+        self.traceCheck.toggled.connect(self.toggle_tracing)
+        extra_layout.addWidget(self.traceCheck)
+
+        save_trace_btn = QPushButton("Save Trace")
+        save_trace_btn.clicked.connect(self.save_trace)
+        extra_layout.addWidget(save_trace_btn)
+
+        save_flight_btn = QPushButton("Save Flight Recording")
+        save_flight_btn.clicked.connect(self.save_flight_recording)
+        extra_layout.addWidget(save_flight_btn)
+
         self.methodEdit = QLineEdit()
         self.methodEdit.setPlaceholderText("Enter method name with no args, e.g. 'unstuck_duck'")
         call_method_btn = QPushButton("Call Method")
@@ -254,7 +273,7 @@ class DebugWindow(QtWidgets.QWidget):
         self.logs_states_widget = QWidget()
         logs_states_layout = QVBoxLayout(self.logs_states_widget)
 
-        state_history_group = QGroupBox("Last 100 States + State Control")
+        state_history_group = QGroupBox("State History + State Control")
         state_history_vlayout = QVBoxLayout()
 
         state_control_layout = QHBoxLayout()
@@ -271,15 +290,140 @@ class DebugWindow(QtWidgets.QWidget):
         self.add_state_button(state_control_layout, "Land", LandingState)
         state_history_vlayout.addLayout(state_control_layout)
 
-        self.state_history_list = QListWidget()
+        self.state_history_model = StateHistoryModel(self.duck.state_history, self)
+        self.state_history_list = QtWidgets.QListView()
+        self.state_history_list.setModel(self.state_history_model)
+        self.state_history_list.setUniformItemSizes(True)
         state_history_vlayout.addWidget(self.state_history_list)
 
+        export_history_btn = QPushButton("Export CSV")
+        export_history_btn.clicked.connect(self.export_state_history)
+        state_history_vlayout.addWidget(export_history_btn)
+
         state_history_group.setLayout(state_history_vlayout)
         logs_states_layout.addWidget(state_history_group)
 
+        stack_group = QGroupBox("Recorded Call Stacks")
+        stack_layout = QVBoxLayout()
+        stack_buttons = QHBoxLayout()
+        refresh_stacks_btn = QPushButton("Refresh")
+        refresh_stacks_btn.clicked.connect(self.update_stack_samples)
+        clear_stacks_btn = QPushButton("Clear")
+        clear_stacks_btn.clicked.connect(self.clear_stack_samples)
+        stack_buttons.addWidget(refresh_stacks_btn)
+        stack_buttons.addWidget(clear_stacks_btn)
+        stack_layout.addLayout(stack_buttons)
+        self.stack_samples_view = QTextEdit()
+        self.stack_samples_view.setReadOnly(True)
+        stack_layout.addWidget(self.stack_samples_view)
+        stack_group.setLayout(stack_layout)
+        logs_states_layout.addWidget(stack_group)
+
         logs_states_layout.addStretch()
         self.tabs.addTab(self.logs_states_widget, "Logs & States")
 
+        self.performance_widget = QWidget()
+        performance_layout = QVBoxLayout(self.performance_widget)
+        self.performance_view = QTextEdit()
+        self.performance_view.setReadOnly(True)
+        self.performance_view.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.SystemFont.FixedFont))
+        self.performance_view.setPlainText("Collecting...")
+        performance_layout.addWidget(self.performance_view)
+        self.tabs.addTab(self.performance_widget, "Performance")
+
+        self.memory_widget = QWidget()
+        memory_layout = QVBoxLayout(self.memory_widget)
+        memory_buttons = QHBoxLayout()
+        for label, handler in (
+            ("Take Snapshot", self.take_memory_snapshot),
+            ("Compare Last Two", self.compare_memory_snapshots),
+            ("Object Census", self.show_object_census),
+            ("Stop tracemalloc", self.stop_memory_tracing),
+        ):
+            button = QPushButton(label)
+            button.clicked.connect(handler)
+            memory_buttons.addWidget(button)
+        memory_layout.addLayout(memory_buttons)
+        self.memory_view = QTextEdit()
+        self.memory_view.setReadOnly(True)
+        self.memory_view.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.SystemFont.FixedFont))
+        self.memory_view.setPlainText(
+            "Snapshots start tracemalloc, which slows allocations down until it is stopped."
+        )
+        memory_layout.addWidget(self.memory_view)
+        self.tabs.addTab(self.memory_widget, "Memory")
+
+    def showEvent(self, event):
+        # Capture every recorded call site while someone is looking.
+        stack_recorder.debug = True
+        self.traceCheck.setChecked(tracer.enabled)
+        # The performance counters only run while the window is open.
+        perf_monitor.reset()
+        perf_monitor.enabled = True
+        self.perf_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        stack_recorder.debug = False
+        perf_monitor.enabled = False
+        self.perf_timer.stop()
+        super().hideEvent(event)
+
+    def update_performance(self):
+        snapshot = perf_monitor.snapshot()
+        if self.tabs.currentWidget() is not self.performance_widget:
+            return
+        try:
+            pixmap_bytes = self.duck.resources.pixmap_bytes()
+        except Exception as exc:
+            logging.error("Failed to measure pixmap cache: %s", exc)
+            pixmap_bytes = None
+        report = format_report(snapshot, pixmap_bytes, process_rss_bytes())
+        self.performance_view.setPlainText(f"{report}\n\nEvent-loop stalls: {watchdog.format_histogram()}")
+
+    def toggle_tracing(self, enabled):
+        tracer.enabled = enabled
+
+    def save_trace(self):
+        try:
+            path = tracer.dump()
+        except OSError as exc:
+            logging.error("Failed to save trace: %s", exc)
+            QtWidgets.QMessageBox.warning(self, "Trace", f"Failed to save trace: {exc}")
+            return
+        QtWidgets.QMessageBox.information(self, "Trace", f"{len(tracer)} events saved to:\n{path}")
+
+    def save_flight_recording(self):
+        try:
+            path = flight_recorder.dump(reason="manual")
+        except OSError as exc:
+            logging.error("Failed to save flight recording: %s", exc)
+            QtWidgets.QMessageBox.warning(self, "Flight Recorder", f"Failed to save flight recording: {exc}")
+            return
+        QtWidgets.QMessageBox.information(self, "Flight Recorder", f"{len(flight_recorder)} events saved to:\n{path}")
+
+    def update_stack_samples(self):
+        self.stack_samples_view.setPlainText(stack_recorder.format() or "No call stacks recorded yet.")
+
+    def clear_stack_samples(self):
+        stack_recorder.clear()
+        self.update_stack_samples()
+
+    def take_memory_snapshot(self):
+        snapshot = memory_profiler.take_snapshot()
+        self.memory_view.setPlainText("\n".join(memory_profiler.top(snapshot)))
+
+    def compare_memory_snapshots(self):
+        self.memory_view.setPlainText("\n".join(memory_profiler.diff_latest()))
+
+    def show_object_census(self):
+        census = object_census()
+        self.memory_view.setPlainText("\n".join(f"{name:<16} {count:>7}" for name, count in census.items()))
+
+    def stop_memory_tracing(self):
+        memory_profiler.stop_tracing()
+        self.memory_view.setPlainText("tracemalloc stopped; snapshots discarded.")
+
     def add_state_button(self, layout, name, state_class):
         btn = QPushButton(name)
         btn.clicked.connect(lambda: self.duck.change_state(state_class(self.duck)))
@@ -288,13 +432,23 @@ class DebugWindow(QtWidgets.QWidget):
     def update_debug_info(self):
         """Refresh debug info but keep errors from crashing the window."""
         try:
-            self.state_history_list.clear()
-            history_slice = self.duck.state_history[-100:]
-            for timestamp, old_st, new_st in history_slice:
-                self.state_history_list.addItem(f"{timestamp}: {old_st} -> {new_st}")
+            if self.state_history_model.sync():
+                self.state_history_list.scrollToBottom()
         except Exception as exc:
             logging.error("Debug window update failed: %s", exc)
 
+    def export_state_history(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export State History", "state_history.csv", "CSV Files (*.csv)")
+        if not path:
+            return
+        try:
+            count = self.duck.state_history.export_csv(path)
+        except OSError as exc:
+            logging.error("Failed to export state history: %s", exc)
+            QtWidgets.QMessageBox.warning(self, "State History", f"Failed to export: {exc}")
+            return
+        QtWidgets.QMessageBox.information(self, "State History", f"{count} transitions exported to:\n{path}")
+
     def trigger_double_click(self):
         try:
             event = QtGui.QMouseEvent(
@@ -582,7 +736,7 @@ class SystemTrayIcon(QtWidgets.QSystemTrayIcon):
         menu.addSeparator()
 
         coffee_action = menu.addAction(translations.get("buy_me_a_coffee", "Buy me a coffee"))
-        coffee_action.triggered.connect(lambda: webbrowser.open("https://buymeacoffee.com/zl0yxp"))
+        coffee_action.triggered.connect(lambda: lazy_import("webbrowser").open("https://buymeacoffee.com/zl0yxp"))
 
         exit_action = menu.addAction(translations.get("exit", "Close"))
 
@@ -596,6 +750,18 @@ class SystemTrayIcon(QtWidgets.QSystemTrayIcon):
             debug_action = menu.addAction(translations.get("debug_mode", "Debug mode"))
             debug_action.triggered.connect(self.parent.show_debug_window)
 
+            self.trace_action = menu.addAction(translations.get("record_trace", "Record performance trace"))
+            self.trace_action.setCheckable(True)
+            self.trace_action.setChecked(tracer.enabled)
+            self.trace_action.toggled.connect(self.toggle_tracing)
+            menu.aboutToShow.connect(lambda: self.trace_action.setChecked(tracer.enabled))
+
+            save_trace_action = menu.addAction(translations.get("save_trace", "Save performance trace"))
+            save_trace_action.triggered.connect(self.save_trace)
+
+            save_flight_action = menu.addAction(translations.get("save_flight_recording", "Save flight recording"))
+            save_flight_action.triggered.connect(self.save_flight_recording)
+
         self.setContextMenu(menu)
 
         self.contextMenu().setStyleSheet(
@@ -647,6 +813,25 @@ class SystemTrayIcon(QtWidgets.QSystemTrayIcon):
     def check_for_updates(self):
         self.parent.check_for_updates_manual()
 
+    def toggle_tracing(self, enabled):
+        tracer.enabled = enabled
+
+    def save_trace(self):
+        try:
+            path = tracer.dump()
+        except OSError as exc:
+            logging.error("Failed to save trace: %s", exc)
+            return
+        self.showMessage(translations.get("trace_saved", "Performance trace saved"), path)
+
+    def save_flight_recording(self):
+        try:
+            path = flight_recorder.dump(reason="manual")
+        except OSError as exc:
+            logging.error("Failed to save flight recording: %s", exc)
+            return
+        self.showMessage(translations.get("flight_recording_saved", "Flight recording saved"), path)
+
     def show_about(self):
         about_text = "QuackDuck\nDeveloped with love by zl0yxp\nDiscord: zl0yxp\nTelegram: t.me/quackduckapp"
         QtWidgets.QMessageBox.information(
@@ -852,9 +1037,6 @@ class SettingsWindow(QMainWindow):
 
         self.apply_stylesheet()
 
-        # Список буферов для QMovie
-        self.store_buffers = []
-
         self.mic_preview_timer = QTimer(self)
         self.mic_preview_timer.timeout.connect(self.update_mic_preview)
         self.mic_preview_timer.start(100)
@@ -1095,7 +1277,7 @@ class SettingsWindow(QMainWindow):
         self.volumeValue = QLabel("50%")
         self.volumeSlider = QSlider(Qt.Orientation.Horizontal)
         self.volumeSlider.setRange(0,100)
-        volume_from_settings = self.duck.settings_manager.get_value('sound_volume',0.5,float)
+        volume_from_settings = self.duck.settings_manager.settings.sound_volume
         initial_vol = int(volume_from_settings*100)
         self.volumeSlider.setValue(initial_vol)
         self.volumeValue.setText(f"{initial_vol}%")
@@ -1104,10 +1286,8 @@ class SettingsWindow(QMainWindow):
             self.volumeValue.setText(f"{v}%")
             vol = v / 100.0
             audio_output.setVolume(vol)
-            self.duck.sound_effect.setVolume(vol)
-            self.duck.sound_volume = vol
+            # The duck picks the new volume up through its settings subscription.
             self.duck.settings_manager.set_value('sound_volume', vol)
-            self.duck.settings_manager.sync()
 
         self.volumeSlider.valueChanged.connect(update_volume)
         self.volumeSlider.sliderReleased.connect(self.play_random_sound_on_volume_release)
@@ -1115,8 +1295,9 @@ class SettingsWindow(QMainWindow):
         default_skin_path = self.duck.skin_folder if self.duck.skin_folder else os.path.join(self.duck.resources.skins_dir,'default')
         sound_path = os.path.join(default_skin_path, 'wuak.wav')
         
-        audio_output = QAudioOutput()
-        self.media_player = QMediaPlayer()
+        QtMultimedia = lazy_import("PyQt6.QtMultimedia")
+        audio_output = QtMultimedia.QAudioOutput()
+        self.media_player = QtMultimedia.QMediaPlayer()
         self.media_player.setAudioOutput(audio_output)
         url = QUrl.fromLocalFile(sound_path)
 
@@ -1709,6 +1890,10 @@ class SettingsWindow(QMainWindow):
         each stretching to the full width of the window, having a minimum height of 130px.
         Each card has a 10px margin on all sides and an additional 10px below.
         """
+        # Магазин (и requests) загружается только при первом открытии настроек
+        from .downloads import SkinDownloadManager
+        from .store import CatalogIndex, CatalogPager, PreviewAnimator, PreviewFetcher
+
         w = QWidget()
         layout = QVBoxLayout(w)
         s = lambda val: int(val * self.scale_factor)
@@ -1722,8 +1907,32 @@ class SettingsWindow(QMainWindow):
         title.setStyleSheet(f"font-size:{s(18)}px; font-weight:bold; color:#fff;")
         layout.addWidget(title)
         
-        # Добавляем 50px нижнего отступа после заголовка
-        layout.addSpacing(50)
+        layout.addSpacing(20)
+
+        # Поиск и фильтры по каталогу; применяются с небольшой задержкой после ввода
+        filter_layout = QHBoxLayout()
+        filter_layout.setSpacing(10)
+        self.store_search_edit = QLineEdit()
+        self.store_search_edit.setPlaceholderText(self.translations.get("store_search_placeholder", "Search skins..."))
+        self.store_search_edit.setClearButtonEnabled(True)
+        filter_layout.addWidget(self.store_search_edit, stretch=1)
+        self.store_rarity_combo = QComboBox()
+        self.store_rarity_combo.addItem(self.translations.get("store_all_rarities", "All rarities"), None)
+        filter_layout.addWidget(self.store_rarity_combo)
+        self.store_animation_combo = QComboBox()
+        self.store_animation_combo.addItem(self.translations.get("store_all_animations", "All animations"), None)
+        filter_layout.addWidget(self.store_animation_combo)
+        layout.addLayout(filter_layout)
+
+        self.store_filter_timer = QTimer(self)
+        self.store_filter_timer.setSingleShot(True)
+        self.store_filter_timer.setInterval(150)
+        self.store_filter_timer.timeout.connect(self.apply_store_filter)
+        self.store_search_edit.textChanged.connect(self.store_filter_timer.start)
+        self.store_rarity_combo.currentIndexChanged.connect(self.store_filter_timer.start)
+        self.store_animation_combo.currentIndexChanged.connect(self.store_filter_timer.start)
+
+        layout.addSpacing(10)
         
         # Создаём область прокрутки для карточек скинов
         self.store_scroll = QScrollArea()
@@ -1736,9 +1945,54 @@ class SettingsWindow(QMainWindow):
         """)
         layout.addWidget(self.store_scroll, stretch=1)
         
-        # Внутренний контейнер внутри области прокрутки
+        # Внутренний контейнер внутри области прокрутки.
+        # Все стили карточек заданы здесь один раз через objectName, а не строкой на каждую карточку.
         self.store_container = QWidget()
-        self.store_container.setStyleSheet("background-color: #1e1e1e; border: none;")
+        self.store_container.setObjectName("storeContainer")
+        self.store_container.setStyleSheet(f"""
+            QWidget#storeContainer {{
+                background-color: #1e1e1e;
+                border: none;
+            }}
+            QFrame#storeCard {{
+                background-color: #2f2f2f;
+                border: 2px solid #333;
+                border-radius: 8px;
+            }}
+            QWidget#storeCardText {{
+                background-color: rgba(255, 255, 255, 0);
+            }}
+            QLabel#storeCardName {{
+                color:#fff; font-weight:bold; font-size:{s(14)}px; border:none;
+            }}
+            QLabel#storeCardPrice {{
+                color:#ffd700; font-weight:bold; font-size:{s(14)}px; border:none;
+            }}
+            QLabel#storeCardDescription {{
+                color:#ccc; font-size:{s(12)}px; border:none;
+            }}
+            QLabel#storeCardAnimations {{
+                color:#aaa; font-size:{s(12)}px; border:none;
+            }}
+            QLabel#storePreview {{
+                color:#aaa; border: none;
+            }}
+            QLabel#storeMessage {{
+                color: rgba(255,255,255,80); font-size:{s(16)}px;
+            }}
+            QPushButton#storeBuyButton {{
+                background:#444; color:#fff; border:none; border-radius:4px;
+                padding:{s(4)}px {s(8)}px; font-size:{s(12)}px;
+                min-height: {s(24)}px;  /* Уменьшенная минимальная высота */
+                min-width: {s(60)}px;   /* Уменьшенная минимальная ширина */
+            }}
+            QPushButton#storeBuyButton:hover {{
+                background:#555;
+            }}
+            QPushButton#storeBuyButton:pressed {{
+                background:#666;
+            }}
+        """)
         
         # Вертикальный макет для карточек скинов с отступом 10px
         self.store_layout = QVBoxLayout(self.store_container)
@@ -1748,29 +2002,54 @@ class SettingsWindow(QMainWindow):
         
         # Устанавливаем контейнер в область прокрутки
         self.store_scroll.setWidget(self.store_container)
-        
+
+        # Каталог грузится постранично, а карточки строятся по мере прокрутки.
+        # store_display - позиции каталога, прошедшие фильтр; store_cards - уже созданные карточки.
+        self.store_index = CatalogIndex()
+        self.store_display = []
+        self.store_cards = {}
+        self.store_message_label = None
+        self.store_built_count = 0
+        self.store_built_height = 0
+        self.store_rarity_styles = {}
+        self.store_buy_buttons = {}
+        # Текст кнопки для идущих загрузок по id скина; переживает пересоздание карточек
+        self.store_download_texts = {}
+        self.store_downloads = SkinDownloadManager(parent=self)
+        self.store_downloads.progress.connect(self.on_skin_download_progress)
+        self.store_downloads.finished.connect(self.on_skin_download_finished)
+        self.store_downloads.failed.connect(self.on_skin_download_failed)
+        self.store_pager = CatalogPager(parent=self)
+        self.store_pager.page_loaded.connect(self.on_store_page_loaded)
+        self.store_pager.page_failed.connect(self.on_store_page_failed)
+
+        # Превью по URL скачиваются только для видимых карточек
+        self.store_lazy_previews = []
+        self.store_preview_targets = {}
+        self.store_preview_animator = PreviewAnimator(self)
+        self.store_preview_fetcher = PreviewFetcher(parent=self)
+        self.store_preview_fetcher.preview_ready.connect(self.on_store_preview_ready)
+        self.store_preview_fetcher.preview_failed.connect(self.on_store_preview_failed)
+        scroll_bar = self.store_scroll.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self.build_more_store_cards)
+        scroll_bar.rangeChanged.connect(self.build_more_store_cards)
+        scroll_bar.valueChanged.connect(self.request_visible_store_previews)
+        scroll_bar.rangeChanged.connect(self.request_visible_store_previews)
+
         return w
 
+    @traced(category="store")
     def refresh_store(self):
         """
-        Loads the list of skins from the backend.
-        Each skin includes a base64-encoded preview GIF, price, and animations_str.
+        Starts loading the skin catalog from the backend, one page at a time.
+        Each skin includes a preview GIF (base64-encoded in "preview", or a "preview_url"
+        fetched lazily once the card is visible), price, and animations_str.
+        Cards are built only for the first screenful; the rest follow as the user scrolls.
         """
-        s = lambda val: int(val * self.scale_factor)
         lang = getattr(self.duck, 'current_language', 'en')
         if lang not in ("ru", "en"):
             lang = "en"
 
-        url = f"http://127.0.0.1:5000/skins?lang={lang}"
-        try:
-            # Устанавливаем короткий таймаут, чтобы приложение не зависало
-            resp = requests.get(url, timeout=2)
-            resp.raise_for_status()  # Выбрасываем исключение при ошибке HTTP
-            data = resp.json()
-        except Exception as e:
-            logging.error(f"Не удалось загрузить скины: {e}")
-            data = []
-
         # Очищаем существующие карточки и сообщения
         while self.store_layout.count():
             child = self.store_layout.takeAt(0)
@@ -1778,153 +2057,299 @@ class SettingsWindow(QMainWindow):
                 child.widget().deleteLater()
             else:
                 self.store_layout.removeItem(child)
-
-        # Если данные не получены, отображаем сообщение
-        if not data:
-            msg_label = QLabel("Магазин почему-то не доступен... :C")
-            msg_label.setStyleSheet(f"color: rgba(255,255,255,80); font-size:{s(16)}px;")
-            msg_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.store_layout.addWidget(msg_label)
+        # Карточки, скрытые фильтром, уже вынуты из раскладки, но всё ещё принадлежат контейнеру
+        for card in self.store_cards.values():
+            card.deleteLater()
+
+        # Останавливаем анимации превью старых карточек перед загрузкой новых
+        self.store_preview_animator.clear()
+        self.store_lazy_previews.clear()
+        self.store_preview_targets.clear()
+        self.store_preview_fetcher.cancel_pending()
+
+        self.store_index.clear()
+        self.store_display = []
+        self.store_cards = {}
+        # Идущие загрузки не прерываются: новые карточки берут их состояние из store_download_texts
+        self.store_buy_buttons = {}
+        self.store_message_label = None
+        self.store_built_count = 0
+        self.store_built_height = 0
+        self._update_store_filter_options()
+        self.store_pager.reset(lang)
+        self.store_pager.load_next()
+
+    def _show_store_message(self, text):
+        if self.store_message_label is None:
+            self.store_message_label = QLabel()
+            self.store_message_label.setObjectName("storeMessage")
+            self.store_message_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.store_layout.addWidget(self.store_message_label)
+        self.store_message_label.setText(text)
+
+    def _hide_store_message(self):
+        if self.store_message_label is not None:
+            self.store_layout.removeWidget(self.store_message_label)
+            self.store_message_label.deleteLater()
+            self.store_message_label = None
+
+    def on_store_page_loaded(self, page):
+        if not page.items and not len(self.store_index):
+            self._show_store_message("Магазин почему-то не доступен... :C")
             return
+        self.store_index.add(page.items)
+        self._update_store_filter_options()
+        # Новые позиции идут после уже показанных, так что построенные карточки остаются на местах
+        self.store_display = self._search_store()
+        if self.store_display:
+            self._hide_store_message()
+        self.build_more_store_cards()
+
+    def on_store_page_failed(self, error):
+        logging.error(f"Не удалось загрузить скины: {error}")
+        if not len(self.store_index):
+            self._show_store_message("Магазин почему-то не доступен... :C")
+
+    def _search_store(self):
+        animation = self.store_animation_combo.currentData()
+        return self.store_index.search(
+            self.store_search_edit.text(),
+            rarity=self.store_rarity_combo.currentData(),
+            animations=[animation] if animation else (),
+        )
 
-        # Очищение списка буферов перед загрузкой новых
-        self.store_buffers.clear()
-
-        for skin in data:
-            skin_id = skin.get("id", "")
-            name = skin.get("name", "No name")
-            description = skin.get("description", "")
-            rarity_color = skin.get("rarity_color", "#333")
-            anim_str = skin.get("animations_str", "")
-            preview_b64 = skin.get("preview", "")
-            price = skin.get("price", "")
-
-            # Создание карточки как QFrame, растягивающейся на всю ширину
-            block = QFrame()
-            block.setStyleSheet(f"""
-                QFrame {{
-                    background-color: #2f2f2f;
-                    border: 2px solid {rarity_color};
-                    border-radius: 8px;
-                }}
-            """)
-            block.adjustSize()
-
-            # Горизонтальное расположение для карточки
-            block_layout = QHBoxLayout(block)
-            block_layout.setSpacing(15)  # Отступ между превью и текстом
-            block_layout.setContentsMargins(10, 10, 10, 10)  # Внутренние отступы 10px
-
-            # Левая сторона - Превью GIF
-            if preview_b64:
-                try:
-                    preview_data = base64.b64decode(preview_b64)
-                    buffer = QBuffer()
-                    buffer.setData(preview_data)
-                    buffer.open(QIODevice.ReadOnly)
-                    movie = QMovie()
-                    movie.setDevice(buffer)
-                    preview_label = QLabel()
-                    preview_label.setFixedSize(100, 100)  # Фиксированный размер QLabel 100x100
-                    preview_label.setStyleSheet("border: none;")  # Убираем границу
-
-                    # Центрируем превью по вертикали
-                    preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                    # Подключаем обработчик изменения кадра
-                    movie.frameChanged.connect(lambda frame_num, m=movie, l=preview_label: self.handle_frame_change(m, l))
-                    movie.start()
-                    self.store_buffers.append(buffer)  # Сохраняем буфер, чтобы он не был собран мусором
-                    block_layout.addWidget(preview_label, alignment=Qt.AlignmentFlag.AlignTop)
-                except Exception as e:
-                    logging.error(f"Не удалось загрузить превью для скина {skin_id}: {e}")
-                    # Заполнитель, если превью не удалось загрузить
-                    preview_label = QLabel("No Preview")
-                    preview_label.setStyleSheet("color:#aaa; border: none;")
-                    preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    preview_label.setFixedSize(100, 100)
-                    block_layout.addWidget(preview_label, alignment=Qt.AlignmentFlag.AlignTop)
-            else:
-                # Заполнитель, если превью отсутствует
-                preview_label = QLabel("No Preview")
-                preview_label.setStyleSheet("color:#aaa; border: none;")
-                preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                preview_label.setFixedSize(100, 100)
-                block_layout.addWidget(preview_label, alignment=Qt.AlignmentFlag.AlignTop)
-
-            # Правая сторона - Текст и кнопка "Купить"
-            right_layout = QVBoxLayout()
-            right_layout.setSpacing(8)  # Отступ между элементами
-            right_layout.setContentsMargins(0, 0, 0, 0)
-
-            # Контейнер для текста с прозрачным фоном
-            text_container = QWidget()
-            text_container.setStyleSheet("background-color: rgba(255, 255, 255, 0);")  # Прозрачный фон
-
-            text_layout = QVBoxLayout(text_container)
-
-            # Название и цена в горизонтальном макете
-            name_price_layout = QHBoxLayout()
-
-            # Название скина
-            name_label = QLabel(name)
-            name_label.setStyleSheet(f"color:#fff; font-weight:bold; font-size:{s(14)}px; border:none;")
-            name_label.setWordWrap(True)
-            name_price_layout.addWidget(name_label, alignment=Qt.AlignmentFlag.AlignLeft)
-
-            # Цена скина
-            price_label = QLabel(price)  # Отображаем цену напрямую без символа рубля
-            price_label.setStyleSheet(f"color:#ffd700; font-weight:bold; font-size:{s(14)}px; border:none;")
-            price_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            name_price_layout.addWidget(price_label, alignment=Qt.AlignmentFlag.AlignRight)
-
-            text_layout.addLayout(name_price_layout)
-
-            # Описание скина
-            desc_label = QLabel(description)
-            desc_label.setStyleSheet(f"color:#ccc; font-size:{s(12)}px; border:none;")
-            desc_label.setWordWrap(True)
-            desc_label.adjustSize()
-            text_layout.addWidget(desc_label, alignment=Qt.AlignmentFlag.AlignLeft)
-
-            # Строка анимаций
-            anim_label = QLabel(anim_str)
-            anim_label.setStyleSheet(f"color:#aaa; font-size:{s(12)}px; border:none;")
-            anim_label.setWordWrap(True)
-            text_layout.addWidget(anim_label, alignment=Qt.AlignmentFlag.AlignLeft)
-
-            # Добавляем текстовый контейнер в правый макет
-            right_layout.addWidget(text_container, alignment=Qt.AlignmentFlag.AlignTop)
-
-            # Кнопка "Купить" с уменьшенными размерами и эффектом наведения
-            buy_btn = QPushButton("Купить")
-            buy_btn.setCursor(QtGui.QCursor(Qt.CursorShape.PointingHandCursor))
-            buy_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background:#444; color:#fff; border:none; border-radius:4px;
-                    padding:{s(4)}px {s(8)}px; font-size:{s(12)}px;
-                    min-height: {s(24)}px;  /* Уменьшенная минимальная высота */
-                    min-width: {s(60)}px;   /* Уменьшенная минимальная ширина */
-                }}
-                QPushButton:hover {{
-                    background:#555;
-                }}
-                QPushButton:pressed {{
-                    background:#666;
-                }}
-            """)
-            buy_btn.clicked.connect(lambda _, sid=skin_id: self.buy_skin(sid))
-            buy_btn.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
-            right_layout.addWidget(buy_btn, alignment=Qt.AlignmentFlag.AlignRight)
-
-            # Добавляем stretch, чтобы кнопка "Купить" располагалась внизу
-            right_layout.addStretch()
+    def _update_store_filter_options(self):
+        for combo, options in (
+            (self.store_rarity_combo, self.store_index.rarities()),
+            (self.store_animation_combo, self.store_index.animations()),
+        ):
+            current = [combo.itemData(i) for i in range(1, combo.count())]
+            if current == options:
+                continue
+            selected = combo.currentData()
+            combo.blockSignals(True)
+            while combo.count() > 1:
+                combo.removeItem(1)
+            for option in options:
+                combo.addItem(option, option)
+            combo.setCurrentIndex(max(0, combo.findData(selected)) if selected else 0)
+            combo.blockSignals(False)
+
+    def apply_store_filter(self):
+        """
+        Re-run the search over the loaded catalog and show only the matching cards.
+        Cards that were already built are reused instead of being created again.
+        """
+        self.store_display = self._search_store()
+        self._hide_store_message()
+        # Вынимаем карточки из раскладки, не удаляя их: совпавшие вернутся без пересоздания
+        while self.store_layout.count():
+            child = self.store_layout.takeAt(0)
+            if child.widget():
+                child.widget().hide()
+        self.store_built_count = 0
+        self.store_built_height = 0
+        self.store_scroll.verticalScrollBar().setValue(0)
+        self.build_more_store_cards()
 
-            # Добавляем текстовый блок и кнопку в правую часть
-            block_layout.addLayout(right_layout)
+    def build_more_store_cards(self):
+        """
+        Build cards until they cover the viewport plus one more screen below it,
+        and ask for the next catalog page when the loaded entries run out.
+        """
+        from .store import STORE_PAGE_SIZE
+
+        viewport_height = max(self.store_scroll.viewport().height(), int(400 * self.scale_factor))
+        wanted_height = self.store_scroll.verticalScrollBar().value() + 2 * viewport_height
+        spacing = self.store_layout.spacing()
+        built_any = False
+        while self.store_built_count < len(self.store_display) and self.store_built_height < wanted_height:
+            position = self.store_display[self.store_built_count]
+            card = self.store_cards.get(position)
+            if card is None:
+                card = self._create_store_card(self.store_index.entries[position])
+                self.store_cards[position] = card
+            self.store_layout.addWidget(card, alignment=Qt.AlignmentFlag.AlignTop)
+            card.show()
+            self.store_built_count += 1
+            self.store_built_height += card.sizeHint().height() + spacing
+            built_any = True
+
+        remaining = len(self.store_display) - self.store_built_count
+        if remaining < STORE_PAGE_SIZE // 2:
+            self.store_pager.load_next()
+        if not self.store_display and len(self.store_index) and not self.store_pager.has_more:
+            self._show_store_message(self.translations.get("store_nothing_found", "Nothing found"))
+
+        if built_any:
+            # Геометрия карточек известна только после раскладки, поэтому откладываем
+            QTimer.singleShot(0, self.request_visible_store_previews)
+
+    def _store_rarity_style(self, rarity_color):
+        # Строка стиля одна на цвет редкости, а не своя для каждой карточки
+        style = self.store_rarity_styles.get(rarity_color)
+        if style is None:
+            style = f"QFrame#storeCard {{ border-color: {rarity_color}; }}"
+            self.store_rarity_styles[rarity_color] = style
+        return style
+
+    def _create_store_card(self, skin):
+        import base64
+
+        from .store import decode_preview_frames, store_url
+
+        skin_id = skin.get("id", "")
+        name = skin.get("name", "No name")
+        description = skin.get("description", "")
+        rarity_color = skin.get("rarity_color", "#333")
+        anim_str = skin.get("animations_str", "")
+        preview_b64 = skin.get("preview", "")
+        preview_url = skin.get("preview_url", "")
+        price = skin.get("price", "")
+
+        # Создание карточки как QFrame, растягивающейся на всю ширину
+        block = QFrame()
+        block.setObjectName("storeCard")
+        block.setStyleSheet(self._store_rarity_style(rarity_color))
+
+        # Горизонтальное расположение для карточки
+        block_layout = QHBoxLayout(block)
+        block_layout.setSpacing(15)  # Отступ между превью и текстом
+        block_layout.setContentsMargins(10, 10, 10, 10)  # Внутренние отступы 10px
+
+        # Левая сторона - Превью GIF
+        if preview_b64:
+            try:
+                preview_frames = decode_preview_frames(base64.b64decode(preview_b64))
+                if not preview_frames:
+                    raise ValueError("preview could not be decoded")
+                preview_label = self._create_store_preview_label()
+                self._start_store_preview(preview_label, preview_frames)
+            except Exception as e:
+                logging.error(f"Не удалось загрузить превью для скина {skin_id}: {e}")
+                # Заполнитель, если превью не удалось загрузить
+                preview_label = self._create_store_preview_label("No Preview")
+        elif preview_url:
+            # Превью скачивается лениво, когда карточка попадает в область видимости
+            preview_label = self._create_store_preview_label("...")
+            self.store_lazy_previews.append((preview_label, store_url(preview_url)))
+        else:
+            # Заполнитель, если превью отсутствует
+            preview_label = self._create_store_preview_label("No Preview")
+        block_layout.addWidget(preview_label, alignment=Qt.AlignmentFlag.AlignTop)
+
+        # Правая сторона - Текст и кнопка "Купить"
+        right_layout = QVBoxLayout()
+        right_layout.setSpacing(8)  # Отступ между элементами
+        right_layout.setContentsMargins(0, 0, 0, 0)
+
+        # Контейнер для текста с прозрачным фоном
+        text_container = QWidget()
+        text_container.setObjectName("storeCardText")
+
+        text_layout = QVBoxLayout(text_container)
+
+        # Название и цена в горизонтальном макете
+        name_price_layout = QHBoxLayout()
+
+        # Название скина
+        name_label = QLabel(name)
+        name_label.setObjectName("storeCardName")
+        name_label.setWordWrap(True)
+        name_price_layout.addWidget(name_label, alignment=Qt.AlignmentFlag.AlignLeft)
+
+        # Цена скина
+        price_label = QLabel(price)  # Отображаем цену напрямую без символа рубля
+        price_label.setObjectName("storeCardPrice")
+        price_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        name_price_layout.addWidget(price_label, alignment=Qt.AlignmentFlag.AlignRight)
+
+        text_layout.addLayout(name_price_layout)
+
+        # Описание скина
+        desc_label = QLabel(description)
+        desc_label.setObjectName("storeCardDescription")
+        desc_label.setWordWrap(True)
+        text_layout.addWidget(desc_label, alignment=Qt.AlignmentFlag.AlignLeft)
+
+        # Строка анимаций
+        anim_label = QLabel(anim_str)
+        anim_label.setObjectName("storeCardAnimations")
+        anim_label.setWordWrap(True)
+        text_layout.addWidget(anim_label, alignment=Qt.AlignmentFlag.AlignLeft)
+
+        # Добавляем текстовый контейнер в правый макет
+        right_layout.addWidget(text_container, alignment=Qt.AlignmentFlag.AlignTop)
+
+        # Кнопка "Купить" с уменьшенными размерами и эффектом наведения
+        buy_btn = QPushButton(self.store_download_texts.get(skin_id, "Купить"))
+        buy_btn.setObjectName("storeBuyButton")
+        buy_btn.setCursor(QtGui.QCursor(Qt.CursorShape.PointingHandCursor))
+        buy_btn.clicked.connect(lambda _, sid=skin_id: self.buy_skin(sid))
+        buy_btn.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+        self.store_buy_buttons[skin_id] = buy_btn
+        right_layout.addWidget(buy_btn, alignment=Qt.AlignmentFlag.AlignRight)
+
+        # Добавляем stretch, чтобы кнопка "Купить" располагалась внизу
+        right_layout.addStretch()
+
+        # Добавляем текстовый блок и кнопку в правую часть
+        block_layout.addLayout(right_layout)
+        return block
+
+    def _create_store_preview_label(self, placeholder=None):
+        preview_label = QLabel(placeholder or "")
+        preview_label.setFixedSize(100, 100)  # Фиксированный размер QLabel 100x100
+        preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        preview_label.setObjectName("storePreview")
+        return preview_label
+
+    def _start_store_preview(self, preview_label, preview_frames):
+        # Кадры уже декодированы и уменьшены; общий таймер аниматора только переключает их
+        preview_label.setText("")
+        self.store_preview_animator.add(preview_label, preview_frames)
+
+    def request_visible_store_previews(self):
+        """
+        Queue preview downloads for cards that are inside (or one screen away from) the viewport.
+        """
+        if not self.store_lazy_previews:
+            return
+        if self.store_container.height() < self.store_layout.sizeHint().height():
+            return  # Раскладка ещё не применена; проверим снова по rangeChanged
+        viewport = self.store_scroll.viewport()
+        margin = viewport.height()
+        still_hidden = []
+        for preview_label, url in self.store_lazy_previews:
+            try:
+                if not preview_label.isVisibleTo(self.store_container):
+                    still_hidden.append((preview_label, url))  # Карточка скрыта фильтром
+                    continue
+                top = preview_label.mapTo(viewport, QPoint(0, 0)).y()
+            except RuntimeError:
+                continue  # Карточка уже удалена
+            if top + preview_label.height() < -margin or top > viewport.height() + margin:
+                still_hidden.append((preview_label, url))
+                continue
+            self.store_preview_targets.setdefault(url, []).append(preview_label)
+            self.store_preview_fetcher.request(url)
+        self.store_lazy_previews = still_hidden
+
+    def on_store_preview_ready(self, url, preview_frames):
+        for preview_label in self.store_preview_targets.pop(url, []):
+            try:
+                self._start_store_preview(preview_label, preview_frames)
+            except RuntimeError:
+                pass  # Карточка удалена, пока превью скачивалось
+            except Exception as e:
+                logging.error(f"Не удалось показать превью {url}: {e}")
 
-            # Добавляем карточку в layout магазина с выравниванием по верхнему краю и растягиванием
-            self.store_layout.addWidget(block, alignment=Qt.AlignmentFlag.AlignTop)
+    def on_store_preview_failed(self, url):
+        for preview_label in self.store_preview_targets.pop(url, []):
+            try:
+                preview_label.setText("No Preview")
+            except RuntimeError:
+                pass
 
     def buy_skin(self, skin_id):
         """
@@ -1935,7 +2360,11 @@ class SettingsWindow(QMainWindow):
         Для демонстрации сделаем отдельный 'complete_purchase' - 
         эмуляцию успешной покупки, где скачиваем файл и сообщаем пользователю.
         """
-        url = f"http://127.0.0.1:5000/buy?skin_id={skin_id}"
+        import webbrowser
+
+        from .store import store_url
+
+        url = store_url(f"/buy?skin_id={skin_id}")
         webbrowser.open(url)
 
         # Дополнительно можем запустить таймер, который через N секунд проверит условно 
@@ -1948,6 +2377,8 @@ class SettingsWindow(QMainWindow):
         Путь к папке: self.duck.skin_folder (или другой).
         Показываем благодарность.
         """
+        from .store import store_url
+
         # В реальности нужно как-то получить токен для /download. 
         # Тут - фейк: cразу качаем "skins/<skin_id>.zip" - 
         # Или, например, берём последнюю запись JSON, ищем zip_path...
@@ -1956,37 +2387,60 @@ class SettingsWindow(QMainWindow):
         # Если у нас уже есть zip_path в available-skins.json, 
         # можем запросить "http://127.0.0.1:5000/download_direct?skin_id=skin_id"
 
-        # Создадим фейковый запрос:
-        try:
-            r = requests.get(f"http://127.0.0.1:5000/download_direct?skin_id={skin_id}", timeout=5)
-            if r.status_code != 200:
-                return  # Если не 200, считаем, что не скачалось
+        # Скачивание идёт в фоне: поток пишет во временный .part файл, докачивает
+        # его при обрывах и переносит в папку скинов только после проверки контрольной суммы
+        user_folder = self.duck.skin_folder or os.path.expanduser("~/my_skins")
+        zip_path = os.path.join(user_folder, f"{skin_id}.zip")
+        started = self.store_downloads.download(
+            skin_id,
+            store_url(f"/download_direct?skin_id={skin_id}"),
+            zip_path,
+            expected_sha256=self._store_skin_checksum(skin_id),
+        )
+        if started:
+            self._set_store_download_text(skin_id, "...")
 
-            # Кладём файл в user skin folder
-            user_folder = self.duck.skin_folder or os.path.expanduser("~/my_skins")
-            os.makedirs(user_folder, exist_ok=True)
+    def _store_skin_checksum(self, skin_id):
+        for skin in self.store_index.entries:
+            if skin.get("id") == skin_id:
+                return skin.get("sha256") or None
+        return None
 
-            zip_path = os.path.join(user_folder, f"{skin_id}.zip")
-            with open(zip_path, "wb") as f:
-                f.write(r.content)
+    def _set_store_download_text(self, skin_id, text):
+        # None - загрузка завершилась, кнопка снова становится "Купить"
+        if text is None:
+            self.store_download_texts.pop(skin_id, None)
+        else:
+            self.store_download_texts[skin_id] = text
+        self._set_store_buy_button_text(skin_id, text or "Купить")
 
-            # Показываем пользователю окошко "спасибо"
-            QMessageBox.information(
-                self,
-                "Спасибо!",
-                ("Спасибо, что поддержали приложение и купили скин.\n"
-                 "Скин загружен в вашу папку скинов, отправлен на почту и "
-                 "доступен для скачивания в браузере!")
-            )
-        except Exception as e:
-            print("complete_purchase error:", e)
-
-    def handle_frame_change(self, movie, label):
-        pixmap = movie.currentPixmap()
-        if not pixmap.isNull():
-            image = pixmap.toImage()
-            scaled_image = image.scaled(64, 64, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.FastTransformation)
-            label.setPixmap(QPixmap.fromImage(scaled_image))
+    def _set_store_buy_button_text(self, skin_id, text):
+        buy_btn = self.store_buy_buttons.get(skin_id)
+        if buy_btn is None:
+            return
+        try:
+            buy_btn.setText(text)
+        except RuntimeError:
+            self.store_buy_buttons.pop(skin_id, None)  # Карточка уже удалена
+
+    def on_skin_download_progress(self, skin_id, received, total):
+        if total:
+            self._set_store_download_text(skin_id, f"{received * 100 // total}%")
+
+    def on_skin_download_finished(self, skin_id, zip_path):
+        self._set_store_download_text(skin_id, None)
+        # Показываем пользователю окошко "спасибо"
+        QMessageBox.information(
+            self,
+            "Спасибо!",
+            ("Спасибо, что поддержали приложение и купили скин.\n"
+             "Скин загружен в вашу папку скинов, отправлен на почту и "
+             "доступен для скачивания в браузере!")
+        )
+
+    def on_skin_download_failed(self, skin_id, error):
+        self._set_store_download_text(skin_id, None)
+        logging.error(f"Не удалось скачать скин {skin_id}: {error}")
 
     def update_mic_preview(self):
         if hasattr(self, 'duck') and hasattr(self.duck, 'current_volume'):
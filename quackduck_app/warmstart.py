@@ -0,0 +1,154 @@
+import json
+import logging
+import os
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+from PyQt6 import QtGui
+from PyQt6.QtGui import QPixmap
+
+from .core import CACHE_DIR
+
+# Warm-start files, rewritten on every clean exit.
+SESSION_PATH = os.path.join(CACHE_DIR, "session.json")
+FRAME_CACHE_DIR = os.path.join(CACHE_DIR, "frames")
+SESSION_VERSION = 1
+
+# Frame cache layout: magic, version, 64-char key, frame count, then for each
+# frame its (row, col, width, height) followed by raw premultiplied ARGB32 pixels.
+FRAME_CACHE_MAGIC = b"QDFRAMES"
+FRAME_CACHE_VERSION = 1
+_HEADER = struct.Struct("<8sI64sI")
+_FRAME = struct.Struct("<iiII")
+_FRAME_FORMAT = QtGui.QImage.Format.Format_ARGB32_Premultiplied
+
+FrameKey = Tuple[int, int]
+
+
+def load_session(path: str = SESSION_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Return the snapshot written by the previous clean exit, or None if there is none usable.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            session = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logging.warning("Ignoring unreadable session snapshot %s: %s", path, exc)
+        return None
+    if not isinstance(session, dict) or session.get("version") != SESSION_VERSION:
+        return None
+    return session
+
+
+def save_session(session: Dict[str, Any], path: str = SESSION_PATH) -> None:
+    temp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(dict(session, version=SESSION_VERSION), file)
+        os.replace(temp_path, path)
+    except OSError as exc:
+        logging.error("Failed to save session snapshot %s: %s", path, exc)
+
+
+class FrameCache:
+    """
+    Binary cache of scaled sprite frames, so a warm start skips PNG decoding and scaling.
+    Entries are keyed by a digest of the skin contents, its frame layout and the pet size.
+    """
+
+    def __init__(self, cache_dir: str = FRAME_CACHE_DIR) -> None:
+        self.cache_dir = cache_dir
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.bin")
+
+    def has(self, key: str) -> bool:
+        return os.path.exists(self._path_for(key))
+
+    def load(self, key: str) -> Optional[Dict[FrameKey, QPixmap]]:
+        path = self._path_for(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            logging.error("Failed to read frame cache %s: %s", path, exc)
+            return None
+
+        try:
+            return self._decode(key, data)
+        except (ValueError, struct.error) as exc:
+            logging.warning("Discarding frame cache %s: %s", path, exc)
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return None
+
+    def store(self, key: str, frames: Dict[FrameKey, QPixmap]) -> bool:
+        chunks = [_HEADER.pack(FRAME_CACHE_MAGIC, FRAME_CACHE_VERSION, key.encode("ascii"), len(frames))]
+        for (row, col), pixmap in frames.items():
+            image = pixmap.toImage().convertToFormat(_FRAME_FORMAT)
+            width, height = image.width(), image.height()
+            # Rows may be padded; keep exactly width * 4 bytes of each.
+            bits = image.constBits()
+            bits.setsize(image.sizeInBytes())
+            raw = bytes(bits)
+            stride = image.bytesPerLine()
+            if stride != width * 4:
+                raw = b"".join(raw[y * stride:y * stride + width * 4] for y in range(height))
+            chunks.append(_FRAME.pack(row, col, width, height))
+            chunks.append(raw)
+
+        path = self._path_for(key)
+        temp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, "wb") as file:
+                file.write(b"".join(chunks))
+            os.replace(temp_path, path)
+        except OSError as exc:
+            logging.error("Failed to write frame cache %s: %s", path, exc)
+            return False
+        return True
+
+    def prune(self, keep: str) -> None:
+        """
+        Drop every entry except keep; only the active skin and size are worth caching.
+        """
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.endswith(".bin") and name != f"{keep}.bin":
+                try:
+                    os.unlink(os.path.join(self.cache_dir, name))
+                except OSError as exc:
+                    logging.debug("Could not remove stale frame cache %s: %s", name, exc)
+
+    @staticmethod
+    def _decode(key: str, data: bytes) -> Dict[FrameKey, QPixmap]:
+        magic, version, stored_key, count = _HEADER.unpack_from(data, 0)
+        if magic != FRAME_CACHE_MAGIC or version != FRAME_CACHE_VERSION:
+            raise ValueError("unknown format")
+        if stored_key.decode("ascii", "replace") != key:
+            raise ValueError("key mismatch")
+
+        frames: Dict[FrameKey, QPixmap] = {}
+        offset = _HEADER.size
+        for _ in range(count):
+            row, col, width, height = _FRAME.unpack_from(data, offset)
+            offset += _FRAME.size
+            size = width * height * 4
+            if offset + size > len(data):
+                raise ValueError("truncated")
+            # QImage only borrows the buffer (and a raster QPixmap may keep sharing it), so detach first.
+            image = QtGui.QImage(data[offset:offset + size], width, height, width * 4, _FRAME_FORMAT).copy()
+            frames[(row, col)] = QPixmap.fromImage(image)
+            offset += size
+        return frames
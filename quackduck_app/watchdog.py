@@ -0,0 +1,163 @@
+import bisect
+import collections
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Callable, Deque, List, NamedTuple, Optional, Tuple
+
+from PyQt6 import QtCore
+
+from .diagnostics import StackFrame, StackRecorder, StackSample, frame_summary, stack_recorder
+
+# Event-loop stall detection. A GUI-thread timer beats every HEARTBEAT_INTERVAL_MS; a
+# watcher thread reports when a beat is more than QUACKDUCK_STALL_MS late (0 disables).
+STALL_THRESHOLD_ENV = "QUACKDUCK_STALL_MS"
+STALL_THRESHOLD_MS = 500
+HEARTBEAT_INTERVAL_MS = 100
+# Inclusive upper bounds (ms) of the stall duration histogram; the last bucket is open-ended.
+STALL_BUCKETS_MS = (100, 250, 500, 1000, 2000, 5000, 10000)
+STALL_REPORT_LIMIT = 50
+
+
+class StallReport(NamedTuple):
+    timestamp: float
+    duration_ms: float
+    frames: Tuple[StackFrame, ...]
+
+
+def _threshold_from_env() -> int:
+    try:
+        return max(int(os.environ.get(STALL_THRESHOLD_ENV, "") or STALL_THRESHOLD_MS), 0)
+    except ValueError:
+        logging.warning("Ignoring invalid %s value.", STALL_THRESHOLD_ENV)
+        return STALL_THRESHOLD_MS
+
+
+def thread_stack(thread_id: int) -> Tuple[StackFrame, ...]:
+    """
+    Current Python stack of another thread, innermost first (empty if it has exited).
+    """
+    frame = sys._current_frames().get(thread_id)
+    return frame_summary(frame) if frame is not None else ()
+
+
+class StallWatchdog:
+    """
+    Detects GUI event-loop stalls. heartbeat() runs on the GUI thread from a QTimer; a
+    daemon thread notices when the heartbeat is late, captures the GUI thread's stack
+    while it is still stuck, and the stall is logged and counted once the loop recovers.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: int = STALL_THRESHOLD_MS,
+        interval_ms: int = HEARTBEAT_INTERVAL_MS,
+        clock: Callable[[], float] = time.monotonic,
+        recorder: Optional[StackRecorder] = stack_recorder,
+    ) -> None:
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms
+        self.histogram: List[int] = [0] * (len(STALL_BUCKETS_MS) + 1)
+        self.reports: Deque[StallReport] = collections.deque(maxlen=STALL_REPORT_LIMIT)
+        self._clock = clock
+        self._recorder = recorder
+        self._lock = threading.Lock()
+        self._last_beat = clock()
+        # (beat the stall belongs to, wall time, GUI stack) captured by the watcher thread.
+        self._pending: Optional[Tuple[float, float, Tuple[StackFrame, ...]]] = None
+        self._gui_thread_id = threading.get_ident()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._timer: Optional[QtCore.QTimer] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        """
+        Start beating on the calling (GUI) thread and watching from a background thread.
+        """
+        if self.threshold_ms <= 0 or self.running:
+            return
+        self._gui_thread_id = threading.get_ident()
+        self._last_beat = self._clock()
+        self._stop_event.clear()
+        self._timer = QtCore.QTimer()
+        self._timer.timeout.connect(self.heartbeat)
+        self._timer.start(self.interval_ms)
+        self._thread = threading.Thread(target=self._run, name="StallWatchdog", daemon=True)
+        self._thread.start()
+        logging.info("Stall watchdog started (threshold %s ms).", self.threshold_ms)
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self._stop_event.set()
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        self._thread.join(timeout=1)
+        self._thread = None
+        if sum(self.histogram):
+            logging.info("Event-loop stalls this session: %s", self.format_histogram())
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_ms / 1000):
+            self.check()
+
+    def _late_ms(self, now: float, beat: float) -> float:
+        return (now - beat) * 1000 - self.interval_ms
+
+    def check(self) -> bool:
+        """
+        Called from the watcher thread; captures the GUI stack once per stall.
+        """
+        with self._lock:
+            beat = self._last_beat
+            late_ms = self._late_ms(self._clock(), beat)
+            if late_ms < self.threshold_ms or (self._pending is not None and self._pending[0] == beat):
+                return False
+            frames = thread_stack(self._gui_thread_id)
+            self._pending = (beat, time.time(), frames)
+        logging.warning(
+            "GUI thread unresponsive for %.0f ms, currently in:\n%s",
+            late_ms,
+            "\n".join(f"    {function} ({filename}:{line})" for filename, line, function in frames),
+        )
+        return True
+
+    def heartbeat(self) -> Optional[StallReport]:
+        """
+        Called on the GUI thread by the heartbeat timer; returns the report if a stall just ended.
+        """
+        with self._lock:
+            now = self._clock()
+            beat, self._last_beat = self._last_beat, now
+            pending, self._pending = self._pending, None
+        late_ms = self._late_ms(now, beat)
+        if late_ms < self.threshold_ms:
+            return None
+        if pending is not None and pending[0] == beat:
+            timestamp, frames = pending[1], pending[2]
+        else:
+            # Too short for the watcher to catch it in the act.
+            timestamp, frames = time.time() - late_ms / 1000, ()
+        return self._record(StallReport(timestamp, late_ms, frames))
+
+    def _record(self, report: StallReport) -> StallReport:
+        self.histogram[bisect.bisect_left(STALL_BUCKETS_MS, report.duration_ms)] += 1
+        self.reports.append(report)
+        if self._recorder is not None:
+            self._recorder.add(StackSample(report.timestamp, f"stall {report.duration_ms:.0f} ms", "MainThread", report.frames))
+        logging.warning("GUI thread stalled for %.0f ms. Stalls so far: %s", report.duration_ms, self.format_histogram())
+        return report
+
+    def format_histogram(self) -> str:
+        labels = [f"<={bound}ms" for bound in STALL_BUCKETS_MS] + [f">{STALL_BUCKETS_MS[-1]}ms"]
+        return ", ".join(f"{label}: {count}" for label, count in zip(labels, self.histogram) if count) or "none"
+
+
+watchdog = StallWatchdog(threshold_ms=_threshold_from_env())
@@ -1,16 +1,94 @@
 import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
-from PyQt6.QtCore import QCoreApplication
+from PyQt6.QtWidgets import QApplication
 
 
 @pytest.fixture(scope="session", autouse=True)
 def qt_core_app():
     """
-    Ensure a Qt core application exists for classes like QSettings/QColor.
+    Ensure a Qt application exists for QSettings/QPixmap and for widgets such as the duck.
     """
     os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
-    app = QCoreApplication.instance()
+    app = QApplication.instance()
     if app is None:
-        app = QCoreApplication([])
+        app = QApplication([])
     yield app
+
+
+class _RangeRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the fixture's files with optional Range support and scripted failures.
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, self.headers.get("Range")))
+        path = self.path.split("?", 1)[0]
+        if path in server.statuses:
+            self.send_error(server.statuses[path])
+            return
+        body = server.files.get(path)
+        if body is None:
+            self.send_error(404)
+            return
+
+        start, end, status = 0, len(body) - 1, 200
+        range_header = self.headers.get("Range")
+        if range_header and server.accept_ranges:
+            first, _, last = range_header.replace("bytes=", "").partition("-")
+            start = int(first)
+            end = int(last) if last else len(body) - 1
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(body)}")
+                self.end_headers()
+                return
+            status = 206
+
+        payload = body[start:end + 1]
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(payload)))
+        if server.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+        for name, value in server.extra_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        if server.truncate_next:
+            # Simulate a dropped connection halfway through the response.
+            server.truncate_next -= 1
+            self.wfile.write(payload[: len(payload) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def range_server():
+    """
+    Local HTTP server for download tests. Put bytes into server.files[path];
+    server.url(path) returns the full URL and server.requests records (path, Range) pairs.
+    server.statuses[path] makes that path answer with the given error status.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RangeRequestHandler)
+    server.files = {}
+    server.requests = []
+    server.accept_ranges = True
+    server.truncate_next = 0
+    server.extra_headers = {}
+    server.statuses = {}
+    server.url = lambda path: f"http://127.0.0.1:{server.server_address[1]}{path}"
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,23 @@
+import autoupdater
+from quackduck_app import app
+
+
+def _booting_update(app_dir):
+    app_dir.mkdir()
+    autoupdater._write_update_marker(str(app_dir), {"version": "2.0.0", "state": "installed"})
+    assert autoupdater.begin_update_health_check(str(app_dir)) is True
+    assert autoupdater.update_is_unconfirmed(str(app_dir))
+
+
+def test_clean_exit_confirms_update_but_crash_does_not(monkeypatch, tmp_path):
+    clean_dir = tmp_path / "clean"
+    _booting_update(clean_dir)
+    monkeypatch.setattr(app, "_crashed", False)
+    app._confirm_on_clean_exit(str(clean_dir))
+    assert autoupdater.read_update_marker(str(clean_dir)) is None
+
+    crashed_dir = tmp_path / "crashed"
+    _booting_update(crashed_dir)
+    monkeypatch.setattr(app, "_crashed", True)
+    app._confirm_on_clean_exit(str(crashed_dir))
+    assert autoupdater.update_is_unconfirmed(str(crashed_dir))
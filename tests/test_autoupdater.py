@@ -1,55 +1,17 @@
+import hashlib
+import io
+import json
 import os
+import time
 import zipfile
 
 import pytest
 import requests
 
+import autoupdater
 from autoupdater import AutoUpdater
 
 
-def test_find_onedir_root_with_single_folder(tmp_path):
-    extracted_root = tmp_path / "extracted"
-    extracted_root.mkdir()
-    inner = extracted_root / "build"
-    inner.mkdir()
-    (inner / "file.txt").write_text("content", encoding="utf-8")
-
-    updater = AutoUpdater("1.0.0", "owner", "repo")
-    assert updater._find_onedir_root(str(extracted_root)) == str(inner)
-
-
-def test_cleanup_old_app_removes_everything_but_temp(tmp_path):
-    app_dir = tmp_path / "app"
-    app_dir.mkdir()
-    keep_dir = app_dir / "temp_updater"
-    keep_dir.mkdir()
-    old_file = app_dir / "old.txt"
-    old_file.write_text("old", encoding="utf-8")
-    old_folder = app_dir / "old_folder"
-    old_folder.mkdir()
-
-    updater = AutoUpdater("1.0.0", "owner", "repo")
-    updater._cleanup_old_app(str(app_dir))
-
-    assert keep_dir.exists()
-    assert not old_file.exists()
-    assert not old_folder.exists()
-
-
-def test_copy_all_copies_tree(tmp_path):
-    src = tmp_path / "src"
-    dst = tmp_path / "dst"
-    (src / "nested").mkdir(parents=True)
-    (src / "nested" / "file.txt").write_text("data", encoding="utf-8")
-
-    updater = AutoUpdater("1.0.0", "owner", "repo")
-    updater._copy_all(str(src), str(dst))
-
-    copied = dst / "nested" / "file.txt"
-    assert copied.exists()
-    assert copied.read_text(encoding="utf-8") == "data"
-
-
 def test_download_file_success(monkeypatch, tmp_path):
     content = b"abc" * 100
 
@@ -146,3 +108,380 @@ def test_check_for_updates_handles_errors(monkeypatch):
     monkeypatch.setattr(requests, "get", fake_get)
 
     assert updater.check_for_updates() is None
+
+
+PAYLOAD = os.urandom(256 * 1024)
+
+
+def test_download_file_fetches_ranges_in_parallel(monkeypatch, range_server, tmp_path):
+    monkeypatch.setattr("autoupdater.PARALLEL_MIN_SIZE", 1024)
+    range_server.files["/build.zip"] = PAYLOAD
+    dest_file = tmp_path / "build.zip"
+    progress_updates = []
+
+    updater = AutoUpdater("1.0.0", "owner", "repo")
+    ok = updater._download_file(range_server.url("/build.zip"), str(dest_file), progress_updates.append,
+                                expected_sha256=hashlib.sha256(PAYLOAD).hexdigest())
+
+    assert ok is True
+    assert dest_file.read_bytes() == PAYLOAD
+    ranges = sorted(header for _, header in range_server.requests if header)
+    assert len(range_server.requests) == autoupdater.PARALLEL_SEGMENTS
+    assert len(ranges) == autoupdater.PARALLEL_SEGMENTS - 1
+    assert progress_updates[-1] == 100
+    assert not (tmp_path / "build.zip.part").exists()
+    assert not (tmp_path / "build.zip.part.json").exists()
+
+
+def test_download_file_single_stream_without_range_support(range_server, tmp_path):
+    range_server.files["/build.zip"] = PAYLOAD
+    range_server.accept_ranges = False
+    dest_file = tmp_path / "build.zip"
+
+    updater = AutoUpdater("1.0.0", "owner", "repo")
+    assert updater._download_file(range_server.url("/build.zip"), str(dest_file)) is True
+    assert dest_file.read_bytes() == PAYLOAD
+    assert range_server.requests == [("/build.zip", None)]
+
+
+def test_download_file_rejects_checksum_mismatch(range_server, tmp_path):
+    range_server.files["/build.zip"] = PAYLOAD
+    dest_file = tmp_path / "build.zip"
+
+    updater = AutoUpdater("1.0.0", "owner", "repo")
+    assert updater._download_file(range_server.url("/build.zip"), str(dest_file), expected_sha256="0" * 64) is False
+    assert not dest_file.exists()
+    assert not (tmp_path / "build.zip.part").exists()
+
+
+def test_download_file_resumes_after_interruption(monkeypatch, range_server, tmp_path):
+    monkeypatch.setattr("autoupdater.PARALLEL_MIN_SIZE", 1024)
+    range_server.files["/build.zip"] = PAYLOAD
+    range_server.truncate_next = 1
+    dest_file = tmp_path / "build.zip"
+    updater = AutoUpdater("1.0.0", "owner", "repo")
+
+    assert updater._download_file(range_server.url("/build.zip"), str(dest_file)) is False
+    assert (tmp_path / "build.zip.part.json").exists()
+
+    range_server.requests.clear()
+    assert updater._download_file(range_server.url("/build.zip"), str(dest_file),
+                                  expected_sha256=hashlib.sha256(PAYLOAD).hexdigest()) is True
+    assert dest_file.read_bytes() == PAYLOAD
+    # Only the missing bytes were requested again, never the whole file.
+    assert range_server.requests
+    assert all(header and header != "bytes=0-" for _, header in range_server.requests)
+
+
+def test_download_file_throttles_progress(monkeypatch, range_server, tmp_path):
+    monkeypatch.setattr("autoupdater.PROGRESS_INTERVAL", 60)
+    monkeypatch.setattr("autoupdater.DOWNLOAD_CHUNK_SIZE", 1024)
+    range_server.files["/build.zip"] = PAYLOAD
+    progress_updates = []
+
+    updater = AutoUpdater("1.0.0", "owner", "repo")
+    assert updater._download_file(range_server.url("/build.zip"), str(tmp_path / "build.zip"), progress_updates.append)
+    assert progress_updates == [0, 100]
+
+
+def _make_build(root, files):
+    for rel, data in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+def _serve_build(range_server, build_dir, version="1.0.1"):
+    manifest = autoupdater.build_manifest(str(build_dir), version, base_url=range_server.url("/files/"))
+    for rel in manifest["files"]:
+        range_server.files[f"/files/{rel}"] = (build_dir / rel).read_bytes()
+    range_server.files["/manifest.json"] = json.dumps(manifest).encode("utf-8")
+    return {"assets": [
+        {"name": "build.zip", "browser_download_url": range_server.url("/build.zip")},
+        {"name": "manifest.json", "browser_download_url": range_server.url("/manifest.json")},
+    ]}
+
+
+def test_download_and_install_applies_delta(range_server, tmp_path):
+    unchanged = {f"_internal/lib{i}.dll": os.urandom(4096) for i in range(10)}
+    app_dir = tmp_path / "app"
+    _make_build(app_dir, {**unchanged, "quackduck.exe": b"old exe", "obsolete.txt": b"gone"})
+    build_dir = tmp_path / "build"
+    _make_build(build_dir, {**unchanged, "quackduck.exe": b"new exe", "_internal/new.pyd": b"added"})
+    release_info = _serve_build(range_server, build_dir)
+    untouched = app_dir / "_internal" / "lib0.dll"
+    before = untouched.stat().st_mtime_ns
+
+    progress_updates = []
+    updater = AutoUpdater("1.0.0", "owner", "repo")
+    assert updater.download_and_install(release_info, str(app_dir), progress_updates.append) is True
+
+    assert (app_dir / "quackduck.exe").read_bytes() == b"new exe"
+    assert (app_dir / "_internal" / "new.pyd").read_bytes() == b"added"
+    assert not (app_dir / "obsolete.txt").exists()
+    assert untouched.stat().st_mtime_ns == before
+    assert not (app_dir / "temp_updater").exists()
+    assert progress_updates[-1] == 100
+    fetched = sorted(path for path, _ in range_server.requests)
+    assert fetched == ["/files/_internal/new.pyd", "/files/quackduck.exe", "/manifest.json"]
+
+
+def test_download_and_install_falls_back_to_full_package(range_server, tmp_path):
+    app_dir = tmp_path / "app"
+    _make_build(app_dir, {"quackduck.exe": b"old exe"})
+    build_dir = tmp_path / "build"
+    _make_build(build_dir, {"quackduck.exe": b"new exe", "data.bin": os.urandom(1024)})
+    release_info = _serve_build(range_server, build_dir)
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("build_root/quackduck.exe", "zip exe")
+    range_server.files["/build.zip"] = archive.getvalue()
+
+    updater = AutoUpdater("1.0.0", "owner", "repo")
+    assert updater.download_and_install(release_info, str(app_dir)) is True
+
+    # Everything changed, so the full package was cheaper than the delta.
+    assert (app_dir / "quackduck.exe").read_text() == "zip exe"
+    assert "/build.zip" in [path for path, _ in range_server.requests]
+
+
+def test_install_delta_rejects_paths_outside_app_dir(range_server, tmp_path):
+    app_dir = tmp_path / "app"
+    app_dir.mkdir()
+    manifest = {"files": {"../evil.txt": {"size": 1, "sha256": "0" * 64}}, "base_url": range_server.url("/")}
+    range_server.files["/manifest.json"] = json.dumps(manifest).encode("utf-8")
+
+    updater = AutoUpdater("1.0.0", "owner", "repo")
+    assert updater._install_delta(range_server.url("/manifest.json"), str(app_dir)) is False
+    assert not (tmp_path / "evil.txt").exists()
+
+
+def test_extract_zip_strips_single_root_folder(tmp_path):
+    zip_path = tmp_path / "build.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("QuackDuck/quackduck.exe", "exe")
+        zf.writestr("QuackDuck/_internal/lib.dll", "lib")
+
+    updater = AutoUpdater("1.0.0", "owner", "repo")
+    updater._extract_zip(str(zip_path), str(tmp_path / "out"))
+
+    assert (tmp_path / "out" / "quackduck.exe").read_text() == "exe"
+    assert (tmp_path / "out" / "_internal" / "lib.dll").read_text() == "lib"
+
+
+def test_extract_zip_keeps_flat_layout_and_rejects_escapes(tmp_path):
+    flat = tmp_path / "flat.zip"
+    with zipfile.ZipFile(flat, "w") as zf:
+        zf.writestr("quackduck.exe", "exe")
+        zf.writestr("readme.txt", "hi")
+    updater = AutoUpdater("1.0.0", "owner", "repo")
+    updater._extract_zip(str(flat), str(tmp_path / "out"))
+    assert sorted(os.listdir(tmp_path / "out")) == ["quackduck.exe", "readme.txt"]
+
+    evil = tmp_path / "evil.zip"
+    with zipfile.ZipFile(evil, "w") as zf:
+        zf.writestr("../evil.txt", "x")
+    with pytest.raises(ValueError):
+        updater._extract_zip(str(evil), str(tmp_path / "out2"))
+    assert not (tmp_path / "evil.txt").exists()
+
+
+def test_download_and_install_stages_next_to_app_dir(monkeypatch, tmp_path):
+    updater = AutoUpdater("1.0.0", "owner", "repo")
+    app_dir = tmp_path / "app"
+    app_dir.mkdir()
+    (app_dir / "old.txt").write_text("old")
+    release_info = {"assets": [{"browser_download_url": "http://example.com/build.zip", "name": "build.zip"}]}
+    seen = {}
+
+    def fake_download(url, dest_file, progress_callback=None):
+        with zipfile.ZipFile(dest_file, "w") as archive:
+            archive.writestr("build_root/new.txt", "fresh")
+        return True
+
+    original_extract = updater._extract_zip
+
+    def spy_extract(zip_path, dest_dir, **kwargs):
+        seen["dest_dir"] = dest_dir
+        return original_extract(zip_path, dest_dir, **kwargs)
+
+    monkeypatch.setattr(updater, "_download_file", fake_download)
+    monkeypatch.setattr(updater, "_extract_zip", spy_extract)
+
+    assert updater.download_and_install(release_info, str(app_dir)) is True
+    assert seen["dest_dir"] == str(tmp_path / "app.staging")
+    assert (app_dir / "new.txt").read_text() == "fresh"
+    assert not (app_dir / "old.txt").exists()
+    assert not (tmp_path / "app.staging").exists()
+
+
+def _install_zip(monkeypatch, updater, app_dir, files):
+    def fake_download(url, dest_file, progress_callback=None):
+        with zipfile.ZipFile(dest_file, "w") as archive:
+            for rel, data in files.items():
+                archive.writestr(f"QuackDuck/{rel}", data)
+        return True
+
+    monkeypatch.setattr(updater, "_download_file", fake_download)
+    release_info = {"assets": [{"browser_download_url": "http://example.com/build.zip", "name": "build.zip"}]}
+    return updater.download_and_install(release_info, str(app_dir))
+
+
+def test_staged_install_links_unchanged_files_and_keeps_previous_build(monkeypatch, tmp_path):
+    app_dir = tmp_path / "app"
+    _make_build(app_dir, {"quackduck.exe": b"old exe", "_internal/lib.dll": b"same lib"})
+    updater = AutoUpdater("1.0.0", "owner", "repo")
+
+    assert _install_zip(monkeypatch, updater, app_dir, {"quackduck.exe": b"new exe!", "_internal/lib.dll": b"same lib"})
+
+    previous = tmp_path / "app.previous"
+    assert (app_dir / "quackduck.exe").read_bytes() == b"new exe!"
+    assert (previous / "quackduck.exe").read_bytes() == b"old exe"
+    assert (app_dir / "_internal" / "lib.dll").stat().st_ino == (previous / "_internal" / "lib.dll").stat().st_ino
+    marker = autoupdater.read_update_marker(str(app_dir))
+    assert marker["previous_version"] == "1.0.0" and marker["backup_dir"] == str(previous)
+
+    assert autoupdater.begin_update_health_check(str(app_dir)) is True
+    autoupdater.confirm_update(str(app_dir))
+    assert not previous.exists()
+    assert autoupdater.read_update_marker(str(app_dir)) is None
+    assert (app_dir / "_internal" / "lib.dll").read_bytes() == b"same lib"
+
+
+def test_confirm_leaves_installed_but_not_started_update_alone(monkeypatch, tmp_path):
+    app_dir = tmp_path / "app"
+    _make_build(app_dir, {"quackduck.exe": b"old exe"})
+    updater = AutoUpdater("1.0.0", "owner", "repo")
+    assert _install_zip(monkeypatch, updater, app_dir, {"quackduck.exe": b"new exe"})
+    assert autoupdater.read_update_marker(str(app_dir))["state"] == "installed"
+
+    # The old build's health-check timer fires after the swap, before the restart.
+    autoupdater.confirm_update(str(app_dir))
+
+    assert autoupdater.read_update_marker(str(app_dir))["state"] == "installed"
+    assert (tmp_path / "app.previous" / "quackduck.exe").read_bytes() == b"old exe"
+
+
+def test_unconfirmed_update_is_rolled_back_on_next_start(monkeypatch, tmp_path):
+    app_dir = tmp_path / "app"
+    _make_build(app_dir, {"quackduck.exe": b"old exe"})
+    updater = AutoUpdater("1.0.0", "owner", "repo")
+    assert _install_zip(monkeypatch, updater, app_dir, {"quackduck.exe": b"broken", "extra.dll": b"x"})
+
+    # First start of the new build: health check begins.
+    assert autoupdater.begin_update_health_check(str(app_dir)) is True
+    assert autoupdater.update_is_unconfirmed(str(app_dir))
+    # It never confirmed; the next start restores the previous build.
+    assert autoupdater.begin_update_health_check(str(app_dir)) is False
+
+    assert (app_dir / "quackduck.exe").read_bytes() == b"old exe"
+    assert not (app_dir / "extra.dll").exists()
+    assert not (tmp_path / "app.previous").exists()
+    assert autoupdater.read_update_marker(str(app_dir)) is None
+
+
+def test_swap_and_rollback_file_by_file_when_app_dir_is_in_use(monkeypatch, tmp_path):
+    app_dir = tmp_path / "app"
+    _make_build(app_dir, {"quackduck.exe": b"old exe", "_internal/old.dll": b"old"})
+    real_rename = os.rename
+
+    def locked_rename(src, dst):
+        if os.path.abspath(src) == str(app_dir):
+            raise PermissionError("in use")
+        return real_rename(src, dst)
+
+    monkeypatch.setattr("autoupdater.os.rename", locked_rename)
+    updater = AutoUpdater("1.0.0", "owner", "repo")
+    assert _install_zip(monkeypatch, updater, app_dir, {"quackduck.exe": b"new exe"})
+
+    assert (app_dir / "quackduck.exe").read_bytes() == b"new exe"
+    assert not (app_dir / "_internal" / "old.dll").exists()
+    assert (tmp_path / "app.previous" / "_internal" / "old.dll").read_bytes() == b"old"
+    assert not (tmp_path / "app.staging").exists()
+
+    assert autoupdater.rollback_update(str(app_dir)) is True
+    assert (app_dir / "quackduck.exe").read_bytes() == b"old exe"
+    assert (app_dir / "_internal" / "old.dll").read_bytes() == b"old"
+    assert autoupdater.read_update_marker(str(app_dir)) is None
+
+
+def test_parse_version_orders_semantically():
+    assert autoupdater.is_newer_version("1.5.10", "1.5.2")
+    assert autoupdater.is_newer_version("v2.0.0", "1.99.99")
+    assert not autoupdater.is_newer_version("1.5", "1.5.0")
+    assert autoupdater.is_newer_version("1.6.0", "1.6.0-beta.2")
+    assert autoupdater.is_newer_version("1.6.0-beta.10", "1.6.0-beta.2")
+    assert not autoupdater.is_newer_version("1.5.2", "1.5.2")
+
+
+class _ReleaseResponse:
+    def __init__(self, status_code=200, body=None, headers=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+    def json(self):
+        return self._body
+
+
+def test_update_check_uses_etag_and_persists_it(monkeypatch, tmp_path):
+    cache_path = str(tmp_path / "update_check.json")
+    calls = []
+    responses = [
+        _ReleaseResponse(200, {"tag_name": "v1.5.10"}, {"ETag": '"abc"'}),
+        _ReleaseResponse(304),
+    ]
+
+    def fake_get(url, headers=None, timeout=None):
+        calls.append(dict(headers or {}))
+        return responses.pop(0)
+
+    monkeypatch.setattr(requests, "get", fake_get)
+
+    assert AutoUpdater("1.5.2", "owner", "repo", cache_path=cache_path).check_for_updates()["tag_name"] == "v1.5.10"
+    # A new launch within the interval does not touch the network at all.
+    assert AutoUpdater("1.5.2", "owner", "repo", cache_path=cache_path).check_for_updates()["tag_name"] == "v1.5.10"
+    assert len(calls) == 1
+    # A forced (manual) check revalidates with If-None-Match and reuses the cached release on 304.
+    updater = AutoUpdater("1.5.2", "owner", "repo", cache_path=cache_path)
+    assert updater.check_for_updates(force=True)["tag_name"] == "v1.5.10"
+    assert calls[1]["If-None-Match"] == '"abc"'
+    assert AutoUpdater("1.5.10", "owner", "repo", cache_path=cache_path).check_for_updates() is None
+
+
+def test_update_check_backs_off_when_rate_limited(monkeypatch, tmp_path):
+    calls = []
+    reset_at = int(time.time()) + 3600
+
+    def fake_get(url, headers=None, timeout=None):
+        calls.append(url)
+        return _ReleaseResponse(403, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset_at)})
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    service = autoupdater.UpdateCheckService("http://example.com/latest", str(tmp_path / "check.json"))
+
+    assert service.latest_release(force=True) is None
+    assert service.latest_release(force=True) is None
+    assert len(calls) == 1
+    assert service.state["backoff_until"] >= reset_at
+
+
+def test_update_check_backoff_grows_exponentially(monkeypatch):
+    def fake_get(*args, **kwargs):
+        raise requests.ConnectionError("offline")
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    service = autoupdater.UpdateCheckService("http://example.com/latest")
+    delays = []
+    for _ in range(3):
+        service.state["backoff_until"] = 0
+        now = time.time()
+        service.latest_release()
+        delays.append(round(service.state["backoff_until"] - now))
+
+    assert delays == [autoupdater.BACKOFF_BASE, autoupdater.BACKOFF_BASE * 2, autoupdater.BACKOFF_BASE * 4]
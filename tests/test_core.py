@@ -1,3 +1,5 @@
+import logging
+import logging.handlers
 import os
 
 from PyQt6.QtGui import QColor
@@ -60,3 +62,78 @@ def test_safe_int_handles_invalid_values():
     assert core.safe_int("10") == 10
     assert core.safe_int("not-a-number", default=7) == 7
     assert core.safe_int(None, default=-1) == -1
+
+
+def test_lazy_import_records_first_import_only(monkeypatch):
+    monkeypatch.setattr(core, "_import_timings", {})
+    monkeypatch.delitem(core.sys.modules, "colorsys", raising=False)
+
+    module = core.lazy_import("colorsys")
+    assert module.__name__ == "colorsys"
+    assert "colorsys" in core.import_timings()
+
+    core._import_timings.clear()
+    assert core.lazy_import("colorsys") is module
+    assert core.import_timings() == {}
+
+
+def test_log_import_report_lists_deferred_modules(monkeypatch, caplog):
+    monkeypatch.setattr(core, "_import_timings", {"slow.module": 0.25})
+    monkeypatch.setattr(core, "OPTIONAL_MODULES", ("os", "not_loaded_module"))
+
+    with caplog.at_level("INFO"):
+        core.log_import_report("test")
+
+    assert "slow.module 250.0 ms" in caplog.text
+    assert "loaded at test: ['os']; deferred: ['not_loaded_module']" in caplog.text
+
+
+def test_startup_profiler_records_phases_and_first_frame_once():
+    ticks = iter([0.0, 1.0, 1.5, 2.0, 3.0])
+    profiler = core.StartupProfiler(clock=lambda: next(ticks))
+
+    with profiler.phase("settings"):
+        pass
+
+    assert profiler.phases == [("settings", 0.5)]
+    assert profiler.mark_first_frame() is True
+    assert profiler.first_frame == 2.0
+    assert profiler.mark_first_frame() is False
+
+
+def test_resolve_log_levels_presets_and_names(monkeypatch):
+    monkeypatch.delenv(core.LOG_LEVEL_ENV, raising=False)
+    assert core.resolve_log_levels("production") == (logging.INFO, logging.WARNING)
+    assert core.resolve_log_levels("DEBUG") == (logging.DEBUG, logging.DEBUG)
+    assert core.resolve_log_levels("error") == (logging.ERROR, logging.ERROR)
+    assert core.resolve_log_levels("nonsense") == core.LOG_LEVEL_PRESETS["production"]
+
+    monkeypatch.setenv(core.LOG_LEVEL_ENV, "quiet")
+    assert core.resolve_log_levels() == (logging.WARNING, logging.WARNING)
+
+    monkeypatch.delenv(core.LOG_LEVEL_ENV)
+    monkeypatch.setattr(core.sys, "frozen", True, raising=False)
+    assert core.resolve_log_levels() == core.LOG_LEVEL_PRESETS["production"]
+
+
+def test_configure_logging_writes_through_queue_and_gates_hot_path(monkeypatch, tmp_path):
+    log_file = tmp_path / "quackduck.log"
+    root = logging.getLogger()
+    monkeypatch.setattr(core, "LOG_FILE", str(log_file))
+    monkeypatch.setattr(core.configure_logging, "_configured", False, raising=False)
+    monkeypatch.setattr(root, "handlers", [])
+    monkeypatch.setattr(root, "level", root.level)
+    monkeypatch.setattr(core.HOT_LOG, "level", core.HOT_LOG.level)
+
+    core.configure_logging("production")
+    try:
+        assert [type(handler) for handler in root.handlers] == [logging.handlers.QueueHandler]
+        assert not core.HOT_LOG.isEnabledFor(logging.DEBUG)
+        logging.info("visible %s", 1)
+        core.HOT_LOG.debug("hidden tick")
+    finally:
+        core.shutdown_logging()
+
+    text = log_file.read_text(encoding="utf-8")
+    assert "INFO:visible 1" in text
+    assert "hidden tick" not in text
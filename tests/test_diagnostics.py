@@ -0,0 +1,36 @@
+from quackduck_app.diagnostics import StackRecorder
+
+
+def _caller(recorder, label):
+    return recorder.record(label)
+
+
+def test_stack_recorder_is_off_by_default():
+    recorder = StackRecorder()
+    assert recorder.enabled is False
+    assert _caller(recorder, "skip") is False
+    assert recorder.samples() == [] and recorder.dropped == 1
+
+
+def test_stack_recorder_samples_by_rate():
+    draws = iter([0.9, 0.1])
+    recorder = StackRecorder(sample_rate=0.5, rng=lambda: next(draws))
+
+    assert _caller(recorder, "first") is False
+    assert _caller(recorder, "second") is True
+    assert [sample.label for sample in recorder.samples()] == ["second"]
+
+
+def test_stack_recorder_captures_caller_frames_in_a_ring():
+    recorder = StackRecorder(capacity=2, max_depth=3)
+    recorder.debug = True
+    for label in ("a", "b", "c"):
+        _caller(recorder, label)
+
+    samples = recorder.samples()
+    assert [sample.label for sample in samples] == ["b", "c"]
+    filename, _, function = samples[-1].frames[0]
+    assert (filename, function) == ("test_diagnostics.py", "_caller")
+    assert len(samples[-1].frames) == 3
+    assert "_caller (test_diagnostics.py:" in recorder.format()
+    assert recorder.samples(label="b") == [samples[0]]
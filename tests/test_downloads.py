@@ -0,0 +1,114 @@
+import hashlib
+import os
+
+import pytest
+from PyQt6.QtCore import QCoreApplication
+
+from quackduck_app.downloads import DownloadError, SkinDownloadManager, download_to_file, part_path_for
+
+PAYLOAD = bytes(range(256)) * 1024
+
+
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_download_streams_into_place_and_reports_progress(range_server, tmp_path):
+    range_server.files["/skin.zip"] = PAYLOAD
+    dest = tmp_path / "skins" / "skin.zip"
+    progress = []
+
+    download_to_file(range_server.url("/skin.zip"), str(dest), expected_sha256=_sha(PAYLOAD),
+                     progress_callback=lambda received, total: progress.append((received, total)))
+
+    assert dest.read_bytes() == PAYLOAD
+    assert not os.path.exists(part_path_for(str(dest)))
+    assert progress[-1] == (len(PAYLOAD), len(PAYLOAD))
+
+
+def test_download_resumes_existing_part_file(range_server, tmp_path):
+    range_server.files["/skin.zip"] = PAYLOAD
+    dest = tmp_path / "skin.zip"
+    with open(part_path_for(str(dest)), "wb") as file:
+        file.write(PAYLOAD[:1000])
+
+    download_to_file(range_server.url("/skin.zip"), str(dest), expected_sha256=_sha(PAYLOAD))
+
+    assert dest.read_bytes() == PAYLOAD
+    assert range_server.requests == [("/skin.zip", "bytes=1000-")]
+
+
+def test_download_retries_with_range_after_dropped_connection(range_server, tmp_path):
+    range_server.files["/skin.zip"] = PAYLOAD
+    range_server.truncate_next = 1
+    dest = tmp_path / "skin.zip"
+
+    download_to_file(range_server.url("/skin.zip"), str(dest), expected_sha256=_sha(PAYLOAD), retry_delay=0)
+
+    assert dest.read_bytes() == PAYLOAD
+    assert range_server.requests[0] == ("/skin.zip", None)
+    assert range_server.requests[1][1].startswith("bytes=")
+    assert range_server.requests[1][1] != "bytes=0-"
+
+
+def test_download_restarts_when_server_ignores_range(range_server, tmp_path):
+    range_server.files["/skin.zip"] = PAYLOAD
+    range_server.accept_ranges = False
+    dest = tmp_path / "skin.zip"
+    with open(part_path_for(str(dest)), "wb") as file:
+        file.write(b"garbage")
+
+    download_to_file(range_server.url("/skin.zip"), str(dest), expected_sha256=_sha(PAYLOAD))
+
+    assert dest.read_bytes() == PAYLOAD
+
+
+def test_download_rejects_checksum_mismatch(range_server, tmp_path):
+    range_server.files["/skin.zip"] = PAYLOAD
+    range_server.extra_headers["X-Checksum-SHA256"] = "0" * 64
+    dest = tmp_path / "skin.zip"
+
+    with pytest.raises(DownloadError):
+        download_to_file(range_server.url("/skin.zip"), str(dest))
+
+    assert not dest.exists()
+    assert not os.path.exists(part_path_for(str(dest)))
+
+
+def test_download_gives_up_after_max_attempts(range_server, tmp_path):
+    range_server.statuses["/skin.zip"] = 503
+    dest = tmp_path / "skin.zip"
+    with pytest.raises(DownloadError):
+        download_to_file(range_server.url("/skin.zip"), str(dest), max_attempts=2, retry_delay=0)
+    assert len(range_server.requests) == 2
+    assert not dest.exists()
+
+
+def test_download_fails_fast_on_client_errors(range_server, tmp_path):
+    range_server.statuses["/forbidden.zip"] = 403
+    dest = tmp_path / "skin.zip"
+    for path in ("/missing.zip", "/forbidden.zip"):
+        with pytest.raises(DownloadError):
+            download_to_file(range_server.url(path), str(dest), max_attempts=5, retry_delay=0)
+    assert len(range_server.requests) == 2
+    assert not dest.exists()
+
+
+def test_download_manager_reports_result_with_signals(range_server, tmp_path):
+    range_server.files["/skin.zip"] = PAYLOAD
+    manager = SkinDownloadManager()
+    finished, progress = [], []
+    manager.finished.connect(lambda key, path: finished.append((key, path)))
+    manager.progress.connect(lambda key, received, total: progress.append(received))
+    dest = str(tmp_path / "skin.zip")
+
+    assert manager.download("skin", range_server.url("/skin.zip"), dest, expected_sha256=_sha(PAYLOAD))
+    assert not manager.download("skin", range_server.url("/skin.zip"), dest)
+    assert manager.wait(10000)
+    QCoreApplication.processEvents()
+
+    assert finished == [("skin", dest)]
+    assert progress[-1] == len(PAYLOAD)
+    # Progress is throttled to percentage steps, not emitted for every chunk.
+    assert len(progress) <= 101
+    assert not manager.is_active("skin")
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from quackduck_app import flight
+from quackduck_app.flight import FlightRecorder, recorded_request
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ring_keeps_latest_events_and_dumps_jsonl(tmp_path):
+    recorder = FlightRecorder(capacity=3, clock=FakeClock())
+    for index in range(5):
+        recorder.record("state", old=str(index), new=str(index + 1))
+
+    path = recorder.dump(str(tmp_path / "flight.jsonl"), reason="test")
+    lines = [json.loads(line) for line in open(path, encoding="utf-8")]
+
+    assert lines[0]["kind"] == "header"
+    assert lines[0]["reason"] == "test"
+    assert [line["old"] for line in lines[1:]] == ["2", "3", "4"]
+    assert lines[1]["t"] == 1000.0
+    assert lines[1]["thread"] == "MainThread"
+
+
+def test_ticks_and_levels_are_summarised_per_window():
+    clock = FakeClock()
+    recorder = FlightRecorder(clock=clock)
+    for step in range(10):
+        clock.now = 1000.0 + step * 0.2
+        recorder.tick("position", 0.002 * (step + 1))
+        recorder.level("mic", step * 10)
+    recorder.flush()
+
+    ticks = [fields for _, kind, _, fields in recorder.events() if kind == "ticks"]
+    # The first run is reported right away, then one summary per second.
+    assert [summary["count"] for summary in ticks] == [1, 5, 4]
+    assert ticks[1]["max_ms"] == pytest.approx(12.0)
+    assert ticks[1]["avg_ms"] == pytest.approx(8.0)
+
+    levels = [fields for _, kind, _, fields in recorder.events() if kind == "level"]
+    assert [(level["count"], level["min"], level["max"]) for level in levels] == [(6, 0, 50), (4, 60, 90)]
+
+
+def test_recorded_request_logs_failures_without_query(monkeypatch):
+    recorder = FlightRecorder()
+    monkeypatch.setattr(flight, "flight_recorder", recorder)
+
+    with pytest.raises(ConnectionError):
+        with recorded_request("catalog", "http://store/skins?lang=en&page=2") as outcome:
+            outcome["status"] = 503
+            raise ConnectionError("down")
+
+    (_, kind, _, fields), = recorder.events()
+    assert kind == "net"
+    assert fields["url"] == "http://store/skins"
+    assert fields["status"] == 503
+    assert fields["error"] == "ConnectionError"
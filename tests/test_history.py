@@ -0,0 +1,72 @@
+import csv
+
+from quackduck_app.history import RingBuffer, StateHistory, StateHistoryModel
+
+
+def test_ring_buffer_since_tracks_total():
+    buffer = RingBuffer(3)
+    for item in range(5):
+        buffer.append(item)
+    assert list(buffer) == [2, 3, 4]
+    assert buffer.total == 5
+    assert buffer.since(3) == [3, 4]
+    assert buffer.since(0) == [2, 3, 4]
+    assert buffer.since(5) == []
+
+
+def test_model_appends_incrementally_and_trims():
+    history = StateHistory(capacity=3)
+    history.record("None", "IdleState")
+    model = StateHistoryModel(history)
+    inserted = []
+    removed = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+
+    assert model.rowCount() == 1
+    assert model.sync() == 0
+    history.record("IdleState", "WalkingState")
+    history.record("WalkingState", "SleepingState")
+    history.record("SleepingState", "FallingState")
+    assert model.sync() == 3
+
+    assert inserted == [(0, 2)]
+    assert removed == [(0, 0)]
+    assert model.rowCount() == 3
+    assert model.data(model.index(2)).endswith("SleepingState -> FallingState")
+
+
+def test_model_resets_after_clear():
+    history = StateHistory(capacity=5)
+    history.record("None", "IdleState")
+    history.record("IdleState", "WalkingState")
+    model = StateHistoryModel(history)
+    resets = []
+    model.modelReset.connect(lambda: resets.append(model.rowCount()))
+
+    history.clear()
+    assert history.total == 0
+    history.record("WalkingState", "SleepingState")
+    history.record("SleepingState", "IdleState")
+    history.record("IdleState", "FallingState")
+
+    assert model.sync() == 3
+    assert resets == [3]
+    assert model.data(model.index(0)).endswith("WalkingState -> SleepingState")
+    history.record("FallingState", "LandingState")
+    assert model.sync() == 1
+    assert model.rowCount() == 4
+
+
+def test_export_csv(tmp_path):
+    history = StateHistory(capacity=10)
+    history.record("None", "IdleState")
+    history.record("IdleState", "WalkingState")
+    path = tmp_path / "history.csv"
+
+    assert history.export_csv(str(path)) == 2
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert [row["new_state"] for row in rows] == ["IdleState", "WalkingState"]
+    assert float(rows[0]["duration_s"]) >= 0
+    assert rows[1]["duration_s"] == ""
@@ -0,0 +1,37 @@
+import tracemalloc
+
+from PyQt6 import QtCore
+
+from quackduck_app.memory import MemoryProfiler, configure_memory_diagnostics, format_bytes, memory_profiler, object_census
+
+
+def test_snapshot_diff_groups_by_line():
+    profiler = MemoryProfiler()
+    try:
+        profiler.take_snapshot("before")
+        hoard = [bytearray(1024) for _ in range(200)]
+        profiler.take_snapshot("after")
+        lines = profiler.diff_latest()
+    finally:
+        profiler.stop_tracing()
+    assert lines[0].startswith("before -> after")
+    assert any("test_memory.py" in line for line in lines[1:])
+    assert not tracemalloc.is_tracing()
+    assert len(hoard) == 200
+
+
+def test_object_census_counts_live_timers():
+    before = object_census()["QTimer"]
+    timers = [QtCore.QTimer() for _ in range(3)]
+    assert object_census()["QTimer"] == before + len(timers)
+
+
+def test_command_line_flags():
+    try:
+        configure_memory_diagnostics(["--tracemalloc=2", "--memory-log=bad"])
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traceback_limit() == 2
+    finally:
+        memory_profiler.stop_tracing()
+        memory_profiler.stop_rss_log()
+    assert format_bytes(-2048) == "-2.0 KB"
@@ -0,0 +1,63 @@
+import urllib.request
+
+from quackduck_app import metrics as metrics_module
+from quackduck_app.metrics import MetricsExporter, MetricsRegistry, configure_metrics
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry()
+    registry.inc("quackduck_repaints_total")
+    registry.observe("quackduck_tick_duration_seconds", 0.01, timer="position")
+    assert registry.render() == "\n"
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry(window=100)
+    registry.enabled = True
+    registry.inc("quackduck_state_transitions_total", state="IdleState")
+    registry.inc("quackduck_state_transitions_total", state="IdleState")
+    registry.inc("quackduck_update_checks_total", outcome='odd "value"')
+    for step in range(1, 101):
+        registry.observe("quackduck_tick_duration_seconds", step / 1000, timer="position")
+    registry.collect("quackduck_resident_memory_bytes", lambda: 1024)
+    registry.collect("quackduck_pixmap_bytes", lambda: None)
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE quackduck_state_transitions_total counter" in lines
+    assert 'quackduck_state_transitions_total{state="IdleState"} 2' in lines
+    assert 'quackduck_update_checks_total{outcome="odd \\"value\\""} 1' in lines
+    assert "# TYPE quackduck_tick_duration_seconds summary" in lines
+    assert 'quackduck_tick_duration_seconds{timer="position",quantile="0.5"} 0.051' in lines
+    assert 'quackduck_tick_duration_seconds{timer="position",quantile="0.99"} 0.1' in lines
+    assert 'quackduck_tick_duration_seconds_count{timer="position"} 100' in lines
+    assert "quackduck_resident_memory_bytes 1024" in lines
+    assert not any(line.startswith("quackduck_pixmap_bytes") for line in lines)
+
+
+def test_exporter_writes_file_and_serves_localhost(tmp_path):
+    registry = MetricsRegistry()
+    path = tmp_path / "quackduck.prom"
+    exporter = MetricsExporter(registry, path=str(path), port=0, interval_s=60)
+    exporter.start()
+    try:
+        registry.inc("quackduck_repaints_total", 3)
+        exporter.export()
+        assert "quackduck_repaints_total 3" in path.read_text(encoding="utf-8")
+
+        host, port = exporter.address
+        assert host == "127.0.0.1"
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as resp:
+            assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "quackduck_repaints_total 3" in resp.read().decode("utf-8")
+    finally:
+        exporter.stop()
+    assert not registry.enabled
+
+
+def test_configure_metrics_is_off_by_default(monkeypatch):
+    for name in (metrics_module.METRICS_FILE_ENV, metrics_module.METRICS_PORT_ENV):
+        monkeypatch.delenv(name, raising=False)
+    assert configure_metrics([]) is None
+    assert configure_metrics(["--metrics-port=abc"]) is None
+    assert not metrics_module.metrics.enabled
@@ -0,0 +1,63 @@
+from quackduck_app import perf
+from quackduck_app.perf import PerfMonitor, format_report, measured, process_rss_bytes
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_tick_rates_and_jitter_buckets():
+    clock = _Clock()
+    monitor = PerfMonitor(clock=clock)
+    monitor.enabled = True
+    for offset in (0.0, 0.020, 0.043, 0.090):
+        monitor.tick("position", 20, now=offset)
+    monitor.count("mic_callbacks", 5)
+    clock.now = 1.0
+
+    snapshot = monitor.snapshot()
+    assert snapshot["tick_rates"]["position"] == 4
+    assert snapshot["rates"]["mic_callbacks"] == 5
+    # Deviations of 0, 3 and 27 ms land in the <=1, <=5 and <=50 ms buckets.
+    assert snapshot["jitter"]["position"] == [1, 0, 1, 0, 0, 1, 0, 0]
+    assert "position" in format_report(snapshot, pixmap_bytes=1024, rss_bytes=None)
+
+    clock.now = 2.0
+    assert monitor.snapshot()["tick_rates"] == {"position": 0.0}
+
+
+def test_measured_charges_time_to_current_state(monkeypatch):
+    clock = _Clock()
+    monitor = PerfMonitor(clock=clock)
+    monkeypatch.setattr(perf, "perf_monitor", monitor)
+
+    class IdleState:
+        pass
+
+    class Duck:
+        state = IdleState()
+
+        @measured("animation")
+        def update_animation(self):
+            clock.now += 0.5
+            return "done"
+
+    duck = Duck()
+    assert duck.update_animation() == "done"
+    assert monitor.snapshot()["times"] == {}
+
+    monitor.enabled = True
+    duck.update_animation()
+    assert monitor.snapshot()["times"] == {("animation", "IdleState"): (1, 0.5)}
+
+
+def test_count_ignored_while_disabled():
+    monitor = PerfMonitor()
+    monitor.count("mic_callbacks")
+    assert monitor.snapshot()["counters"] == {}
+    rss = process_rss_bytes()
+    assert rss is None or rss > 0
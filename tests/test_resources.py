@@ -0,0 +1,9 @@
+from quackduck_app.resources import ResourceManager
+
+
+def test_skin_can_be_reloaded_any_number_of_times():
+    resources = ResourceManager(scale_factor=1.0)
+    for _ in range(5):
+        resources.load_default_skin()
+        assert resources.sprites_loaded
+        assert resources.get_animation_frame("idle", 0) is not None
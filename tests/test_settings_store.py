@@ -1,6 +1,10 @@
+import dataclasses
+import time
+
+import pytest
 from PyQt6 import QtCore
 
-from quackduck_app.settings_store import SettingsManager
+from quackduck_app.settings_store import Settings, SettingsManager
 
 
 def test_settings_manager_roundtrip(tmp_path):
@@ -23,3 +27,103 @@ def test_settings_manager_sync_writes_file(tmp_path):
     manager.sync()
 
     assert settings_path.exists()
+
+
+def _ini_manager(tmp_path, name="settings.ini"):
+    backend = QtCore.QSettings(str(tmp_path / name), QtCore.QSettings.Format.IniFormat)
+    return SettingsManager("test_org_snapshot", "test_app_snapshot", backend=backend)
+
+
+def test_settings_snapshot_defaults_and_typed_bulk_read(tmp_path):
+    manager = _ini_manager(tmp_path)
+    assert manager.settings == Settings()
+    assert manager.settings.activation_threshold == 10
+
+    raw = QtCore.QSettings(str(tmp_path / "settings.ini"), QtCore.QSettings.Format.IniFormat)
+    raw.setValue("pet_size", "5")
+    raw.setValue("show_name", "true")
+    raw.setValue("duck_speed", "1.5")
+    raw.setValue("font_base_size", "not a number")
+    raw.setValue("unrelated", "x")
+    raw.sync()
+
+    snapshot = manager.reload()
+    assert snapshot.pet_size == 5
+    assert snapshot.show_name is True
+    assert snapshot.duck_speed == 1.5
+    assert snapshot.font_base_size == 14
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.pet_size = 1
+
+
+def test_settings_updates_notify_only_changed_fields(tmp_path):
+    manager = _ini_manager(tmp_path)
+    seen = []
+    manager.subscribe("sound_volume", seen.append)
+
+    manager.set_value("sound_volume", 0.25)
+    manager.set_value("sound_volume", 0.25)
+    manager.update(pet_name="Quackers")
+
+    assert seen == [0.25]
+    assert manager.settings.pet_name == "Quackers"
+    assert manager.get_value("pet_name", default="", value_type=str) == "Quackers"
+
+    manager.clear()
+    assert seen == [0.25, 0.5]
+    with pytest.raises(KeyError):
+        manager.update(no_such_setting=1)
+
+
+class _CountingSettings(QtCore.QSettings):
+    def __init__(self, path):
+        super().__init__(path, QtCore.QSettings.Format.IniFormat)
+        self.writes = []
+        self.syncs = 0
+
+    def setValue(self, key, value):
+        self.writes.append(key)
+        super().setValue(key, value)
+
+    def sync(self):
+        self.syncs += 1
+        super().sync()
+
+
+def test_settings_writes_are_coalesced_until_flush(tmp_path):
+    backend = _CountingSettings(str(tmp_path / "flush.ini"))
+    manager = SettingsManager("test_org_flush", "test_app_flush", backend=backend)
+
+    for offset in range(40, 80):
+        manager.set_value("name_offset_y", offset)
+    manager.set_value("pet_size", 3)  # unchanged from the default: nothing to write
+    manager.set_value("window_geometry", "10,10")
+
+    assert backend.writes == [] and backend.syncs == 0
+    assert manager.has_pending_writes()
+    assert manager.settings.name_offset_y == 79
+    assert manager.get_value("window_geometry", default="", value_type=str) == "10,10"
+
+    manager.flush()
+    assert sorted(backend.writes) == ["name_offset_y", "window_geometry"]
+    assert backend.syncs == 1
+
+    manager.flush()
+    assert backend.syncs == 1
+
+    reread = QtCore.QSettings(str(tmp_path / "flush.ini"), QtCore.QSettings.Format.IniFormat)
+    assert reread.value("name_offset_y", type=int) == 79
+
+
+def test_settings_flush_after_debounce(tmp_path, qt_core_app):
+    backend = _CountingSettings(str(tmp_path / "debounce.ini"))
+    manager = SettingsManager("test_org_debounce", "test_app_debounce", flush_delay_ms=10, backend=backend)
+
+    manager.set_value("font_base_size", 18)
+    deadline = time.monotonic() + 2
+    while manager.has_pending_writes() and time.monotonic() < deadline:
+        qt_core_app.processEvents()
+        time.sleep(0.005)
+
+    assert backend.writes == ["font_base_size"]
+    assert backend.syncs == 1
@@ -0,0 +1,49 @@
+from quackduck_app.soak import SoakLimits, SoakReport, SoakSample, VirtualClock, run_soak
+
+
+def test_virtual_timers_follow_the_clock():
+    clock = VirtualClock()
+    Timer = clock.timer_class()
+    fired = []
+
+    repeating = Timer()
+    repeating.timeout.connect(lambda: fired.append(("repeat", clock.now - clock_start)))
+    clock_start = clock.now
+    repeating.start(1000)
+    Timer.singleShot(2500, lambda: fired.append(("single", clock.now - clock_start)))
+
+    clock.advance_to(clock_start + 3.0)
+    assert fired == [("repeat", 1.0), ("repeat", 2.0), ("single", 2.5), ("repeat", 3.0)]
+
+    repeating.stop()
+    clock.advance_to(clock_start + 5.0)
+    assert len(fired) == 4
+    assert clock.active_timers() == 0
+
+
+def test_dropped_timer_never_fires():
+    clock = VirtualClock()
+    fired = []
+    timer = clock.timer_class()()
+    timer.timeout.connect(lambda: fired.append(clock.now))
+    timer.start(100)
+    del timer
+    clock.advance_to(clock.now + 1)
+    assert fired == []
+
+
+def test_report_flags_growth():
+    def sample(hours, temp=0, receivers=1, timers=10):
+        return SoakSample(hours, 50_000_000, 1000, {"QTimer": 2}, timers, timers, temp, receivers, "IdleState")
+
+    report = SoakReport(hours=3, samples=[sample(0), sample(1), sample(2), sample(3, temp=4, receivers=9, timers=40)])
+    problems = report.problems(SoakLimits())
+    assert len(problems) == 4
+    assert SoakReport(hours=1, samples=[sample(0), sample(1)]).problems() == []
+
+
+def test_short_soak_stays_bounded():
+    report = run_soak(hours=2, seed=1, sample_interval_s=1800)
+    assert report.transitions > 0
+    assert len(report.samples) == 5
+    assert report.problems() == [], report.format()
@@ -0,0 +1,265 @@
+import io
+import os
+import time
+
+import pytest
+import requests
+from PyQt6 import QtCore, QtGui
+
+from quackduck_app import store
+from quackduck_app.store import CatalogIndex, CatalogPager, PreviewCache, PreviewFetcher, decode_preview_frames, parse_catalog_page
+
+
+def test_store_url_resolves_relative_and_absolute_paths():
+    assert store.store_url("/previews/a.gif") == f"{store.STORE_BASE_URL}/previews/a.gif"
+    assert store.store_url("https://cdn.example.com/a.gif") == "https://cdn.example.com/a.gif"
+
+
+def test_parse_catalog_page_treats_bare_list_as_whole_catalog():
+    page = parse_catalog_page([{"id": "a"}, {"id": "b"}], page=1, limit=1)
+    assert [item["id"] for item in page.items] == ["a", "b"]
+    assert page.has_more is False
+
+
+def test_parse_catalog_page_uses_total_or_has_more():
+    page = parse_catalog_page({"items": [{"id": "a"}] * 50, "total": 120}, page=2, limit=50)
+    assert page.page == 2 and page.total == 120 and page.has_more is True
+
+    last = parse_catalog_page({"items": [{"id": "a"}] * 20, "total": 120}, page=3, limit=50)
+    assert last.has_more is False
+
+    explicit = parse_catalog_page({"items": [{"id": "a"}], "has_more": True}, page=1, limit=50)
+    assert explicit.has_more is True
+
+    empty = parse_catalog_page({"items": [], "has_more": True}, page=4, limit=50)
+    assert empty.has_more is False
+
+
+def test_parse_catalog_page_rejects_unexpected_payload():
+    with pytest.raises(ValueError):
+        parse_catalog_page("oops", page=1, limit=50)
+
+
+def test_fetch_catalog_page_sends_pagination_params(monkeypatch):
+    seen = {}
+
+    class DummyResponse:
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return {"items": [{"id": "x"}], "total": 1}
+
+    def fake_get(url, params=None, timeout=None):
+        seen.update(url=url, params=params)
+        return DummyResponse()
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    page = store.fetch_catalog_page("ru", page=3, limit=10)
+
+    assert seen["url"] == f"{store.STORE_BASE_URL}/skins"
+    assert seen["params"] == {"lang": "ru", "page": 3, "limit": 10}
+    assert page.page == 3 and page.has_more is False
+
+
+def test_catalog_pager_drops_results_of_a_reset_listing(monkeypatch):
+    pager = CatalogPager(page_size=2)
+    started = []
+    monkeypatch.setattr(pager._pool, "start", lambda task: started.append((task.generation, task.page)))
+    loaded = []
+    pager.page_loaded.connect(loaded.append)
+
+    pager.reset("en")
+    assert pager.load_next() is True
+    assert pager.load_next() is False  # one page in flight at a time
+    stale_generation = started[-1][0]
+
+    pager.reset("ru")
+    pager.load_next()
+    pager._on_task_done(stale_generation, store.CatalogPage([{"id": "old"}], 1, None, True), "")
+    assert loaded == [] and pager.loading is True
+
+    pager._on_task_done(started[-1][0], store.CatalogPage([{"id": "new"}], 1, None, True), "")
+    assert [page.items for page in loaded] == [[{"id": "new"}]]
+    assert pager.next_page == 2 and pager.loading is False
+
+
+def _catalog_index():
+    index = CatalogIndex()
+    index.add([
+        {"id": "a", "name": "Golden Duck", "description": "Shiny", "rarity": "legendary",
+         "animations_str": "idle, walk, jump", "price": "499"},
+        {"id": "b", "name": "Утка-ниндзя", "description": "Тихая", "rarity": "rare",
+         "animations_str": "idle, sleep", "price": "149"},
+    ])
+    index.add([
+        {"id": "c", "name": "Golden Goose", "description": "", "rarity": "rare",
+         "animations_str": "walk", "price": "1 990 ₽"},
+    ])
+    return index
+
+
+def test_catalog_index_prefix_and_token_search():
+    index = _catalog_index()
+    assert index.search("gol") == [0, 2]
+    assert index.search("golden goo") == [2]
+    assert index.search("ниндз") == [1]
+    assert index.search("GOLDEN   duck") == [0]
+    assert index.search("149") == [1]
+    assert index.search("missing") == []
+    assert index.search("") == [0, 1, 2]
+
+
+def test_catalog_index_filters():
+    index = _catalog_index()
+    assert index.rarities() == ["legendary", "rare"]
+    assert index.animations() == ["idle", "jump", "sleep", "walk"]
+    assert index.search(rarity="rare") == [1, 2]
+    assert index.search("golden", rarity="rare") == [2]
+    assert index.search(animations=["walk"]) == [0, 2]
+    assert index.search(animations=["idle", "walk"]) == [0]
+    assert index.search(max_price=500) == [0, 1]
+
+
+def test_catalog_index_clear():
+    index = _catalog_index()
+    index.clear()
+    assert len(index) == 0
+    assert index.search("gol") == [] and index.rarities() == []
+    index.add([{"id": "d", "name": "Golden Egg", "price": "5"}])
+    assert index.search("gol") == [0]
+
+
+def test_preview_cache_roundtrip(tmp_path):
+    cache = PreviewCache(str(tmp_path / "cache"), max_bytes=1024)
+    assert cache.get("http://example.com/a.gif") is None
+
+    cache.put("http://example.com/a.gif", b"GIF89a")
+    assert cache.get("http://example.com/a.gif") == b"GIF89a"
+
+
+def test_preview_cache_evicts_least_recently_used(tmp_path):
+    cache = PreviewCache(str(tmp_path / "cache"), max_bytes=250)
+    cache.put("old", b"a" * 100)
+    cache.put("recent", b"b" * 100)
+
+    # Make "old" clearly older, then touch "recent" by reading it.
+    old_path = cache._path_for("old")
+    past = time.time() - 100
+    os.utime(old_path, (past, past))
+    assert cache.get("recent") is not None
+
+    cache.put("new", b"c" * 100)
+
+    assert cache.get("old") is None
+    assert cache.get("recent") == b"b" * 100
+    assert cache.get("new") == b"c" * 100
+    assert cache.size_bytes() <= 250
+
+
+def test_preview_cache_skips_oversized_entries(tmp_path):
+    cache = PreviewCache(str(tmp_path / "cache"), max_bytes=10)
+    cache.put("huge", b"x" * 100)
+    assert cache.get("huge") is None
+
+
+def test_preview_fetcher_uses_cache_before_network(monkeypatch, tmp_path):
+    calls = []
+
+    class DummyResponse:
+        content = _png_bytes(16, 16)
+
+        def raise_for_status(self):
+            return None
+
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        return DummyResponse()
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    fetcher = PreviewFetcher(cache=PreviewCache(str(tmp_path / "cache")), max_concurrency=2)
+
+    assert len(fetcher.load_frames("http://example.com/p.gif")) == 1
+    assert len(fetcher.load_frames("http://example.com/p.gif")) == 1
+    assert calls == ["http://example.com/p.gif"]
+    assert fetcher._pool.maxThreadCount() == 2
+
+
+def test_preview_fetcher_refetches_undecodable_cached_preview(monkeypatch, tmp_path):
+    calls = []
+    good = _png_bytes(32, 32)
+
+    class DummyResponse:
+        content = good
+
+        def raise_for_status(self):
+            return None
+
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        return DummyResponse()
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    cache = PreviewCache(str(tmp_path / "cache"))
+    cache.put("http://example.com/p.gif", b"broken")
+    fetcher = PreviewFetcher(cache=cache)
+
+    frames = fetcher.load_frames("http://example.com/p.gif")
+
+    assert frames is not None and len(frames) == 1
+    assert calls == ["http://example.com/p.gif"]
+    assert cache.get("http://example.com/p.gif") == good
+
+    DummyResponse.content = b"still broken"
+    assert fetcher.load_frames("http://example.com/q.gif") is None
+    assert cache.get("http://example.com/q.gif") is None
+
+
+def test_preview_fetcher_deduplicates_in_flight_requests(monkeypatch, tmp_path):
+    started = []
+    fetcher = PreviewFetcher(cache=PreviewCache(str(tmp_path / "cache")))
+    monkeypatch.setattr(fetcher._pool, "start", lambda task: started.append(task.url))
+
+    fetcher.request("http://example.com/p.gif")
+    fetcher.request("http://example.com/p.gif")
+    assert started == ["http://example.com/p.gif"]
+
+    fetcher.cancel_pending()
+    fetcher.request("http://example.com/p.gif")
+    assert len(started) == 2
+
+
+def _png_bytes(width, height):
+    image = QtGui.QImage(width, height, QtGui.QImage.Format.Format_ARGB32)
+    image.fill(QtGui.QColor(255, 0, 0))
+    buffer = QtCore.QBuffer()
+    buffer.open(QtCore.QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(buffer.data())
+
+
+def test_decode_preview_frames_scales_still_image():
+    frames = decode_preview_frames(_png_bytes(200, 100), size=64)
+
+    assert frames is not None
+    assert len(frames) == 1
+    assert (frames.images[0].width(), frames.images[0].height()) == (64, 32)
+    assert frames.delays == [store.PREVIEW_DEFAULT_DELAY_MS]
+
+
+def test_decode_preview_frames_reads_every_gif_frame():
+    Image = pytest.importorskip("PIL.Image")
+    stream = io.BytesIO()
+    images = [Image.new("RGB", (128, 128), color) for color in ("red", "green", "blue")]
+    images[0].save(stream, format="GIF", save_all=True, append_images=images[1:], duration=[40, 80, 120], loop=0)
+
+    frames = decode_preview_frames(stream.getvalue(), size=64)
+
+    assert frames is not None
+    assert len(frames) == 3
+    assert all(image.width() == 64 and image.height() == 64 for image in frames.images)
+    assert frames.delays == [40, 80, 120]
+
+
+def test_decode_preview_frames_rejects_garbage():
+    assert decode_preview_frames(b"not an image") is None
@@ -0,0 +1,64 @@
+import json
+import threading
+
+from quackduck_app import tracing
+from quackduck_app.states import IdleState, State
+from quackduck_app.tracing import Tracer, traced
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span("noop"):
+        pass
+    tracer.instant("noop")
+    assert len(tracer) == 0
+    assert tracer.span("a") is tracer.span("b")
+
+
+def test_chrome_trace_export(tmp_path):
+    tracer = Tracer(enabled=True)
+    with tracer.span("outer", category="duck"):
+        with tracer.span("inner"):
+            pass
+    worker = threading.Thread(target=lambda: tracer.instant("tick"), name="worker")
+    worker.start()
+    worker.join()
+
+    path = tracer.dump(str(tmp_path / "trace.json"))
+    with open(path, encoding="utf-8") as file:
+        trace = json.load(file)
+
+    events = {event["name"]: event for event in trace["traceEvents"] if event["ph"] != "M"}
+    assert events["outer"]["ph"] == "X" and events["outer"]["cat"] == "duck"
+    assert events["inner"]["dur"] <= events["outer"]["dur"]
+    assert events["inner"]["ts"] >= events["outer"]["ts"]
+    assert events["tick"]["ph"] == "i"
+    thread_names = {event["args"]["name"] for event in trace["traceEvents"] if event["ph"] == "M"}
+    assert "worker" in thread_names
+
+
+def test_traced_decorator_and_state_methods(monkeypatch):
+    tracer = Tracer(enabled=True)
+    monkeypatch.setattr(tracing, "tracer", tracer)
+
+    @traced("work", category="test")
+    def work(value):
+        return value * 2
+
+    assert work(21) == 42
+
+    class ProbeState(State):
+        def enter(self):
+            return None
+
+        def exit(self):
+            return None
+
+    ProbeState(None).enter()
+    ProbeState(None).exit()
+    assert [event[0] for event in tracer._events] == ["work", "ProbeState.enter", "ProbeState.exit"]
+    assert getattr(IdleState.enter, "__traced__", False)
+
+    tracer.enabled = False
+    assert work(1) == 2
+    assert len(tracer) == 3
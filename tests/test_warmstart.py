@@ -0,0 +1,112 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from PyQt6 import QtGui
+
+from quackduck_app import warmstart
+from quackduck_app.duck import Duck
+from quackduck_app.states import FallingState, IdleState
+from quackduck_app.resources import ResourceManager
+from quackduck_app.warmstart import FrameCache, load_session, save_session
+
+
+def _pixmap(width, height, color):
+    image = QtGui.QImage(width, height, QtGui.QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(QtGui.QColor(*color))
+    image.setPixelColor(0, 0, QtGui.QColor(0, 0, 255, 255))
+    return QtGui.QPixmap.fromImage(image)
+
+
+def test_session_roundtrip_and_bad_files(tmp_path):
+    path = str(tmp_path / "session.json")
+    assert load_session(path) is None
+
+    save_session({"x": 10, "y": 20, "state": "IdleState"}, path)
+    session = load_session(path)
+    assert session["x"] == 10 and session["state"] == "IdleState"
+    assert session["version"] == warmstart.SESSION_VERSION
+
+    (tmp_path / "session.json").write_text(json.dumps({"version": 999, "x": 1}), encoding="utf-8")
+    assert load_session(path) is None
+    (tmp_path / "session.json").write_text("{not json", encoding="utf-8")
+    assert load_session(path) is None
+
+
+def _session_target():
+    return SimpleNamespace(ground_level=500, duck_height=50, duck_width=50, screen_width=1000)
+
+
+@pytest.mark.parametrize("session", [
+    {"x": 10, "y": 450, "state": "IdleState", "direction": "left"},
+    {"x": 10, "y": 450, "state": "IdleState", "direction": None},
+    {"x": float("nan"), "y": 450, "state": "IdleState"},
+    {"x": 10, "y": float("inf"), "state": "IdleState"},
+    {"x": "far", "y": 450, "state": "IdleState"},
+])
+def test_restore_session_rejects_malformed_fields(session):
+    assert Duck.restore_session(_session_target(), session) is FallingState
+
+
+def test_restore_session_resumes_valid_state():
+    duck = _session_target()
+    session = {"x": 10, "y": 450, "state": "IdleState", "direction": -1, "facing_right": False}
+    assert Duck.restore_session(duck, session) is IdleState
+    assert duck.direction == -1 and (duck.duck_x, duck.duck_y) == (10, 450)
+
+
+def test_frame_cache_roundtrip_preserves_pixels(tmp_path):
+    cache = FrameCache(str(tmp_path))
+    key = "a" * 64
+    frames = {(0, 0): _pixmap(3, 5, (255, 0, 0, 255)), (2, 1): _pixmap(4, 4, (0, 255, 0, 128))}
+
+    assert cache.store(key, frames) is True
+    restored = cache.load(key)
+
+    assert set(restored) == {(0, 0), (2, 1)}
+    for position, pixmap in frames.items():
+        expected = pixmap.toImage().convertToFormat(QtGui.QImage.Format.Format_ARGB32_Premultiplied)
+        actual = restored[position].toImage().convertToFormat(QtGui.QImage.Format.Format_ARGB32_Premultiplied)
+        assert actual == expected
+
+
+def test_frame_cache_discards_corrupt_or_foreign_entries(tmp_path):
+    cache = FrameCache(str(tmp_path))
+    key = "b" * 64
+    cache.store(key, {(0, 0): _pixmap(8, 8, (1, 2, 3, 255))})
+
+    path = tmp_path / f"{key}.bin"
+    path.write_bytes(path.read_bytes()[:-10])
+    assert cache.load(key) is None
+    assert not path.exists()
+
+    cache.store(key, {(0, 0): _pixmap(8, 8, (1, 2, 3, 255))})
+    (tmp_path / f"{'c' * 64}.bin").write_bytes(path.read_bytes())
+    assert cache.load("c" * 64) is None
+
+    cache.store(key, {(0, 0): _pixmap(8, 8, (1, 2, 3, 255))})
+    cache.prune(keep=key)
+    assert [p.name for p in tmp_path.iterdir()] == [f"{key}.bin"]
+
+
+def test_resource_manager_restores_frames_without_decoding(tmp_path, monkeypatch):
+    cache = FrameCache(str(tmp_path))
+    warm = ResourceManager(1.0, pet_size=2, frame_cache=cache)
+    idle = warm.get_animation_frame("idle", 0)
+    warm.save_frame_cache()
+    assert len(list(tmp_path.iterdir())) == 1
+
+    def no_decode(self):
+        raise AssertionError("spritesheet should not be decoded on a warm start")
+
+    monkeypatch.setattr(ResourceManager, "load_spritesheet_if_needed", no_decode)
+    resources = ResourceManager(1.0, pet_size=2, frame_cache=cache)
+    frame = resources.get_animation_frame("idle", 0)
+
+    assert frame.size() == idle.size()
+    assert set(resources.animations) == set(warm.animations)
+
+    # A different pet size is a different cache entry.
+    monkeypatch.undo()
+    other = ResourceManager(1.0, pet_size=3, frame_cache=cache)
+    assert other.frame_cache_key() != resources.frame_cache_key()
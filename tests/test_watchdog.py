@@ -0,0 +1,62 @@
+import threading
+
+from quackduck_app.diagnostics import StackRecorder
+from quackduck_app.watchdog import StallWatchdog, thread_stack
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_stall_is_captured_once_and_counted_on_recovery():
+    clock = _Clock()
+    recorder = StackRecorder()
+    watchdog = StallWatchdog(threshold_ms=200, interval_ms=100, clock=clock, recorder=recorder)
+
+    clock.now += 0.15
+    assert watchdog.check() is False
+    clock.now += 0.5
+    assert watchdog.check() is True
+    assert watchdog.check() is False
+
+    report = watchdog.heartbeat()
+    assert round(report.duration_ms) == 550
+    assert "check" in [function for _, _, function in report.frames]
+    assert watchdog.histogram[3] == 1
+    assert "<=1000ms: 1" in watchdog.format_histogram()
+    assert recorder.samples()[0].label == "stall 550 ms"
+
+    clock.now += 0.1
+    assert watchdog.heartbeat() is None
+
+
+def test_short_stall_without_capture_is_still_counted():
+    clock = _Clock()
+    watchdog = StallWatchdog(threshold_ms=200, interval_ms=100, clock=clock, recorder=None)
+    clock.now += 0.35
+    report = watchdog.heartbeat()
+    assert report.frames == ()
+    assert sum(watchdog.histogram) == 1
+
+
+def test_thread_stack_reads_other_thread():
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocked_worker():
+        started.set()
+        release.wait()
+
+    worker = threading.Thread(target=blocked_worker)
+    worker.start()
+    started.wait()
+    try:
+        functions = [function for _, _, function in thread_stack(worker.ident)]
+    finally:
+        release.set()
+        worker.join()
+    assert "blocked_worker" in functions